@@ -1,9 +1,36 @@
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from app.routes import system, services, docker, network, settings, actions, wifi
+from app.models import StartupInfo
+from app.routes import system, services, docker, network, settings, actions, wifi, apps, metrics, debug, federation, alerts, jobs, journal
+from app.services.alerts import alert_engine
+from app.services.compression import CompressionMiddleware
+from app.services.container_stats import container_stats
+from app.services.encoding import BinaryEncodingMiddleware
+from app.services.executor import PoolTimeout, pools
+from app.services.federation import federation as federation_poller
+from app.services.gateway import gateway
+from app.services.idle import idle_manager
+from app.services.jobs import job_manager
+from app.services.journal import journal as action_journal
+from app.services.profiling import ProfilingMiddleware, loop_monitor, profile_store
+from app.services.registry import registry
+from app.services.sampler import sampler
+from app.services.startup import startup
+from app.services.supervisor import supervisor
+from app.services.telemetry import MetricsMiddleware, telemetry
+
+# Try to import brotli-asgi for Brotli compression (falls back to gzip)
+try:
+    from brotli_asgi import BrotliMiddleware
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 # Directory paths
 BACKEND_DIR = Path(__file__).parent.parent
@@ -16,12 +43,50 @@ STATIC_DIR.mkdir(parents=True, exist_ok=True)
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 (DATA_DIR / "wallpapers").mkdir(parents=True, exist_ok=True)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background samplers on startup; stop them and detach from supervised services on shutdown."""
+    action_journal.start()
+    await registry.start()
+    startup.start()
+    sampler.start()
+    idle_manager.start()
+    loop_monitor.start()  # No-op unless PROFILING_ENABLED=true
+    federation_poller.start()
+    container_stats.start()
+    yield
+    await federation_poller.stop()
+    await container_stats.stop()
+    await job_manager.stop()
+    await loop_monitor.stop()
+    await startup.stop()
+    await idle_manager.stop()
+    await sampler.stop()
+    await alert_engine.aclose()
+    await gateway.aclose()
+    await supervisor.shutdown()
+    await registry.stop()
+    await action_journal.stop()
+    for pool in pools:
+        pool.shutdown()
+
+
 app = FastAPI(
     title="StonePieHome API",
     description="Personal AI Dashboard by FlatStoneWorks",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """Blocking work that outlived its pool timeout becomes a 504."""
+    return ORJSONResponse(status_code=504, content={"detail": str(exc)})
+
+
 # CORS middleware for frontend
 # Get allowed origins from environment or use defaults
 ALLOWED_ORIGINS = os.getenv(
@@ -37,9 +102,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files for wallpapers
+# MessagePack/CBOR for clients whose Accept header asks for it (optional
+# msgpack/cbor2 packages); inside compression so binary bodies are compressed too
+app.add_middleware(BinaryEncodingMiddleware)
+
+# Response compression for bodies above the threshold (bytes)
+# Polled endpoints like /api/network/status and /api/docker/containers
+# benefit most; tiny responses and proxied /apps/ responses are sent as-is.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+if BROTLI_AVAILABLE:
+    # Negotiates br, falling back to gzip for clients without Brotli support
+    app.add_middleware(
+        CompressionMiddleware,
+        compressor=lambda inner: BrotliMiddleware(
+            inner, quality=4, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True,
+        ),
+    )
+else:
+    app.add_middleware(
+        CompressionMiddleware,
+        compressor=lambda inner: GZipMiddleware(inner, minimum_size=COMPRESSION_MIN_SIZE),
+    )
+
+# cProfile for requests sent with X-Profile: 1 (PROFILING_ENABLED=true only)
+app.add_middleware(ProfilingMiddleware, store=profile_store)
+
+# Per-route latency, status and in-flight counts for /api/metrics; added
+# last so it is outermost and times compression too
+app.add_middleware(MetricsMiddleware, telemetry=telemetry)
+
+# Mount static files for wallpapers; only the wallpapers directory of
+# DATA_DIR is public, the journal and registry files next to it are not
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-app.mount("/data", StaticFiles(directory=str(DATA_DIR)), name="data")
+app.mount("/data/wallpapers", StaticFiles(directory=str(DATA_DIR / "wallpapers")), name="wallpapers")
 
 # Include routers
 app.include_router(system.router)
@@ -49,9 +145,25 @@ app.include_router(network.router)
 app.include_router(settings.router)
 app.include_router(actions.router)
 app.include_router(wifi.router)
+app.include_router(apps.router)
+app.include_router(metrics.router)
+app.include_router(debug.router)
+app.include_router(federation.router)
+app.include_router(alerts.router)
+app.include_router(jobs.router)
+app.include_router(journal.router)
 
 
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "service": "StonePieHome"}
+
+
+@app.get("/api/health/startup", response_model=StartupInfo)
+async def startup_info():
+    """Import time, time to first response and readiness of background-initialized subsystems."""
+    return startup.info()
+
+
+startup.mark_imported()
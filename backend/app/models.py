@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional
 from enum import Enum
 
 
@@ -10,6 +10,67 @@ class ServiceStatus(str, Enum):
     UNKNOWN = "unknown"
 
 
+class GpuProcess(BaseModel):
+    pid: int
+    gpu_index: int
+    used_memory: Optional[int] = None
+
+
+class MigInstance(BaseModel):
+    index: int
+    uuid: Optional[str] = None
+    name: Optional[str] = None
+    memory_total: Optional[int] = None
+    memory_used: Optional[int] = None
+
+
+class GpuMetrics(BaseModel):
+    index: int
+    name: str
+    uuid: Optional[str] = None
+    memory_total: Optional[int] = None
+    memory_used: Optional[int] = None
+    memory_percent: Optional[float] = None
+    utilization: Optional[float] = None
+    temperature: Optional[float] = None
+    power_draw: Optional[float] = None  # Watts
+    power_limit: Optional[float] = None  # Watts
+    clock_graphics: Optional[int] = None  # MHz
+    clock_memory: Optional[int] = None  # MHz
+    encoder_utilization: Optional[float] = None
+    decoder_utilization: Optional[float] = None
+    mig_instances: list[MigInstance] = []
+    processes: list[GpuProcess] = []
+
+
+class TemperatureReading(BaseModel):
+    chip: str
+    label: str
+    kind: str  # package, core, cpu, nvme, gpu or other
+    current: float
+
+
+class DiskUsage(BaseModel):
+    mountpoint: str
+    device: str
+    fstype: str
+    total: int = 0
+    used: int = 0
+    free: int = 0
+    percent: float = 0.0
+    responsive: bool = True
+
+
+class DiskIO(BaseModel):
+    device: str
+    read_bytes_per_sec: float
+    write_bytes_per_sec: float
+    read_iops: float
+    write_iops: float
+    await_ms: float
+    utilization: Optional[float] = None
+
+
 class SystemMetrics(BaseModel):
     cpu_percent: float
     cpu_per_core: list[float]
@@ -27,6 +88,58 @@ class SystemMetrics(BaseModel):
     gpu_utilization: Optional[float] = None
     gpu_temperature: Optional[float] = None
     cpu_temperature: Optional[float] = None
+    gpus: list[GpuMetrics] = []
+    temperatures: list[TemperatureReading] = []
+    disks: list[DiskUsage] = []
+    disk_io: list[DiskIO] = []
+
+
+class PressureStall(BaseModel):
+    some_avg10: float = 0.0
+    some_avg60: float = 0.0
+    some_avg300: float = 0.0
+    full_avg10: Optional[float] = None
+    full_avg60: Optional[float] = None
+    full_avg300: Optional[float] = None
+
+
+class MemoryActivity(BaseModel):
+    swap_total: int
+    swap_used: int
+    swap_in_per_sec: float
+    swap_out_per_sec: float
+    page_faults_per_sec: float
+    major_faults_per_sec: float
+
+
+class CgroupMemory(BaseModel):
+    name: str
+    kind: str  # container or service
+    cgroup: str
+    memory_current: int
+    memory_max: Optional[int] = None
+    memory_pressure: Optional[PressureStall] = None
+    shared: bool = False
+
+
+class PressureMetrics(BaseModel):
+    cpu: Optional[PressureStall] = None
+    memory: Optional[PressureStall] = None
+    io: Optional[PressureStall] = None
+    memory_activity: MemoryActivity
+    cgroups: list[CgroupMemory] = []
+    timestamp: float
+
+
+class ServiceResources(BaseModel):
+    pids: list[int] = []
+    cpu_percent: float = 0.0
+    memory_rss: int = 0
+    memory_pss: Optional[int] = None
+    threads: int = 0
+    open_fds: int = 0
+    gpu_memory: int = 0
+    timestamp: float
 
 
 class ServiceInfo(BaseModel):
@@ -40,6 +153,10 @@ class ServiceInfo(BaseModel):
     status: ServiceStatus
     frontend_running: bool = False
     backend_running: bool = False
+    supervised: bool = False
+    pid: Optional[int] = None
+    restarts: int = 0
+    sleeping: bool = False
 
 
 class ServiceAction(str, Enum):
@@ -53,11 +170,179 @@ class ServiceActionResponse(BaseModel):
     message: str
 
 
+class StackServiceResult(BaseModel):
+    name: str
+    success: bool
+    message: str
+    seconds: float = 0.0
+
+
+class StackActionResponse(BaseModel):
+    success: bool
+    total_seconds: float
+    results: list[StackServiceResult]
+
+
+class LatencyBucket(BaseModel):
+    le: Optional[float] = None  # Upper bound in seconds; None for +Inf
+    count: int  # Cumulative
+
+
+class ProxyLatency(BaseModel):
+    service: str
+    requests: int = 0
+    errors: int = 0
+    websockets: int = 0
+    mean_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    buckets: list[LatencyBucket] = []
+
+
+class PoolStats(BaseModel):
+    """Load on one of the blocking-work thread pools."""
+    name: str
+    max_workers: int
+    active: int
+    queued: int
+    max_queued: int  # High-water mark since startup
+    completed: int
+    errors: int
+    timeouts: int
+    wait_p99_ms: Optional[float] = None  # Time spent queued
+    run_p99_ms: Optional[float] = None
+
+
+class PeerStatus(BaseModel):
+    """A federated peer backend as seen by the last poll."""
+    name: str
+    url: str
+    online: bool
+    last_seen: Optional[float] = None  # Unix time of the last successful poll
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class HostSystemMetrics(BaseModel):
+    host: str
+    online: bool
+    metrics: Optional[SystemMetrics] = None
+
+
+class HostServiceInfo(ServiceInfo):
+    host: str
+
+
+class AlertState(str, Enum):
+    PENDING = "pending"  # Condition holds, not yet for long enough
+    FIRING = "firing"
+    RESOLVED = "resolved"
+
+
+class Alert(BaseModel):
+    """A rule whose condition currently holds for one metric."""
+    rule: str
+    metric: str
+    severity: str
+    state: AlertState
+    value: float
+    since: float  # Unix time the condition started holding
+    description: str = ""
+
+
+class AlertEvent(BaseModel):
+    """An alert state transition."""
+    rule: str
+    metric: str
+    severity: str
+    state: AlertState
+    value: Optional[float] = None  # None when the metric disappeared
+    timestamp: float
+    description: str = ""
+
+
+class ContainerStatsSample(BaseModel):
+    timestamp: float
+    cpu_percent: float
+    memory_bytes: int
+    memory_percent: float
+    net_bytes_per_sec: float  # Received + sent, since the previous sample
+    io_bytes_per_sec: float  # Block reads + writes, since the previous sample
+
+
+class ContainerTop(BaseModel):
+    """A container's usage over a ranking window."""
+    id: str
+    name: str
+    cpu_percent: float  # Mean over the window
+    memory_bytes: int  # Latest
+    memory_percent: float  # Latest
+    memory_growth_bytes: int  # Latest minus first in the window
+    net_bytes_per_sec: float
+    io_bytes_per_sec: float
+    samples: int
+
+
+class JournalEvent(BaseModel):
+    """One recorded action."""
+    id: int
+    timestamp: float
+    kind: str  # service, stack, container, docker or system
+    target: str
+    action: str
+    source: str  # api, supervisor or idle
+    success: bool
+    duration_ms: Optional[float] = None
+    message: Optional[str] = None
+
+
+class JobState(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """A long-running action tracked in the background."""
+    id: str
+    kind: str
+    params: Optional[dict[str, Any]] = None
+    state: JobState = JobState.PENDING
+    created: float
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+
+
 class LogsResponse(BaseModel):
     logs: list[str]
     service: str
 
 
+class SubsystemState(str, Enum):
+    PENDING = "pending"
+    INITIALIZING = "initializing"
+    READY = "ready"
+    UNAVAILABLE = "unavailable"  # Not present on this host
+    FAILED = "failed"
+
+
+class SubsystemStatus(BaseModel):
+    name: str
+    state: SubsystemState
+    seconds: Optional[float] = None  # Time spent initializing
+    message: Optional[str] = None
+
+
+class StartupInfo(BaseModel):
+    import_seconds: Optional[float] = None  # Since process start
+    first_response_seconds: Optional[float] = None  # Since process start
+    subsystems: list[SubsystemStatus]
+
+
 class PortAllocation(BaseModel):
     project: str
     port: int
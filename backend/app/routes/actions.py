@@ -4,6 +4,7 @@ import subprocess
 import logging
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from app.services.journal import journal
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,37 +33,39 @@ async def restart_system():
     """
     logger.info("System restart requested")
 
-    if not ENABLE_ACTIONS:
-        logger.warning("System restart blocked - ENABLE_SYSTEM_ACTIONS not set")
-        return ActionResponse(
-            success=False,
-            message="System actions disabled. Set ENABLE_SYSTEM_ACTIONS=true to enable."
-        )
-
-    try:
-        # Schedule restart with 10-second delay for graceful shutdown
-        subprocess.Popen(
-            ["sudo", "shutdown", "-r", "+0.1"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        logger.info("System restart initiated")
-        return ActionResponse(
-            success=True,
-            message="System will restart in 10 seconds"
-        )
-    except subprocess.SubprocessError as e:
-        logger.error(f"Failed to restart system: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to restart system: {str(e)}"
-        )
-    except Exception as e:
-        logger.error(f"Unexpected error during restart: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Unexpected error: {str(e)}"
-        )
+    with journal.action("system", "host", "restart") as entry:
+        if not ENABLE_ACTIONS:
+            logger.warning("System restart blocked - ENABLE_SYSTEM_ACTIONS not set")
+            entry.done(False, "System actions disabled")
+            return ActionResponse(
+                success=False,
+                message="System actions disabled. Set ENABLE_SYSTEM_ACTIONS=true to enable."
+            )
+
+        try:
+            # Schedule restart with 10-second delay for graceful shutdown
+            subprocess.Popen(
+                ["sudo", "shutdown", "-r", "+0.1"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            logger.info("System restart initiated")
+            return ActionResponse(
+                success=True,
+                message="System will restart in 10 seconds"
+            )
+        except subprocess.SubprocessError as e:
+            logger.error(f"Failed to restart system: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to restart system: {str(e)}"
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error during restart: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Unexpected error: {str(e)}"
+            )
 
 
 @router.post("/shutdown", response_model=ActionResponse)
@@ -75,37 +78,39 @@ async def shutdown_system():
     """
     logger.info("System shutdown requested")
 
-    if not ENABLE_ACTIONS:
-        logger.warning("System shutdown blocked - ENABLE_SYSTEM_ACTIONS not set")
-        return ActionResponse(
-            success=False,
-            message="System actions disabled. Set ENABLE_SYSTEM_ACTIONS=true to enable."
-        )
-
-    try:
-        # Schedule shutdown with 10-second delay for graceful shutdown
-        subprocess.Popen(
-            ["sudo", "shutdown", "-h", "+0.1"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        logger.info("System shutdown initiated")
-        return ActionResponse(
-            success=True,
-            message="System will shut down in 10 seconds"
-        )
-    except subprocess.SubprocessError as e:
-        logger.error(f"Failed to shutdown system: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to shutdown system: {str(e)}"
-        )
-    except Exception as e:
-        logger.error(f"Unexpected error during shutdown: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Unexpected error: {str(e)}"
-        )
+    with journal.action("system", "host", "shutdown") as entry:
+        if not ENABLE_ACTIONS:
+            logger.warning("System shutdown blocked - ENABLE_SYSTEM_ACTIONS not set")
+            entry.done(False, "System actions disabled")
+            return ActionResponse(
+                success=False,
+                message="System actions disabled. Set ENABLE_SYSTEM_ACTIONS=true to enable."
+            )
+
+        try:
+            # Schedule shutdown with 10-second delay for graceful shutdown
+            subprocess.Popen(
+                ["sudo", "shutdown", "-h", "+0.1"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            logger.info("System shutdown initiated")
+            return ActionResponse(
+                success=True,
+                message="System will shut down in 10 seconds"
+            )
+        except subprocess.SubprocessError as e:
+            logger.error(f"Failed to shutdown system: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to shutdown system: {str(e)}"
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error during shutdown: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Unexpected error: {str(e)}"
+            )
 
 
 @router.post("/logout", response_model=ActionResponse)
@@ -0,0 +1,60 @@
+"""Alert rules, active alerts and live alert transitions."""
+import asyncio
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from app.models import Alert, AlertEvent
+from app.services.alerts import AlertRule, alert_engine
+
+router = APIRouter(prefix="/api/alerts", tags=["alerts"])
+
+
+@router.get("", response_model=list[Alert])
+async def list_alerts():
+    """Alerts currently firing or pending (condition met, `for` not yet elapsed)."""
+    return alert_engine.active()
+
+
+@router.get("/rules", response_model=list[AlertRule])
+async def list_rules():
+    """Rules loaded from data/alerts.yaml."""
+    return list(alert_engine.rules.values())
+
+
+@router.get("/events", response_model=list[AlertEvent])
+async def list_events(limit: int = Query(default=50, ge=1, le=200)):
+    """Recent firing/resolved transitions, newest first."""
+    return list(alert_engine.events)[-limit:][::-1]
+
+
+@router.websocket("/ws")
+async def alert_stream(websocket: WebSocket):
+    """
+    Push alert transitions as they happen.
+
+    Sends every active alert on connect, then one AlertEvent per message.
+    """
+    await websocket.accept()
+    queue = alert_engine.subscribe()
+    receive = asyncio.ensure_future(websocket.receive())
+    event = None
+    try:
+        for alert in alert_engine.active():
+            await websocket.send_text(alert.model_dump_json())
+        while True:
+            if event is None:
+                event = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({event, receive}, return_when=asyncio.FIRST_COMPLETED)
+            if event in done:
+                await websocket.send_text(event.result().model_dump_json())
+                event = None
+            if receive in done:
+                # Clients send nothing; anything but a disconnect is ignored
+                if receive.result()["type"] == "websocket.disconnect":
+                    break
+                receive = asyncio.ensure_future(websocket.receive())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        alert_engine.unsubscribe(queue)
+        for task in (event, receive):
+            if task is not None and not task.done():
+                task.cancel()
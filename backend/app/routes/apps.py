@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException, Request, WebSocket
+from fastapi.responses import RedirectResponse
+from app.services.gateway import gateway, upstream_port
+from app.services.registry import registry
+
+router = APIRouter(prefix="/apps", tags=["apps"])
+
+PROXY_METHODS = ["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+
+
+@router.get("/{name}", include_in_schema=False)
+async def app_root(name: str):
+    """Redirect to the trailing-slash URL so relative asset paths resolve."""
+    return RedirectResponse(f"/apps/{name}/")
+
+
+@router.api_route("/{name}/{path:path}", methods=PROXY_METHODS, include_in_schema=False)
+async def proxy_app(name: str, path: str, request: Request):
+    """Reverse-proxy a request to a managed service (`api/...` goes to its backend)."""
+    config = registry.get(name)
+    if config is None:
+        raise HTTPException(status_code=404, detail=f"Unknown service: {name}")
+    port = upstream_port(config, path)
+    if port is None:
+        raise HTTPException(status_code=404, detail=f"{name} has no ports configured")
+    return await gateway.forward(request, name, port, path)
+
+
+@router.websocket("/{name}/{path:path}")
+async def proxy_app_websocket(websocket: WebSocket, name: str, path: str):
+    """Relay a WebSocket connection to a managed service."""
+    config = registry.get(name)
+    port = upstream_port(config, path, websocket=True) if config else None
+    if port is None:
+        await websocket.close(code=1008)
+        return
+    await gateway.forward_websocket(websocket, name, port, path)
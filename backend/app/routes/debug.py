@@ -0,0 +1,92 @@
+"""Profiling and event-loop diagnostics routes."""
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from app.models import PoolStats
+from app.services.executor import pools, profiler_pool
+from app.services.profiling import (
+    MAX_PROFILE_SECONDS,
+    PROFILING_ENABLED,
+    loop_monitor,
+    profile_store,
+    sample_stacks,
+)
+
+router = APIRouter(prefix="/api/debug", tags=["debug"])
+
+
+class LoopLagInfo(BaseModel):
+    """Event loop responsiveness as seen by the lag monitor."""
+    enabled: bool
+    threshold_ms: float
+    stalls: int
+    max_lag_ms: float
+    p50_lag_ms: Optional[float] = None
+    p99_lag_ms: Optional[float] = None
+
+
+def _require_profiling() -> None:
+    if not PROFILING_ENABLED:
+        raise HTTPException(
+            status_code=403,
+            detail="Profiling disabled. Set PROFILING_ENABLED=true to enable.",
+        )
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def sample_profile(
+    seconds: float = Query(default=10, gt=0, le=MAX_PROFILE_SECONDS),
+    interval: float = Query(default=0.005, gt=0, description="Seconds between samples"),
+):
+    """
+    Sample all thread stacks for N seconds.
+
+    Returns collapsed stacks for flamegraph.pl or speedscope. One profile
+    runs at a time. Requires PROFILING_ENABLED=true.
+    """
+    _require_profiling()
+    if profiler_pool.active or profiler_pool.queued:
+        raise HTTPException(status_code=409, detail="A sampling profile is already running")
+    return await profiler_pool.run(sample_stacks, seconds, interval, timeout=seconds + 5)
+
+
+@router.get("/profiles", response_model=list[str])
+async def list_request_profiles():
+    """IDs of recent per-request profiles (newest first)."""
+    _require_profiling()
+    return profile_store.ids()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_request_profile(profile_id: str):
+    """cProfile statistics for a request sent with `X-Profile: 1`."""
+    _require_profiling()
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
+    return profile
+
+
+@router.get("/loop", response_model=LoopLagInfo)
+async def get_loop_lag():
+    """Event loop lag statistics and the number of detected stalls."""
+    lag = loop_monitor.lag
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return value * 1000 if value is not None else None
+
+    return LoopLagInfo(
+        enabled=loop_monitor.enabled,
+        threshold_ms=loop_monitor.threshold * 1000,
+        stalls=loop_monitor.stalls,
+        max_lag_ms=loop_monitor.max_lag * 1000,
+        p50_lag_ms=ms(lag.quantile(0.5)),
+        p99_lag_ms=ms(lag.quantile(0.99)),
+    )
+
+
+@router.get("/pools", response_model=list[PoolStats])
+async def get_pool_stats():
+    """Workers, queue depth, timeouts and latency of the blocking-work thread pools."""
+    return [pool.stats() for pool in pools]
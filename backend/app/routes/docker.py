@@ -1,15 +1,57 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+import asyncio
 import subprocess
 import json
+import os
+import shutil
 import logging
-from typing import Optional
-from pydantic import BaseModel
+import re
+import time
+from typing import Any, AsyncIterator, Literal, Optional
+import orjson
+from pydantic import BaseModel, Field
+from app.models import ContainerStatsSample, ContainerTop, Job
+from app.services.container_stats import TOP_KEYS, container_stats, parse_size
+from app.services.executor import PoolTimeout, subprocess_pool
+from app.services.jobs import JobConflict, job_manager
+from app.services.journal import journal
+from app.services.snapshot import SnapshotCache, snapshot_response
+from app.services.startup import startup
+from app.services.telemetry import telemetry
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/docker", tags=["docker"])
 
+# Seconds an expired container list may still be served while it refreshes
+DOCKER_STALE_SECONDS = float(os.getenv("DOCKER_STALE_SECONDS", "5"))
+
+# `docker system df -v` walks every image layer and volume, so its result
+# is kept this many seconds and then refreshed in the background
+DOCKER_DF_TTL = float(os.getenv("DOCKER_DF_TTL", "300"))
+
+# Seconds allowed for `docker system df -v` and for each prune command
+DOCKER_DF_TIMEOUT = 50.0
+DOCKER_PRUNE_TIMEOUT = 600.0
+
+# Containers acted on at once by a batch action; each holds a subprocess
+# pool worker for up to the stop grace period, so keep this below
+# SUBPROCESS_WORKERS to leave workers for other docker calls
+DOCKER_BATCH_CONCURRENCY = int(os.getenv("DOCKER_BATCH_CONCURRENCY", "4"))
+
+# Label docker compose puts on a project's containers
+COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+
+# Prune targets and the commands that reclaim them
+PRUNE_COMMANDS = {
+    "containers": ["container", "prune", "-f"],
+    "images": ["image", "prune", "-f"],
+    "volumes": ["volume", "prune", "-f"],
+    "build_cache": ["builder", "prune", "-f"],
+}
+
 
 class ContainerInfo(BaseModel):
     id: str
@@ -27,6 +69,23 @@ class ContainerActionResponse(BaseModel):
     message: str
 
 
+class BatchActionRequest(BaseModel):
+    """Containers to act on: explicit ids/names, a compose project, or both."""
+    action: Literal["start", "stop", "restart"]
+    ids: list[str] = []
+    project: Optional[str] = None  # Compose project name
+    concurrency: Optional[int] = Field(default=None, ge=1, le=32)
+
+
+class ContainerActionResult(BaseModel):
+    """Outcome of a batch action for one container (one NDJSON line)."""
+    id: str
+    action: str
+    success: bool
+    message: str
+    seconds: float
+
+
 class ContainerStats(BaseModel):
     id: str
     name: str
@@ -38,15 +97,80 @@ class ContainerStats(BaseModel):
     block_io: str
 
 
-def run_docker_command(args: list[str]) -> tuple[bool, str]:
+class ImageUsage(BaseModel):
+    id: str
+    repository: str
+    tag: str
+    created: str
+    containers: int  # Containers using the image
+    size: int
+    shared_size: int  # Layers shared with other images
+    unique_size: int
+    dangling: bool
+    reclaimable: int  # Freed by pruning if unused
+
+
+class ContainerUsage(BaseModel):
+    id: str
+    name: str
+    image: str
+    state: str
+    size: int  # Writable layer
+    reclaimable: int  # Freed by pruning if stopped
+
+
+class VolumeUsage(BaseModel):
+    name: str
+    driver: str
+    links: int  # Containers mounting the volume
+    size: Optional[int] = None
+    reclaimable: int
+
+
+class BuildCacheUsage(BaseModel):
+    id: str
+    type: str
+    description: str
+    size: int
+    in_use: bool
+    shared: bool
+    last_used: str
+    reclaimable: int
+
+
+class UsageSummary(BaseModel):
+    type: str
+    count: int
+    active: int
+    size: int  # For images, layers unique to each image (shared layers aren't counted)
+    reclaimable: int
+
+
+class DockerDiskUsage(BaseModel):
+    """Disk usage of images, containers, volumes and build cache, largest first."""
+    summary: list[UsageSummary]
+    images: list[ImageUsage]
+    containers: list[ContainerUsage]
+    volumes: list[VolumeUsage]
+    build_cache: list[BuildCacheUsage]
+
+
+class PruneRequest(BaseModel):
+    # Required: a destructive bulk action never picks its targets implicitly
+    targets: list[Literal["containers", "images", "volumes", "build_cache"]] = Field(min_length=1)
+    all_images: bool = False  # Also remove unused tagged images, not just dangling ones
+
+
+def run_docker_command(args: list[str], timeout: float = 30) -> tuple[bool, str]:
     """Run a docker command and return success status and output."""
     try:
-        result = subprocess.run(
-            ["docker"] + args,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        with telemetry.timer("subprocess", f"docker {args[0]}"):
+            result = subprocess.run(
+                ["docker"] + args,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
         if result.returncode == 0:
             return True, result.stdout
         else:
@@ -63,11 +187,21 @@ def run_docker_command(args: list[str]) -> tuple[bool, str]:
         return False, str(e)
 
 
-@router.get("/containers", response_model=list[ContainerInfo])
-async def list_containers(all: bool = Query(default=True, description="Show all containers, not just running")):
-    """List all Docker containers."""
+def probe_docker() -> bool:
+    """Check that the docker CLI is installed and can reach the daemon."""
+    if shutil.which("docker") is None:
+        return False
+    success, _ = run_docker_command(["version", "--format", "{{.Server.Version}}"])
+    return success
+
+
+startup.register("docker", probe_docker, subprocess_pool)
+
+
+def collect_containers(all_containers: bool = True) -> list[ContainerInfo]:
+    """Collect the Docker container list via `docker ps`."""
     args = ["ps", "--format", "json", "--no-trunc"]
-    if all:
+    if all_containers:
         args.append("-a")
 
     success, output = run_docker_command(args)
@@ -97,11 +231,135 @@ async def list_containers(all: bool = Query(default=True, description="Show all
     return containers
 
 
+# Container list snapshot shared by all pollers
+containers_cache = SnapshotCache(
+    collect_containers, ttl=1.0, stale=DOCKER_STALE_SECONDS, pool=subprocess_pool
+)
+
+
+def _count(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _flag(value: Any) -> bool:
+    return str(value).lower() == "true"
+
+
+def collect_disk_usage() -> DockerDiskUsage:
+    """Per-image, container, volume and build cache sizes via `docker system df -v`."""
+    args = ["system", "df", "-v", "--format", "{{json .}}"]
+    success, output = run_docker_command(args, timeout=DOCKER_DF_TIMEOUT)
+    if not success:
+        raise RuntimeError(f"docker system df failed: {output.strip()}")
+    data = json.loads(output)
+
+    images = []
+    for item in data.get("Images") or []:
+        size = parse_size(item.get("Size")) or 0
+        shared = parse_size(item.get("SharedSize")) or 0
+        unique = parse_size(item.get("UniqueSize"))
+        unique = size - shared if unique is None else unique
+        containers = _count(item.get("Containers"))
+        images.append(ImageUsage(
+            id=item.get("ID", "").removeprefix("sha256:")[:12],
+            repository=item.get("Repository", ""),
+            tag=item.get("Tag", ""),
+            created=item.get("CreatedSince", ""),
+            containers=containers,
+            size=size,
+            shared_size=shared,
+            unique_size=unique,
+            dangling=item.get("Repository") == "<none>",
+            reclaimable=unique if containers == 0 else 0,
+        ))
+
+    containers = []
+    for item in data.get("Containers") or []:
+        size = parse_size(item.get("Size")) or 0
+        state = item.get("State", "")
+        containers.append(ContainerUsage(
+            id=item.get("ID", "")[:12],
+            name=item.get("Names", ""),
+            image=item.get("Image", ""),
+            state=state,
+            size=size,
+            reclaimable=size if state != "running" else 0,
+        ))
+
+    volumes = []
+    for item in data.get("Volumes") or []:
+        size = parse_size(item.get("Size"))
+        links = _count(item.get("Links"))
+        volumes.append(VolumeUsage(
+            name=item.get("Name", ""),
+            driver=item.get("Driver", ""),
+            links=links,
+            size=size,
+            reclaimable=(size or 0) if links == 0 else 0,
+        ))
+
+    build_cache = []
+    for item in data.get("BuildCache") or []:
+        size = parse_size(item.get("Size")) or 0
+        in_use, shared = _flag(item.get("InUse")), _flag(item.get("Shared"))
+        build_cache.append(BuildCacheUsage(
+            id=item.get("ID", ""),
+            type=item.get("CacheType", ""),
+            description=item.get("Description", ""),
+            size=size,
+            in_use=in_use,
+            shared=shared,
+            last_used=item.get("LastUsedSince", ""),
+            reclaimable=size if not in_use and not shared else 0,
+        ))
+
+    images.sort(key=lambda i: i.size, reverse=True)
+    containers.sort(key=lambda c: c.size, reverse=True)
+    volumes.sort(key=lambda v: v.size or 0, reverse=True)
+    build_cache.sort(key=lambda b: b.size, reverse=True)
+    summary = [
+        UsageSummary(
+            type=kind,
+            count=len(items),
+            active=sum(1 for item in items if active(item)),
+            size=sum(size(item) for item in items),
+            reclaimable=sum(item.reclaimable for item in items),
+        )
+        for kind, items, active, size in (
+            ("images", images, lambda i: i.containers > 0, lambda i: i.unique_size),
+            ("containers", containers, lambda c: c.state == "running", lambda c: c.size),
+            ("volumes", volumes, lambda v: v.links > 0, lambda v: v.size or 0),
+            ("build_cache", build_cache, lambda b: b.in_use, lambda b: b.size),
+        )
+    ]
+    return DockerDiskUsage(
+        summary=summary, images=images, containers=containers, volumes=volumes, build_cache=build_cache,
+    )
+
+
+# Disk usage, served from cache and recomputed in the background once stale
+disk_usage_cache = SnapshotCache(
+    collect_disk_usage, ttl=DOCKER_DF_TTL, stale=float("inf"), pool=subprocess_pool
+)
+
+
+@router.get("/containers", response_model=list[ContainerInfo])
+async def list_containers(
+    request: Request,
+    all: bool = Query(default=True, description="Show all containers, not just running"),
+):
+    """List all Docker containers."""
+    return snapshot_response(request, await containers_cache.fetch(all))
+
+
 @router.get("/containers/{container_id}/stats", response_model=ContainerStats)
 async def get_container_stats(container_id: str):
     """Get stats for a specific container."""
     args = ["stats", "--no-stream", "--format", "json", container_id]
-    success, output = run_docker_command(args)
+    success, output = await subprocess_pool.run(run_docker_command, args)
     if not success:
         raise HTTPException(status_code=500, detail=output)
 
@@ -132,55 +390,164 @@ async def get_container_stats(container_id: str):
 @router.post("/containers/{container_id}/start", response_model=ContainerActionResponse)
 async def start_container(container_id: str):
     """Start a container."""
-    success, output = run_docker_command(["start", container_id])
-    if success:
-        return ContainerActionResponse(success=True, message=f"Started container {container_id}")
-    else:
-        raise HTTPException(status_code=400, detail=output)
+    with journal.action("container", container_id, "start"):
+        success, output = await subprocess_pool.run(run_docker_command, ["start", container_id])
+        containers_cache.invalidate()
+        if success:
+            return ContainerActionResponse(success=True, message=f"Started container {container_id}")
+        else:
+            raise HTTPException(status_code=400, detail=output)
 
 
 @router.post("/containers/{container_id}/stop", response_model=ContainerActionResponse)
 async def stop_container(container_id: str):
     """Stop a container."""
-    success, output = run_docker_command(["stop", container_id])
-    if success:
-        return ContainerActionResponse(success=True, message=f"Stopped container {container_id}")
-    else:
-        raise HTTPException(status_code=400, detail=output)
+    with journal.action("container", container_id, "stop"):
+        success, output = await subprocess_pool.run(run_docker_command, ["stop", container_id])
+        containers_cache.invalidate()
+        if success:
+            return ContainerActionResponse(success=True, message=f"Stopped container {container_id}")
+        else:
+            raise HTTPException(status_code=400, detail=output)
 
 
 @router.post("/containers/{container_id}/restart", response_model=ContainerActionResponse)
 async def restart_container(container_id: str):
     """Restart a container."""
-    success, output = run_docker_command(["restart", container_id])
-    if success:
-        return ContainerActionResponse(success=True, message=f"Restarted container {container_id}")
-    else:
-        raise HTTPException(status_code=400, detail=output)
+    with journal.action("container", container_id, "restart"):
+        success, output = await subprocess_pool.run(run_docker_command, ["restart", container_id])
+        containers_cache.invalidate()
+        if success:
+            return ContainerActionResponse(success=True, message=f"Restarted container {container_id}")
+        else:
+            raise HTTPException(status_code=400, detail=output)
 
 
-@router.get("/containers/{container_id}/logs")
-async def get_container_logs(container_id: str, lines: int = Query(default=100, le=1000)):
-    """Get logs for a container."""
+def list_project_containers(project: str) -> list[str]:
+    """Ids of every container (running or not) of a compose project."""
+    args = ["ps", "-a", "-q", "--no-trunc", "--filter", f"label={COMPOSE_PROJECT_LABEL}={project}"]
+    success, output = run_docker_command(args)
+    if not success:
+        raise HTTPException(status_code=502, detail=output.strip())
+    return [line[:12] for line in output.split()]
+
+
+# Batch actions outlive a client that disconnects mid-stream
+_batch_tasks: set[asyncio.Task] = set()
+
+
+@router.post("/containers/batch")
+async def batch_container_action(body: BatchActionRequest):
+    """
+    Start, stop or restart many containers at once.
+
+    Containers are acted on concurrently, at most `concurrency` (default
+    DOCKER_BATCH_CONCURRENCY) at a time, so a compose stack stops in about
+    one grace period per batch instead of one per container. Results are
+    streamed as NDJSON, one ContainerActionResult per line in completion
+    order. The batch finishes even if the client disconnects.
+    """
+    ids = list(body.ids)
+    if body.project:
+        ids += await subprocess_pool.run(list_project_containers, body.project)
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise HTTPException(
+            status_code=404 if body.project else 400,
+            detail=f"No containers in project {body.project}" if body.project else "No containers given",
+        )
+
+    semaphore = asyncio.Semaphore(body.concurrency or DOCKER_BATCH_CONCURRENCY)
+    done = {"start": "Started", "stop": "Stopped", "restart": "Restarted"}[body.action]
+
+    async def act(container_id: str) -> ContainerActionResult:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                success, output = await subprocess_pool.run(run_docker_command, [body.action, container_id])
+            except PoolTimeout as e:
+                success, output = False, str(e)
+            finally:
+                containers_cache.invalidate()
+        journal.record("container", container_id, body.action, success,
+                       duration=time.perf_counter() - started, message=None if success else output.strip())
+        return ContainerActionResult(
+            id=container_id,
+            action=body.action,
+            success=success,
+            message=f"{done} container {container_id}" if success else output.strip(),
+            seconds=round(time.perf_counter() - started, 3),
+        )
+
+    tasks = [asyncio.create_task(act(container_id)) for container_id in ids]
+    for task in tasks:
+        _batch_tasks.add(task)
+        task.add_done_callback(_batch_tasks.discard)
+
+    async def results() -> AsyncIterator[bytes]:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            yield orjson.dumps(result.model_dump()) + b"\n"
+
+    logger.info(f"Batch {body.action} of {len(ids)} container(s)")
+    # An explicit encoding keeps the compression middleware from buffering lines
+    return StreamingResponse(
+        results(), media_type="application/x-ndjson", headers={"Content-Encoding": "identity"}
+    )
+
+
+@router.get("/containers/{container_id}/history", response_model=list[ContainerStatsSample])
+async def get_container_history(
+    container_id: str,
+    seconds: float = Query(default=600, gt=0, description="Window of history to return"),
+):
+    """Sampled CPU, memory and I/O history of a container (by id, id prefix or name)."""
+    resolved = container_stats.resolve(container_id)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail=f"No stats history for container {container_id}")
+    return container_stats.history(resolved, seconds)
+
+
+@router.get("/top", response_model=list[ContainerTop])
+async def get_top_containers(
+    by: str = Query(default="cpu", description="cpu (mean %), mem (latest), net or io (bytes/s)"),
+    window: float = Query(default=300, gt=0, description="Seconds of history to rank over"),
+    limit: int = Query(default=10, ge=1, le=100),
+):
+    """Containers ranked by resource usage over a recent window."""
+    if by not in TOP_KEYS:
+        raise HTTPException(status_code=400, detail=f"by must be one of {', '.join(TOP_KEYS)}")
+    return container_stats.top(by, window, limit)
+
+
+def read_container_logs(container_id: str, lines: int) -> str:
+    """Last `lines` lines of a container's stdout and stderr."""
     args = ["logs", "--tail", str(lines), container_id]
     success, output = run_docker_command(args)
     if not success:
         # Try stderr as docker logs outputs to stderr
-        result = subprocess.run(
-            ["docker"] + args,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        with telemetry.timer("subprocess", "docker logs"):
+            result = subprocess.run(
+                ["docker"] + args,
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
         output = result.stdout + result.stderr
+    return output
+
 
+@router.get("/containers/{container_id}/logs")
+async def get_container_logs(container_id: str, lines: int = Query(default=100, le=1000)):
+    """Get logs for a container."""
+    output = await subprocess_pool.run(read_container_logs, container_id, lines)
     return {"logs": output.split('\n'), "container": container_id}
 
 
 @router.get("/info")
 async def get_docker_info():
     """Get Docker system info."""
-    success, output = run_docker_command(["info", "--format", "json"])
+    success, output = await subprocess_pool.run(run_docker_command, ["info", "--format", "json"])
     if not success:
         logger.warning("Failed to get Docker info")
         return {
@@ -221,3 +588,67 @@ async def get_docker_info():
             "memory_total": 0,
             "cpus": 0,
         }
+
+
+@router.get("/disk-usage", response_model=DockerDiskUsage)
+async def get_disk_usage(
+    request: Request,
+    refresh: bool = Query(default=False, description="Recompute instead of serving the cached result"),
+):
+    """
+    Space used by images, containers, volumes and build cache, with reclaimable bytes.
+
+    Computed by `docker system df -v` off the request path: after the first
+    call, responses come from cache and a stale result is refreshed in the
+    background.
+    """
+    if refresh:
+        disk_usage_cache.invalidate()
+    try:
+        return snapshot_response(request, await disk_usage_cache.fetch())
+    except (RuntimeError, json.JSONDecodeError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def prune(target: str, all_images: bool) -> tuple[bool, str]:
+    """Run one prune command (blocking)."""
+    args = list(PRUNE_COMMANDS[target])
+    if all_images and target in ("images", "build_cache"):
+        args.append("-a")
+    return run_docker_command(args, timeout=DOCKER_PRUNE_TIMEOUT)
+
+
+@router.post("/prune", response_model=Job, status_code=202)
+async def prune_resources(body: PruneRequest):
+    """
+    Remove stopped containers, unused images, unused volumes and/or build cache.
+
+    Runs as a background job; poll /api/jobs/{id} for the space reclaimed
+    per target. The same prune already running is returned instead of
+    starting another; a running prune of other targets is a 409.
+    """
+    async def run() -> dict[str, Any]:
+        results = {}
+        try:
+            # One after another: prunes contend for the same daemon lock anyway
+            for target in body.targets:
+                with journal.action("docker", target, "prune") as entry:
+                    success, output = await subprocess_pool.run(
+                        prune, target, body.all_images, timeout=DOCKER_PRUNE_TIMEOUT + 5
+                    )
+                    if not success:
+                        raise RuntimeError(f"{target}: {output.strip()}")
+                    match = re.search(r"Total reclaimed space:\s*(\S+)", output)
+                    results[target] = parse_size(match.group(1)) if match else 0
+                    entry.done(True, f"Reclaimed {results[target]} bytes")
+        finally:
+            containers_cache.invalidate()
+            disk_usage_cache.invalidate()
+            disk_usage_cache.prefetch()
+        return {"reclaimed": results, "total_reclaimed": sum(results.values())}
+
+    params = {"targets": sorted(set(body.targets)), "all_images": body.all_images}
+    try:
+        return job_manager.submit("docker_prune", run, params)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
@@ -0,0 +1,77 @@
+"""Merged multi-host views across federated StonePieHome backends."""
+import logging
+from typing import Any
+import orjson
+from fastapi import APIRouter
+from pydantic import BaseModel, ValidationError
+from app.models import HostServiceInfo, HostSystemMetrics, PeerStatus, SystemMetrics
+from app.routes.docker import ContainerInfo, containers_cache
+from app.routes.services import services_cache
+from app.services.executor import psutil_pool
+from app.services.federation import FEDERATION_HOST_NAME, federation
+from app.services.metrics import get_system_metrics
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/federation", tags=["federation"])
+
+
+class HostContainerInfo(ContainerInfo):
+    host: str
+
+
+def _tagged(model: type[BaseModel], host: str, items: list[dict[str, Any]]) -> list:
+    """Validate a host's list items as `model`, tagged with the host name."""
+    tagged = []
+    for item in items:
+        try:
+            tagged.append(model(**{**item, "host": host}))
+        except ValidationError as e:
+            logger.warning(f"Skipping malformed item from {host}: {e}")
+    return tagged
+
+
+@router.get("/peers", response_model=list[PeerStatus])
+async def list_peers():
+    """Configured peer backends with their reachability and poll latency."""
+    return federation.status()
+
+
+@router.get("/system", response_model=list[HostSystemMetrics])
+async def get_federated_system():
+    """System metrics of this host and every peer (offline peers have no metrics)."""
+    hosts = [HostSystemMetrics(
+        host=FEDERATION_HOST_NAME,
+        online=True,
+        metrics=await psutil_pool.run(get_system_metrics),
+    )]
+    latest = dict(federation.snapshots("/api/system"))
+    for peer in federation.peers:
+        metrics = None
+        if peer.name in latest:
+            try:
+                metrics = SystemMetrics(**latest[peer.name])
+            except ValidationError as e:
+                logger.warning(f"Malformed system metrics from {peer.name}: {e}")
+        hosts.append(HostSystemMetrics(host=peer.name, online=metrics is not None, metrics=metrics))
+    return hosts
+
+
+@router.get("/services", response_model=list[HostServiceInfo])
+async def get_federated_services():
+    """Services of this host and every online peer, tagged by host."""
+    local = orjson.loads((await services_cache.fetch()).body)
+    services = _tagged(HostServiceInfo, FEDERATION_HOST_NAME, local)
+    for host, items in federation.snapshots("/api/services"):
+        services += _tagged(HostServiceInfo, host, items)
+    return services
+
+
+@router.get("/docker/containers", response_model=list[HostContainerInfo])
+async def get_federated_containers():
+    """Docker containers of this host and every online peer, tagged by host."""
+    local = orjson.loads((await containers_cache.fetch(True)).body)
+    containers = _tagged(HostContainerInfo, FEDERATION_HOST_NAME, local)
+    for host, items in federation.snapshots("/api/docker/containers"):
+        containers += _tagged(HostContainerInfo, host, items)
+    return containers
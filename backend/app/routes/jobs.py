@@ -0,0 +1,21 @@
+"""Background job status routes."""
+from fastapi import APIRouter, HTTPException
+from app.models import Job
+from app.services.jobs import job_manager
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("", response_model=list[Job])
+async def list_jobs():
+    """Running and recently finished jobs, newest first."""
+    return job_manager.list()
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    """Status and result of one job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
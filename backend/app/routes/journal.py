@@ -0,0 +1,22 @@
+"""Action journal routes."""
+from typing import Optional
+from fastapi import APIRouter, Query
+from app.models import JournalEvent
+from app.services.executor import filesystem_pool
+from app.services.journal import journal
+
+router = APIRouter(prefix="/api/journal", tags=["journal"])
+
+
+@router.get("", response_model=list[JournalEvent])
+async def get_journal(
+    start: Optional[float] = Query(None, description="Events at or after this Unix time"),
+    end: Optional[float] = Query(None, description="Events before this Unix time"),
+    kind: Optional[str] = Query(None, description="service, stack, container, docker or system"),
+    target: Optional[str] = Query(None, description="Service, container or stack name"),
+    action: Optional[str] = Query(None),
+    success: Optional[bool] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Recorded actions matching the filters, newest first."""
+    return await filesystem_pool.run(journal.query, start, end, kind, target, action, success, limit)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from app.services.executor import psutil_pool
+from app.services.prometheus import CONTENT_TYPE, render_metrics
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_prometheus_metrics():
+    """Request latency, collector timings and host metrics in Prometheus text format."""
+    body = await psutil_pool.run(render_metrics)
+    return Response(content=body, media_type=CONTENT_TYPE)
@@ -1,11 +1,17 @@
-from fastapi import APIRouter
+import os
+from fastapi import APIRouter, Request
 import psutil
 import socket
 from pydantic import BaseModel
 from typing import Optional
+from app.services.executor import psutil_pool
+from app.services.snapshot import SnapshotCache, snapshot_response
 
 router = APIRouter(prefix="/api/network", tags=["network"])
 
+# Seconds an expired network status may still be served while it refreshes
+NETWORK_STALE_SECONDS = float(os.getenv("NETWORK_STALE_SECONDS", "5"))
+
 
 class NetworkInterface(BaseModel):
     name: str
@@ -38,9 +44,8 @@ class NetworkStatus(BaseModel):
     established_connections: int
 
 
-@router.get("/status", response_model=NetworkStatus)
-async def get_network_status():
-    """Get comprehensive network status."""
+def collect_network_status() -> NetworkStatus:
+    """Collect interfaces, I/O counters and connection counts."""
     # Get hostname
     hostname = socket.gethostname()
 
@@ -98,9 +103,20 @@ async def get_network_status():
     )
 
 
-@router.get("/connections")
-async def get_connections():
-    """Get active network connections."""
+# Network status snapshot shared by all pollers
+network_cache = SnapshotCache(
+    collect_network_status, ttl=1.0, stale=NETWORK_STALE_SECONDS, pool=psutil_pool
+)
+
+
+@router.get("/status", response_model=NetworkStatus)
+async def get_network_status(request: Request):
+    """Get comprehensive network status."""
+    return snapshot_response(request, await network_cache.fetch())
+
+
+def collect_connections() -> list[dict]:
+    """Established and listening inet connections (first 100)."""
     connections = []
     for conn in psutil.net_connections(kind='inet'):
         if conn.status == 'ESTABLISHED' or conn.status == 'LISTEN':
@@ -111,3 +127,9 @@ async def get_connections():
                 "pid": conn.pid,
             })
     return connections[:100]  # Limit to 100 connections
+
+
+@router.get("/connections")
+async def get_connections():
+    """Get active network connections."""
+    return await psutil_pool.run(collect_connections)
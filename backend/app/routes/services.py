@@ -1,26 +1,112 @@
-from fastapi import APIRouter, HTTPException, Query
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
 from app.services.process import (
     get_all_services,
     start_service,
     stop_service,
     get_service_logs,
-    KNOWN_SERVICES,
+    get_service_history,
+    get_service_resources,
+)
+from app.services.executor import filesystem_pool, subprocess_pool
+from app.services.gateway import gateway
+from app.services.idle import idle_manager
+from app.services.journal import journal
+from app.services.orchestrator import DependencyError, start_all, stop_all
+from app.services.registry import registry
+from app.services.snapshot import SnapshotCache, snapshot_response
+from app.models import (
+    ServiceInfo,
+    ServiceActionResponse,
+    ServiceResources,
+    StackActionResponse,
+    LogsResponse,
+    ProxyLatency,
 )
-from app.models import ServiceInfo, ServiceActionResponse, LogsResponse
 
 router = APIRouter(prefix="/api/services", tags=["services"])
 
+# Seconds an expired service status list may still be served while it refreshes
+SERVICES_STALE_SECONDS = float(os.getenv("SERVICES_STALE_SECONDS", "2"))
+
+# Service status snapshot shared by all pollers
+services_cache = SnapshotCache(
+    get_all_services, ttl=1.0, stale=SERVICES_STALE_SECONDS, pool=subprocess_pool
+)
+
+
+# Resource usage changes every sampler tick, so it has its own snapshot
+# and ETag instead of invalidating the service list's
+resources_cache = SnapshotCache(get_service_resources, ttl=1.0)
+
 
 @router.get("", response_model=list[ServiceInfo])
-async def list_services():
+async def list_services(request: Request):
     """Get list of all known services with their status."""
-    return get_all_services()
+    return snapshot_response(request, await services_cache.fetch())
+
+
+@router.get("/resources", response_model=dict[str, ServiceResources])
+async def list_service_resources(request: Request):
+    """Get the latest CPU, memory, fd and GPU memory usage of running services."""
+    return snapshot_response(request, await resources_cache.fetch())
+
+
+def _stack_failures(response: StackActionResponse) -> Optional[str]:
+    failed = [result.name for result in response.results if not result.success]
+    return f"Failed: {', '.join(failed)}" if failed else None
+
+
+def _journal_stack_results(action: str, response: StackActionResponse) -> None:
+    """Journal each service of a stack action, so per-service queries include it."""
+    for result in response.results:
+        journal.record("service", result.name, action, result.success,
+                       duration=result.seconds, message=result.message)
+
+
+@router.post("/start-all", response_model=StackActionResponse)
+async def start_all_endpoint(names: Optional[list[str]] = Query(default=None)):
+    """
+    Start all services (or the named ones plus their dependencies).
+
+    Independent services start in parallel; dependents wait until their
+    dependencies pass the readiness check.
+    """
+    try:
+        with journal.action("stack", ",".join(names or ["*"]), "start-all") as entry:
+            response = await start_all(names)
+            entry.done(response.success, _stack_failures(response))
+        _journal_stack_results("start", response)
+    except DependencyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        services_cache.invalidate()
+    return response
+
+
+@router.post("/stop-all", response_model=StackActionResponse)
+async def stop_all_endpoint(names: Optional[list[str]] = Query(default=None)):
+    """Stop all services (or the named ones), dependents first."""
+    try:
+        with journal.action("stack", ",".join(names or ["*"]), "stop-all") as entry:
+            response = await stop_all(names)
+            entry.done(response.success, _stack_failures(response))
+        _journal_stack_results("stop", response)
+    except DependencyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        services_cache.invalidate()
+    return response
 
 
 @router.post("/{name}/start", response_model=ServiceActionResponse)
 async def start_service_endpoint(name: str):
     """Start a service."""
-    success, message = start_service(name)
+    with journal.action("service", name, "start") as entry:
+        success, message = await start_service(name)
+        entry.done(success, message)
+    services_cache.invalidate()
     if not success:
         raise HTTPException(status_code=400, detail=message)
     return ServiceActionResponse(success=success, message=message)
@@ -29,7 +115,10 @@ async def start_service_endpoint(name: str):
 @router.post("/{name}/stop", response_model=ServiceActionResponse)
 async def stop_service_endpoint(name: str):
     """Stop a service."""
-    success, message = stop_service(name)
+    with journal.action("service", name, "stop") as entry:
+        success, message = await stop_service(name)
+        entry.done(success, message)
+    services_cache.invalidate()
     if not success:
         raise HTTPException(status_code=400, detail=message)
     return ServiceActionResponse(success=success, message=message)
@@ -38,20 +127,56 @@ async def stop_service_endpoint(name: str):
 @router.post("/{name}/restart", response_model=ServiceActionResponse)
 async def restart_service_endpoint(name: str):
     """Restart a service (stop then start)."""
-    # Stop first
-    stop_service(name)
+    with journal.action("service", name, "restart") as entry:
+        # Stop first
+        await stop_service(name)
 
-    # Then start
-    success, message = start_service(name)
+        # Then start
+        success, message = await start_service(name)
+        entry.done(success, message)
+    services_cache.invalidate()
     if not success:
         raise HTTPException(status_code=400, detail=message)
     return ServiceActionResponse(success=success, message=f"Restarted {name}")
 
 
+@router.post("/{name}/wake", response_model=ServiceActionResponse)
+async def wake_service_endpoint(name: str):
+    """Start a (sleeping) service and wait until it passes its readiness check."""
+    if registry.get(name) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown service: {name}")
+    with journal.action("service", name, "wake") as entry:
+        ready = await idle_manager.wake(name)
+        entry.done(ready)
+    services_cache.invalidate()
+    if not ready:
+        raise HTTPException(status_code=503, detail=f"{name} did not become ready")
+    return ServiceActionResponse(success=True, message=f"{name} is awake")
+
+
 @router.get("/{name}/logs", response_model=LogsResponse)
 async def get_logs_endpoint(name: str, lines: int = Query(default=100, le=1000)):
     """Get recent logs for a service."""
-    if name not in KNOWN_SERVICES:
+    if registry.get(name) is None:
         raise HTTPException(status_code=404, detail=f"Unknown service: {name}")
-    logs = get_service_logs(name, lines)
+    logs = await filesystem_pool.run(get_service_logs, name, lines)
     return LogsResponse(logs=logs, service=name)
+
+
+@router.get("/{name}/history", response_model=list[ServiceResources])
+async def get_history_endpoint(
+    name: str,
+    seconds: float = Query(default=600, gt=0, description="Window of history to return"),
+):
+    """Get sampled CPU, memory, fd and GPU memory usage history for a service."""
+    if registry.get(name) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown service: {name}")
+    return get_service_history(name, seconds)
+
+
+@router.get("/{name}/latency", response_model=ProxyLatency)
+async def get_latency_endpoint(name: str):
+    """Get latency statistics for requests proxied to a service under /apps/{name}/."""
+    if registry.get(name) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown service: {name}")
+    return gateway.latency(name)
@@ -1,6 +1,7 @@
 """Settings and wallpaper API routes."""
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from app.services.config import UserSettings, get_settings, save_settings
+from app.services.executor import filesystem_pool
 from app.services.wallpaper import (
     WallpaperInfo,
     list_wallpapers,
@@ -14,20 +15,20 @@ router = APIRouter(prefix="/api/settings", tags=["settings"])
 @router.get("", response_model=UserSettings)
 async def get_user_settings():
     """Get current user settings."""
-    return get_settings()
+    return await filesystem_pool.run(get_settings)
 
 
 @router.put("")
 async def update_user_settings(settings: UserSettings):
     """Update user settings."""
-    save_settings(settings)
+    await filesystem_pool.run(save_settings, settings)
     return {"success": True, "message": "Settings updated"}
 
 
 @router.get("/wallpapers", response_model=list[WallpaperInfo])
 async def get_wallpapers():
     """List all available wallpapers (defaults + user uploads)."""
-    return list_wallpapers()
+    return await filesystem_pool.run(list_wallpapers)
 
 
 @router.post("/wallpapers/upload", response_model=WallpaperInfo)
@@ -45,6 +46,6 @@ async def remove_wallpaper(wallpaper_id: str):
     if wallpaper_id.startswith("default-"):
         raise HTTPException(status_code=400, detail="Cannot delete default wallpapers")
 
-    if delete_wallpaper(wallpaper_id):
+    if await filesystem_pool.run(delete_wallpaper, wallpaper_id):
         return {"success": True, "message": "Wallpaper deleted"}
     raise HTTPException(status_code=404, detail="Wallpaper not found")
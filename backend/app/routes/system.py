@@ -2,11 +2,13 @@ import socket
 import platform
 import time
 import psutil
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional
+from app.services.executor import psutil_pool
 from app.services.metrics import get_system_metrics
-from app.models import SystemMetrics
+from app.services.sampler import sampler
+from app.models import PressureMetrics, SystemMetrics
 
 router = APIRouter(prefix="/api/system", tags=["system"])
 
@@ -52,12 +54,30 @@ def format_uptime(seconds: float) -> str:
 @router.get("", response_model=SystemMetrics)
 async def get_metrics():
     """Get current system metrics (CPU, RAM, GPU, etc.)."""
-    return get_system_metrics()
+    # Blocks for the CPU sampling interval
+    return await psutil_pool.run(get_system_metrics)
 
 
-@router.get("/info", response_model=DeviceInfo)
-async def get_device_info():
-    """Get device information (hostname, OS, IP, uptime)."""
+@router.get("/pressure", response_model=PressureMetrics)
+async def get_pressure():
+    """Get PSI averages, swap/page-fault rates and cgroup memory usage."""
+    # Sampling here would move the sampler's vmstat baseline and skew its next rates
+    pressure = sampler.latest("pressure")
+    if pressure is None:
+        raise HTTPException(status_code=503, detail="Pressure metrics not sampled yet")
+    return pressure
+
+
+@router.get("/pressure/history", response_model=list[PressureMetrics])
+async def get_pressure_history(
+    seconds: float = Query(default=600, gt=0, description="Window of history to return"),
+):
+    """Get sampled pressure metrics over a time window."""
+    return [value for _, value in sampler.history("pressure", seconds)]
+
+
+def _device_info() -> DeviceInfo:
+    """Hostname, OS, IP and uptime (blocking: reads /proc and connects a socket)."""
     boot_time = psutil.boot_time()
     uptime_seconds = time.time() - boot_time
 
@@ -68,3 +88,9 @@ async def get_device_info():
         uptime_seconds=uptime_seconds,
         uptime_formatted=format_uptime(uptime_seconds)
     )
+
+
+@router.get("/info", response_model=DeviceInfo)
+async def get_device_info():
+    """Get device information (hostname, OS, IP, uptime)."""
+    return await psutil_pool.run(_device_info)
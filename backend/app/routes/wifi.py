@@ -1,14 +1,23 @@
 """Wi-Fi management routes."""
+import os
+import shutil
 import subprocess
 import logging
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
+from app.services.executor import subprocess_pool
+from app.services.snapshot import SnapshotCache, snapshot_response
+from app.services.startup import startup
+from app.services.telemetry import telemetry
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/wifi", tags=["wifi"])
 
+# Seconds an expired scan may still be served while it refreshes
+WIFI_STALE_SECONDS = float(os.getenv("WIFI_STALE_SECONDS", "10"))
+
 
 class WifiNetwork(BaseModel):
     """Wi-Fi network information."""
@@ -32,16 +41,37 @@ class WifiInfo(BaseModel):
     networks: list[WifiNetwork]
 
 
+def probe_nmcli() -> bool:
+    """Check that nmcli is installed and NetworkManager is running."""
+    if shutil.which("nmcli") is None:
+        return False
+    try:
+        with telemetry.timer("subprocess", "nmcli general"):
+            result = subprocess.run(
+                ['nmcli', '-t', '-f', 'RUNNING', 'general'],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+    except (subprocess.SubprocessError, OSError):
+        return False
+    return result.returncode == 0 and result.stdout.strip() == "running"
+
+
+startup.register("nmcli", probe_nmcli, subprocess_pool)
+
+
 def get_wifi_networks() -> list[WifiNetwork]:
     """Get list of available Wi-Fi networks using nmcli."""
     networks = []
     try:
-        result = subprocess.run(
-            ['nmcli', '-t', '-f', 'SSID,SIGNAL,SECURITY,IN-USE', 'dev', 'wifi', 'list'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        with telemetry.timer("subprocess", "nmcli wifi list"):
+            result = subprocess.run(
+                ['nmcli', '-t', '-f', 'SSID,SIGNAL,SECURITY,IN-USE', 'dev', 'wifi', 'list'],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
         if result.returncode == 0:
             for line in result.stdout.strip().split('\n'):
                 if line:
@@ -80,12 +110,13 @@ def get_wifi_status(networks: list[WifiNetwork] | None = None) -> WifiStatus:
         networks: Optional pre-fetched network list to avoid redundant calls
     """
     try:
-        result = subprocess.run(
-            ['nmcli', '-t', '-f', 'NAME,TYPE,DEVICE', 'connection', 'show', '--active'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        with telemetry.timer("subprocess", "nmcli connection show"):
+            result = subprocess.run(
+                ['nmcli', '-t', '-f', 'NAME,TYPE,DEVICE', 'connection', 'show', '--active'],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
         if result.returncode == 0:
             for line in result.stdout.strip().split('\n'):
                 parts = line.split(':')
@@ -116,9 +147,8 @@ def get_wifi_status(networks: list[WifiNetwork] | None = None) -> WifiStatus:
     return WifiStatus(connected=False)
 
 
-@router.get("", response_model=WifiInfo)
-async def get_wifi_info():
-    """Get Wi-Fi status and available networks."""
+def collect_wifi_info() -> WifiInfo:
+    """Collect Wi-Fi status and available networks with one network scan."""
     networks = get_wifi_networks()
     return WifiInfo(
         status=get_wifi_status(networks),
@@ -126,29 +156,43 @@ async def get_wifi_info():
     )
 
 
+# Wi-Fi snapshots shared by all pollers
+wifi_cache = SnapshotCache(collect_wifi_info, ttl=2.0, stale=WIFI_STALE_SECONDS, pool=subprocess_pool)
+status_cache = SnapshotCache(get_wifi_status, ttl=2.0, stale=WIFI_STALE_SECONDS, pool=subprocess_pool)
+networks_cache = SnapshotCache(get_wifi_networks, ttl=2.0, stale=WIFI_STALE_SECONDS, pool=subprocess_pool)
+
+
+@router.get("", response_model=WifiInfo)
+async def get_wifi_info(request: Request):
+    """Get Wi-Fi status and available networks."""
+    return snapshot_response(request, await wifi_cache.fetch())
+
+
 @router.get("/status", response_model=WifiStatus)
-async def get_connection_status():
+async def get_connection_status(request: Request):
     """Get current Wi-Fi connection status only."""
-    return get_wifi_status()
+    return snapshot_response(request, await status_cache.fetch())
 
 
 @router.get("/networks", response_model=list[WifiNetwork])
-async def get_available_networks():
+async def get_available_networks(request: Request):
     """Get list of available Wi-Fi networks."""
-    return get_wifi_networks()
+    return snapshot_response(request, await networks_cache.fetch())
 
 
-@router.post("/scan")
-async def scan_networks():
-    """Trigger a Wi-Fi network scan."""
+def rescan_networks() -> dict:
+    """Ask NetworkManager to rescan for Wi-Fi networks."""
     try:
-        result = subprocess.run(
-            ['nmcli', 'dev', 'wifi', 'rescan'],
-            capture_output=True,
-            timeout=10
-        )
+        with telemetry.timer("subprocess", "nmcli wifi rescan"):
+            result = subprocess.run(
+                ['nmcli', 'dev', 'wifi', 'rescan'],
+                capture_output=True,
+                timeout=10
+            )
         if result.returncode == 0:
             logger.info("Wi-Fi network scan initiated successfully")
+            for cache in (wifi_cache, status_cache, networks_cache):
+                cache.invalidate()
             return {"success": True, "message": "Scan initiated"}
         else:
             error_msg = result.stderr.decode('utf-8') if result.stderr else "Unknown error"
@@ -160,3 +204,9 @@ async def scan_networks():
     except Exception as e:
         logger.error(f"Unexpected error during Wi-Fi scan: {e}")
         return {"success": False, "message": str(e)}
+
+
+@router.post("/scan")
+async def scan_networks():
+    """Trigger a Wi-Fi network scan."""
+    return await subprocess_pool.run(rescan_networks)
@@ -0,0 +1,455 @@
+"""Threshold alerting over sampled metrics."""
+import asyncio
+import fnmatch
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
+from app.models import Alert, AlertEvent, AlertState
+from app.services.container_stats import container_stats
+from app.services.executor import subprocess_pool
+from app.services.metrics import gpu_collector
+from app.services.process import get_service_resources
+from app.services.registry import registry
+from app.services.sampler import sampler
+from app.services.sensors import cpu_temperature, temperature_sensors
+from app.services.supervisor import supervisor
+from app.services.telemetry import telemetry
+
+# httpx is imported on first use; it adds ~0.1s to backend import time
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Data directory for the rules file
+DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
+ALERTS_FILE = DATA_DIR / "alerts.yaml"
+
+# Hooks run on every state transition: a URL receiving a JSON POST of the
+# events, and a shell command receiving one event as JSON on stdin
+ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL", "")
+ALERT_COMMAND = os.getenv("ALERT_COMMAND", "")
+ALERT_HOOK_TIMEOUT = 10.0
+
+# Transitions kept for /api/alerts/events, and queued per connected client
+EVENT_HISTORY = 200
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Metric groups; a collector only gathers the groups some rule refers to
+METRIC_GROUPS = ("cpu", "memory", "gpu", "disk", "container", "service")
+
+# Rules written to a fresh alerts.yaml
+DEFAULT_RULES = {
+    "gpu_hot": {
+        "metric": "gpu.*.temperature",
+        "above": 85,
+        "for": 30,
+        "severity": "critical",
+        "description": "GPU temperature above 85°C",
+    },
+    "gpu_memory_full": {
+        "metric": "gpu.*.memory_percent",
+        "above": 95,
+        "for": 60,
+        "description": "GPU memory above 95%",
+    },
+    "memory_full": {
+        "metric": "memory.percent",
+        "above": 95,
+        "for": 60,
+        "severity": "critical",
+        "description": "System memory above 95%",
+    },
+    "disk_full": {
+        "metric": "disk.*.percent",
+        "above": 90,
+        "for": 300,
+        "description": "Filesystem above 90% full",
+    },
+}
+
+
+class AlertRule(BaseModel):
+    """
+    One alerting rule from alerts.yaml.
+
+    `metric` names a sampled metric, with `*` matching any part (e.g.
+    `gpu.*.temperature`, `service.*.up`). The rule's condition holds while
+    the value is above `above` or below `below`, or while its change per
+    second is above `rate_above` or below `rate_below`. It fires once the
+    condition has held for `for` seconds and resolves as soon as it stops.
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    name: str
+    metric: str
+    above: Optional[float] = None
+    below: Optional[float] = None
+    rate_above: Optional[float] = None  # Change per second
+    rate_below: Optional[float] = None
+    for_seconds: float = Field(default=0.0, alias="for", ge=0)
+    severity: str = "warning"
+    description: str = ""
+
+    @model_validator(mode="after")
+    def _has_condition(self) -> "AlertRule":
+        if all(v is None for v in (self.above, self.below, self.rate_above, self.rate_below)):
+            raise ValueError("needs at least one of above, below, rate_above, rate_below")
+        return self
+
+    @property
+    def group(self) -> Optional[str]:
+        """Metric group the rule reads, or None if it may match any group."""
+        group = self.metric.split(".", 1)[0]
+        return None if any(c in group for c in "*?[") else group
+
+
+class RulesFile(BaseModel):
+    """Schema of alerts.yaml."""
+    rules: dict[str, dict] = {}
+
+
+class _Series:
+    """Evaluation state of one rule against one concrete metric."""
+    __slots__ = (
+        "rule", "metric", "above", "below", "rate_above", "rate_below", "uses_rate",
+        "for_seconds", "since", "firing", "value", "last_value", "last_time",
+    )
+
+    def __init__(self, rule: AlertRule, metric: str):
+        self.rule = rule
+        self.metric = metric
+        # Unset bounds become infinities so evaluation is plain comparisons
+        self.above = rule.above if rule.above is not None else float("inf")
+        self.below = rule.below if rule.below is not None else float("-inf")
+        self.rate_above = rule.rate_above if rule.rate_above is not None else float("inf")
+        self.rate_below = rule.rate_below if rule.rate_below is not None else float("-inf")
+        self.uses_rate = rule.rate_above is not None or rule.rate_below is not None
+        self.for_seconds = rule.for_seconds
+        self.since: Optional[float] = None
+        self.firing = False
+        self.value = 0.0
+        self.last_value: Optional[float] = None
+        self.last_time: Optional[float] = None
+
+
+def collect_alert_metrics(groups: set[str]) -> dict[str, float]:
+    """
+    Gather the flat metric namespace rules are written against.
+
+    cpu.percent, cpu.temperature, memory.percent,
+    gpu.<index>.{temperature,utilization,memory_percent,power},
+    disk.<mountpoint>.percent, container.<name>.running,
+    service.<name>.{up,cpu_percent,memory_rss,restarts}
+
+    Containers and services are read from state other collectors already
+    keep (the last `docker stats` sample, the sampled service resources and
+    the supervisor), so a tick never waits on docker or a health probe.
+    """
+    import psutil
+
+    metrics: dict[str, float] = {}
+    if "cpu" in groups:
+        metrics["cpu.percent"] = psutil.cpu_percent(interval=None)
+        temperature = cpu_temperature(temperature_sensors.read())
+        if temperature is not None:
+            metrics["cpu.temperature"] = temperature
+    if "memory" in groups:
+        metrics["memory.percent"] = psutil.virtual_memory().percent
+    if "gpu" in groups:
+        for gpu in gpu_collector.sample():
+            for field, key in (
+                ("temperature", "temperature"),
+                ("utilization", "utilization"),
+                ("memory_percent", "memory_percent"),
+                ("power_draw", "power"),
+            ):
+                value = getattr(gpu, field)
+                if value is not None:
+                    metrics[f"gpu.{gpu.index}.{key}"] = value
+    if "disk" in groups:
+        for disk in sampler.latest("disk_usage") or []:
+            metrics[f"disk.{disk.mountpoint}.percent"] = disk.percent
+    if "container" in groups:
+        for name, running in container_stats.states().items():
+            metrics[f"container.{name}.running"] = float(running)
+    if "service" in groups:
+        resources = get_service_resources()
+        for name in registry.all():
+            supervised = supervisor.get(name)
+            prefix = f"service.{name}"
+            metrics[f"{prefix}.up"] = float(name in resources or (supervised is not None and supervised.alive))
+            metrics[f"{prefix}.restarts"] = supervised.restarts if supervised else 0
+            usage = resources.get(name)
+            if usage:
+                metrics[f"{prefix}.cpu_percent"] = usage.cpu_percent
+                metrics[f"{prefix}.memory_rss"] = usage.memory_rss
+    return metrics
+
+
+class AlertEngine:
+    """
+    Evaluates alerting rules incrementally on every sampler tick.
+
+    Rules are bound to concrete metric names once (and again only when the
+    set of metric names changes), so a tick is one pass over the bound
+    series doing a dict lookup and a few float comparisons each; hundreds
+    of rules evaluate in well under a millisecond on the event loop.
+
+    State transitions (pending is internal; firing and resolved are
+    published) go to connected WebSocket clients, the in-memory event
+    history, and the optional webhook and command hooks.
+
+    Args:
+        rules_file: Path to alerts.yaml, reloaded when it changes
+    """
+
+    def __init__(self, rules_file: Path = ALERTS_FILE):
+        self.rules_file = rules_file
+        self.rules: dict[str, AlertRule] = {}
+        self.groups: set[str] = set()
+        self.events: deque[AlertEvent] = deque(maxlen=EVENT_HISTORY)
+        self.last_evaluation_seconds = 0.0
+        self._mtime: Optional[float] = None
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._bound_keys: Optional[set[str]] = None
+        self._evaluated_at: Optional[float] = None
+        self._subscribers: set[asyncio.Queue] = set()
+        self._hook_tasks: set[asyncio.Task] = set()
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._lock = threading.Lock()
+
+    def _ensure_file(self) -> None:
+        """Write the default rules if no rules file exists yet."""
+        if self.rules_file.exists():
+            return
+        self.rules_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.rules_file, 'w') as f:
+            yaml.dump({"rules": DEFAULT_RULES}, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        logger.info(f"Created default alert rules at {self.rules_file}")
+
+    def reload(self) -> None:
+        """Reload alerts.yaml if it changed; a file that fails to parse keeps the old rules."""
+        try:
+            self._ensure_file()
+            mtime = self.rules_file.stat().st_mtime
+        except OSError as e:
+            logger.error(f"Cannot access alert rules: {e}")
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+
+        try:
+            with open(self.rules_file, 'r') as f:
+                entries = RulesFile(**(yaml.safe_load(f) or {})).rules
+        except (OSError, yaml.YAMLError, ValidationError, TypeError) as e:
+            logger.error(f"Failed to load alert rules {self.rules_file}: {e}")
+            return
+
+        rules = {}
+        for name, entry in entries.items():
+            try:
+                rules[name] = AlertRule(**{**(entry or {}), "name": name})
+            except (ValidationError, TypeError) as e:
+                logger.error(f"Invalid alert rule '{name}': {e}")
+        groups = set()
+        for rule in rules.values():
+            groups |= {rule.group} if rule.group else set(METRIC_GROUPS)
+        with self._lock:
+            self.rules = rules
+            self.groups = groups
+            self._bound_keys = None
+        logger.info(f"Loaded {len(rules)} alert rule(s)")
+
+    def collect(self) -> dict[str, float]:
+        """Sampler collector: pick up rule changes, then gather the metrics they need."""
+        self.reload()
+        return collect_alert_metrics(self.groups)
+
+    def _bind(self, metrics: dict[str, float], now: float) -> list[AlertEvent]:
+        """Match rules to metric names, keeping state of series that still exist."""
+        keys = list(metrics)
+        series = {}
+        for rule in self.rules.values():
+            if any(c in rule.metric for c in "*?["):
+                matches = fnmatch.filter(keys, rule.metric)
+            else:
+                matches = [rule.metric] if rule.metric in metrics else []
+            for metric in matches:
+                key = (rule.name, metric)
+                existing = self._series.get(key)
+                series[key] = existing if existing is not None and existing.rule is rule else _Series(rule, metric)
+
+        # A firing alert whose metric (or rule) went away resolves
+        events = [
+            self._event(old, AlertState.RESOLVED, now, value=None)
+            for key, old in self._series.items()
+            if old.firing and series.get(key) is not old
+        ]
+        self._series = series
+        self._bound_keys = set(keys)
+        return events
+
+    def evaluate(self, metrics: dict[str, float], now: float) -> list[AlertEvent]:
+        """Advance every series by one sample and return the resulting transitions."""
+        events = []
+        if self._bound_keys is None or metrics.keys() != self._bound_keys:
+            events = self._bind(metrics, now)
+
+        for s in self._series.values():
+            value = metrics[s.metric]
+            active = value > s.above or value < s.below
+            if s.uses_rate:
+                if s.last_time is not None and now > s.last_time:
+                    rate = (value - s.last_value) / (now - s.last_time)
+                    active = active or rate > s.rate_above or rate < s.rate_below
+                s.last_value = value
+                s.last_time = now
+            s.value = value
+
+            if active:
+                if s.since is None:
+                    s.since = now
+                if not s.firing and now - s.since >= s.for_seconds:
+                    s.firing = True
+                    events.append(self._event(s, AlertState.FIRING, now))
+            else:
+                s.since = None
+                if s.firing:
+                    s.firing = False
+                    events.append(self._event(s, AlertState.RESOLVED, now))
+        return events
+
+    @staticmethod
+    def _event(s: _Series, state: AlertState, now: float, value: Optional[float] = ...) -> AlertEvent:
+        return AlertEvent(
+            rule=s.rule.name,
+            metric=s.metric,
+            severity=s.rule.severity,
+            state=state,
+            value=s.value if value is ... else value,
+            timestamp=now,
+            description=s.rule.description,
+        )
+
+    def on_tick(self) -> None:
+        """Sampler listener: evaluate the newest metrics sample (on the event loop)."""
+        sampled_at = sampler.latest_timestamp("alert_metrics")
+        if sampled_at is None or sampled_at == self._evaluated_at:
+            return
+        self._evaluated_at = sampled_at
+        with self._lock:
+            started = time.perf_counter()
+            events = self.evaluate(sampler.latest("alert_metrics"), sampled_at)
+            self.last_evaluation_seconds = time.perf_counter() - started
+        telemetry.observe("collector", "alerts.evaluate", self.last_evaluation_seconds)
+        if events:
+            self._publish(events)
+
+    def _publish(self, events: list[AlertEvent]) -> None:
+        for event in events:
+            log = logger.warning if event.state == AlertState.FIRING else logger.info
+            log(f"Alert {event.rule} {event.state.value} for {event.metric} (value {event.value})")
+            self.events.append(event)
+            for queue in self._subscribers:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    pass  # A client this far behind only misses events
+        if ALERT_WEBHOOK_URL or ALERT_COMMAND:
+            task = asyncio.create_task(self._run_hooks(events))
+            self._hook_tasks.add(task)
+            task.add_done_callback(self._hook_tasks.discard)
+
+    async def _run_hooks(self, events: list[AlertEvent]) -> None:
+        payload = [event.model_dump(mode="json") for event in events]
+        if ALERT_WEBHOOK_URL:
+            import httpx
+            if self._client is None:
+                self._client = httpx.AsyncClient(timeout=ALERT_HOOK_TIMEOUT)
+            try:
+                response = await self._client.post(ALERT_WEBHOOK_URL, json=payload)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(f"Alert webhook {ALERT_WEBHOOK_URL} failed: {e!r}")
+        if ALERT_COMMAND:
+            for event in payload:
+                await subprocess_pool.run(run_alert_command, event)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue receiving every future transition; pass it to `unsubscribe()` when done."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def active(self) -> list[Alert]:
+        """Firing and pending alerts."""
+        with self._lock:
+            series = list(self._series.values())
+        return [
+            Alert(
+                rule=s.rule.name,
+                metric=s.metric,
+                severity=s.rule.severity,
+                state=AlertState.FIRING if s.firing else AlertState.PENDING,
+                value=s.value,
+                since=s.since,
+                description=s.rule.description,
+            )
+            for s in series
+            if s.since is not None
+        ]
+
+    async def aclose(self) -> None:
+        """Wait briefly for running hooks, then close the webhook client."""
+        if self._hook_tasks:
+            await asyncio.wait(self._hook_tasks, timeout=ALERT_HOOK_TIMEOUT)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def run_alert_command(event: dict) -> None:
+    """Run ALERT_COMMAND with one event as JSON on stdin and ALERT_* variables set."""
+    env = {
+        **os.environ,
+        "ALERT_RULE": event["rule"],
+        "ALERT_METRIC": event["metric"],
+        "ALERT_STATE": event["state"],
+        "ALERT_SEVERITY": event["severity"],
+        "ALERT_VALUE": "" if event["value"] is None else str(event["value"]),
+    }
+    try:
+        with telemetry.timer("subprocess", "alert command"):
+            result = subprocess.run(
+                ALERT_COMMAND,
+                shell=True,
+                input=json.dumps(event),
+                capture_output=True,
+                text=True,
+                env=env,
+                timeout=ALERT_HOOK_TIMEOUT,
+            )
+        if result.returncode != 0:
+            logger.error(f"Alert command exited with {result.returncode}: {result.stderr.strip()}")
+    except subprocess.TimeoutExpired:
+        logger.error("Alert command timed out")
+    except OSError as e:
+        logger.error(f"Alert command failed: {e}")
+
+
+alert_engine = AlertEngine()
+sampler.register("alert_metrics", alert_engine.collect)
+sampler.add_listener(alert_engine.on_tick)
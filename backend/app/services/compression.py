@@ -0,0 +1,27 @@
+"""Response compression that leaves proxied app responses alone."""
+from typing import Callable
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Paths whose responses are passed through uncompressed: proxied services
+# stream SSE/chunked bodies a compressor would buffer, and often compress
+# their own responses already
+UNCOMPRESSED_PREFIXES = ("/apps/",)
+
+
+class CompressionMiddleware:
+    """
+    Applies a compression middleware (Brotli or gzip) to every HTTP
+    response except those under UNCOMPRESSED_PREFIXES.
+    """
+
+    def __init__(self, app: ASGIApp, compressor: Callable[[ASGIApp], ASGIApp],
+                 exclude: tuple[str, ...] = UNCOMPRESSED_PREFIXES):
+        self.app = app
+        self.compressed = compressor(app)
+        self.exclude = exclude
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not scope["path"].startswith(self.exclude):
+            await self.compressed(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
@@ -0,0 +1,240 @@
+"""Rolling per-container resource history from `docker stats`."""
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import deque
+from typing import Any, Iterator, Optional
+from app.models import ContainerStatsSample, ContainerTop
+from app.services.executor import PoolTimeout, subprocess_pool
+from app.services.startup import startup
+
+logger = logging.getLogger(__name__)
+
+# Seconds between `docker stats` samples and samples kept per container
+# (the defaults keep an hour)
+DOCKER_STATS_INTERVAL = float(os.getenv("DOCKER_STATS_INTERVAL", "10"))
+DOCKER_STATS_HISTORY = int(os.getenv("DOCKER_STATS_HISTORY", "360"))
+
+# Ranking keys for /api/docker/top
+TOP_KEYS = ("cpu", "mem", "net", "io")
+
+SIZE_UNITS = {
+    "": 1, "k": 1000, "m": 1000 ** 2, "g": 1000 ** 3, "t": 1000 ** 4, "p": 1000 ** 5,
+    "ki": 1024, "mi": 1024 ** 2, "gi": 1024 ** 3, "ti": 1024 ** 4, "pi": 1024 ** 5,
+}
+SIZE_PATTERN = re.compile(r"^\s*([\d.]+)\s*([kmgtp]?i?)b\s*$", re.IGNORECASE)
+
+
+def parse_size(value: Any) -> Optional[int]:
+    """Bytes from a docker CLI size such as "1.23GB", "512kB" or "1.5GiB" (None if unknown)."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = SIZE_PATTERN.match(str(value or ""))
+    if not match:
+        return None
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).lower()])
+
+
+def _percent(value: Any) -> float:
+    try:
+        return float(str(value).rstrip("%"))
+    except ValueError:
+        return 0.0
+
+
+def _pair_total(value: Any) -> int:
+    """Sum of an "in / out" size pair such as NetIO "1.2kB / 648B"."""
+    return sum(parse_size(part) or 0 for part in str(value or "").split("/"))
+
+
+# One history entry: (timestamp, cpu %, memory bytes, memory %, network bytes, block I/O bytes);
+# network and block I/O are cumulative counters since the container started
+Entry = tuple[float, float, int, float, int, int]
+
+
+def parse_stats(output: str, now: float) -> dict[str, tuple[str, Entry]]:
+    """Parse `docker stats --format json` lines into (name, entry) by container id."""
+    stats = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse docker stats JSON: {e}")
+            continue
+        memory = str(data.get("MemUsage", "")).split("/")[0]
+        stats[data.get("ID", "")[:12]] = (data.get("Name", ""), (
+            now,
+            _percent(data.get("CPUPerc")),
+            parse_size(memory.strip()) or 0,
+            _percent(data.get("MemPerc")),
+            _pair_total(data.get("NetIO")),
+            _pair_total(data.get("BlockIO")),
+        ))
+    return stats
+
+
+def collect_stats() -> tuple[dict[str, tuple[str, Entry]], dict[str, str]]:
+    """Stats of running containers and the names of every existing container by id (blocking)."""
+    # Imported here: the route module depends on services, not the reverse
+    from app.routes.docker import run_docker_command
+
+    success, output = run_docker_command(["stats", "--no-stream", "--format", "json"])
+    if not success:
+        raise RuntimeError(f"docker stats failed: {output.strip()}")
+    stats = parse_stats(output, time.time())
+    success, output = run_docker_command(["ps", "-a", "--format", "{{.ID}}\t{{.Names}}"])
+    if not success:
+        raise RuntimeError(f"docker ps failed: {output.strip()}")
+    existing = {}
+    for line in output.splitlines():
+        container_id, _, name = line.strip().partition("\t")
+        if container_id:
+            existing[container_id[:12]] = name
+    return stats, existing
+
+
+def _rate(first: Entry, last: Entry, field: int) -> float:
+    elapsed = last[0] - first[0]
+    # Counters restart with the container; a drop means no usable delta
+    return max(0, last[field] - first[field]) / elapsed if elapsed > 0 else 0.0
+
+
+class ContainerStatsHistory:
+    """
+    Samples `docker stats` for every running container on an interval.
+
+    Each container keeps a bounded deque of compact tuples, so memory is
+    capped at `history_size` entries per container; a container's history
+    is dropped once it no longer exists (stopped containers keep theirs).
+    Ranking a window walks each deque from the newest end and stops at the
+    window start, so cost grows with the window, not the history size.
+
+    Args:
+        interval: Seconds between samples
+        history_size: Samples kept per container
+    """
+
+    def __init__(self, interval: float = DOCKER_STATS_INTERVAL, history_size: int = DOCKER_STATS_HISTORY):
+        self.interval = interval
+        self.history_size = history_size
+        self.names: dict[str, str] = {}
+        # Every existing container by id, and the ids running at the last sample
+        self.containers: dict[str, str] = {}
+        self.running: set[str] = set()
+        self._history: dict[str, deque[Entry]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, stats: dict[str, tuple[str, Entry]], existing: dict[str, str]) -> None:
+        """Append a sample per running container and drop removed containers."""
+        for container_id, (name, entry) in stats.items():
+            history = self._history.get(container_id)
+            if history is None:
+                history = self._history[container_id] = deque(maxlen=self.history_size)
+            history.append(entry)
+            self.names[container_id] = name
+        for container_id in [c for c in self._history if c not in existing]:
+            del self._history[container_id]
+            self.names.pop(container_id, None)
+        # Replaced, not mutated, so readers in other threads see one sample or the next
+        self.containers = dict(existing)
+        self.running = set(stats)
+
+    def states(self) -> dict[str, bool]:
+        """Whether each existing container (by name) was running at the last sample."""
+        running = self.running
+        return {name: container_id in running for container_id, name in self.containers.items()}
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            if startup.is_ready("docker"):
+                try:
+                    self.record(*await subprocess_pool.run(collect_stats))
+                except (RuntimeError, PoolTimeout) as e:
+                    logger.warning(f"Container stats sample failed: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """Start sampling in the background on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def resolve(self, container: str) -> Optional[str]:
+        """Container id for an id, id prefix or name with history."""
+        if container in self._history:
+            return container
+        for container_id, name in self.names.items():
+            if name == container or container_id.startswith(container):
+                return container_id
+        return None
+
+    @staticmethod
+    def _window(history: deque[Entry], cutoff: float) -> Iterator[Entry]:
+        """Entries at or after `cutoff`, newest first."""
+        for entry in reversed(history):
+            if entry[0] < cutoff:
+                return
+            yield entry
+
+    def history(self, container_id: str, seconds: Optional[float] = None) -> list[ContainerStatsSample]:
+        """Samples of one container, oldest first, with I/O as rates since the previous sample."""
+        entries = list(self._history.get(container_id, ()))
+        cutoff = time.time() - seconds if seconds is not None else float("-inf")
+        return [
+            ContainerStatsSample(
+                timestamp=entry[0],
+                cpu_percent=entry[1],
+                memory_bytes=entry[2],
+                memory_percent=entry[3],
+                net_bytes_per_sec=_rate(entries[i - 1], entry, 4) if i else 0.0,
+                io_bytes_per_sec=_rate(entries[i - 1], entry, 5) if i else 0.0,
+            )
+            for i, entry in enumerate(entries)
+            if entry[0] >= cutoff
+        ]
+
+    def top(self, by: str, seconds: float, limit: int) -> list[ContainerTop]:
+        """Containers ranked by mean CPU, latest memory, or network/block I/O rate over a window."""
+        cutoff = time.time() - seconds
+        ranked = []
+        for container_id, history in self._history.items():
+            window = list(self._window(history, cutoff))
+            if not window:
+                continue
+            newest, oldest = window[0], window[-1]
+            ranked.append(ContainerTop(
+                id=container_id,
+                name=self.names.get(container_id, ""),
+                cpu_percent=sum(entry[1] for entry in window) / len(window),
+                memory_bytes=newest[2],
+                memory_percent=newest[3],
+                memory_growth_bytes=newest[2] - oldest[2],
+                net_bytes_per_sec=_rate(oldest, newest, 4),
+                io_bytes_per_sec=_rate(oldest, newest, 5),
+                samples=len(window),
+            ))
+        key = {
+            "cpu": lambda t: t.cpu_percent,
+            "mem": lambda t: t.memory_bytes,
+            "net": lambda t: t.net_bytes_per_sec,
+            "io": lambda t: t.io_bytes_per_sec,
+        }[by]
+        ranked.sort(key=key, reverse=True)
+        return ranked[:limit]
+
+
+container_stats = ContainerStatsHistory()
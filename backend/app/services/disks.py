@@ -0,0 +1,172 @@
+"""Per-mount disk usage and per-device I/O metrics."""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional
+import psutil
+from app.models import DiskIO, DiskUsage
+
+logger = logging.getLogger(__name__)
+
+# Seconds between usage refreshes and how long a statvfs may take
+DISK_USAGE_TTL = float(os.getenv("DISK_USAGE_TTL", "30"))
+DISK_STATVFS_TIMEOUT = float(os.getenv("DISK_STATVFS_TIMEOUT", "2.0"))
+
+# Filesystems that never hold user data
+PSEUDO_FSTYPES = {
+    "autofs", "binfmt_misc", "cgroup", "cgroup2", "configfs", "debugfs",
+    "devpts", "devtmpfs", "efivarfs", "fusectl", "hugetlbfs", "mqueue",
+    "nsfs", "overlay", "proc", "pstore", "ramfs", "securityfs", "squashfs",
+    "sysfs", "tmpfs", "tracefs",
+}
+
+# Block devices not worth reporting I/O for
+IGNORED_DEVICE_PREFIXES = ("loop", "ram", "zram", "sr")
+
+
+def list_mounts() -> list:
+    """Real mounts, one per device (bind mounts collapsed)."""
+    mounts = []
+    seen_devices = set()
+    for part in psutil.disk_partitions(all=True):
+        if part.fstype in PSEUDO_FSTYPES or not part.fstype:
+            continue
+        if part.mountpoint.startswith(("/snap/", "/proc/", "/sys/")):
+            continue
+        if part.device in seen_devices and part.device.startswith("/dev/"):
+            continue
+        seen_devices.add(part.device)
+        mounts.append(part)
+    return mounts
+
+
+class MountUsageCache:
+    """
+    Caches disk usage for every real mount.
+
+    statvfs on a network mount whose server went away can block forever,
+    so calls run in a small pool and are waited on with a timeout. A mount
+    whose call hasn't returned is reported with its last known usage and
+    `responsive=False`, and no new call is issued for it until the hung one
+    completes.
+    """
+
+    def __init__(self, ttl: float = DISK_USAGE_TTL, timeout: float = DISK_STATVFS_TIMEOUT):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="statvfs")
+        self._pending: dict[str, Future] = {}
+        self._usage: dict[str, DiskUsage] = {}
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def _collect(self, future: Future, part) -> None:
+        try:
+            usage = future.result()
+        except OSError as e:
+            logger.warning(f"Failed to stat {part.mountpoint}: {e}")
+            self._usage.pop(part.mountpoint, None)
+            return
+        self._usage[part.mountpoint] = DiskUsage(
+            mountpoint=part.mountpoint,
+            device=part.device,
+            fstype=part.fstype,
+            total=usage.total,
+            used=usage.used,
+            free=usage.free,
+            percent=usage.percent,
+        )
+
+    def refresh(self, force: bool = False) -> list[DiskUsage]:
+        """Refresh usage if the TTL has expired and return all mounts."""
+        with self._lock:
+            if not force and time.monotonic() - self._last_refresh < self.ttl:
+                return list(self._usage.values())
+            self._last_refresh = time.monotonic()
+
+            mounts = {part.mountpoint: part for part in list_mounts()}
+            for mountpoint in set(self._usage) - set(mounts):
+                del self._usage[mountpoint]
+
+            for mountpoint in mounts:
+                if mountpoint not in self._pending:  # Otherwise the previous call is still hung
+                    self._pending[mountpoint] = self._executor.submit(psutil.disk_usage, mountpoint)
+            pending = dict(self._pending)
+
+        # Waited on without the lock, so callers don't queue behind a hung mount
+        wait(pending.values(), timeout=self.timeout)
+
+        with self._lock:
+            for mountpoint, future in pending.items():
+                part = mounts.get(mountpoint)
+                if future.done():
+                    if self._pending.get(mountpoint) is future:
+                        del self._pending[mountpoint]
+                    if part:
+                        self._collect(future, part)
+                elif part:
+                    logger.warning(f"Mount {mountpoint} not responding to statvfs")
+                    previous = self._usage.get(mountpoint)
+                    self._usage[mountpoint] = (
+                        previous.model_copy(update={"responsive": False}) if previous
+                        else DiskUsage(mountpoint=mountpoint, device=part.device,
+                                       fstype=part.fstype, responsive=False)
+                    )
+
+            return list(self._usage.values())
+
+    def get(self, mountpoint: str) -> Optional[DiskUsage]:
+        """Cached usage for one mount."""
+        return self._usage.get(mountpoint)
+
+
+class DiskIOSampler:
+    """Per-device throughput, IOPS and latency from disk_io_counters deltas."""
+
+    def __init__(self):
+        self._previous: Optional[tuple[float, dict]] = None
+
+    def sample(self) -> list[DiskIO]:
+        """Compute rates since the previous sample (empty on the first call)."""
+        now = time.monotonic()
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+        previous = self._previous
+        self._previous = (now, counters)
+        if previous is None:
+            return []
+
+        elapsed = now - previous[0]
+        if elapsed <= 0:
+            return []
+
+        results = []
+        for device, current in counters.items():
+            if device.startswith(IGNORED_DEVICE_PREFIXES):
+                continue
+            before = previous[1].get(device)
+            if before is None:
+                continue
+            reads = current.read_count - before.read_count
+            writes = current.write_count - before.write_count
+            io_time = (current.read_time - before.read_time) + (current.write_time - before.write_time)
+            busy = getattr(current, "busy_time", None)
+            busy_before = getattr(before, "busy_time", None)
+            results.append(DiskIO(
+                device=device,
+                read_bytes_per_sec=(current.read_bytes - before.read_bytes) / elapsed,
+                write_bytes_per_sec=(current.write_bytes - before.write_bytes) / elapsed,
+                read_iops=reads / elapsed,
+                write_iops=writes / elapsed,
+                await_ms=io_time / (reads + writes) if reads + writes > 0 else 0.0,
+                utilization=(
+                    min(100.0, (busy - busy_before) / (elapsed * 1000) * 100)
+                    if busy is not None and busy_before is not None else None
+                ),
+            ))
+        return results
+
+
+mount_usage = MountUsageCache()
+disk_io = DiskIOSampler()
@@ -0,0 +1,241 @@
+"""MessagePack/CBOR response encoding negotiated by the Accept header."""
+import array
+import logging
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Try to import the optional encoders; without them every client gets JSON
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import cbor2
+    CBOR_AVAILABLE = True
+except ImportError:
+    CBOR_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Media types clients may ask for, by encoding
+MEDIA_TYPES = {
+    "msgpack": "application/msgpack",
+    "cbor": "application/cbor",
+}
+ACCEPTED = {
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+    "application/cbor": "cbor",
+}
+
+# Numeric lists at least this long are sent as typed arrays
+TYPED_ARRAY_MIN = 4
+
+# Typed array element types, numbered after the RFC 8746 CBOR tags; the
+# same numbers are used as MessagePack extension types. Payloads are
+# little-endian so browsers can wrap them in a Float32Array etc. directly.
+UINT32_LE = 70
+SINT64_LE = 79
+FLOAT32_LE = 85
+FLOAT64_LE = 86
+TYPECODES = {UINT32_LE: "I", SINT64_LE: "q", FLOAT32_LE: "f", FLOAT64_LE: "d"}
+
+_CONTAINERS = (dict, list)
+
+# Encoded bodies kept per (ETag, encoding), so pollers of an unchanged
+# snapshot share one transcode
+PACKED_CACHE_SIZE = 64
+
+
+def available() -> dict[str, bool]:
+    return {"msgpack": MSGPACK_AVAILABLE, "cbor": CBOR_AVAILABLE}
+
+
+def negotiate(accept: str) -> Optional[str]:
+    """The binary encoding a client prefers over JSON, if it's installed."""
+    ranges = []
+    for index, part in enumerate(accept.split(",")):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        ranges.append((-q, index, media_type.lower()))
+    for q, _, media_type in sorted(ranges):
+        if q == 0:
+            break
+        encoding = ACCEPTED.get(media_type)
+        if encoding is not None and available()[encoding]:
+            return encoding
+        if media_type in ("application/json", "application/*", "*/*"):
+            return None
+    return None
+
+
+def _typed_array(values: list) -> Optional[tuple[int, array.array]]:
+    """Typed array element type and packed values for a list of numbers, or None if it isn't one."""
+    is_float = False
+    for value in values:
+        kind = type(value)
+        if kind is float:
+            is_float = True
+        elif kind is not int:
+            return None
+    if is_float:
+        # float32 only when it loses nothing, so binary clients see the same numbers as JSON ones
+        packed = array.array("f", values)
+        if packed.tolist() == values:
+            return FLOAT32_LE, packed
+        return FLOAT64_LE, array.array("d", values)
+    if min(values) >= 0 and max(values) < 2 ** 32:
+        return UINT32_LE, array.array("I", values)
+    try:
+        return SINT64_LE, array.array("q", values)
+    except OverflowError:
+        return None  # Beyond int64: left as a plain list
+
+
+def _to_bytes(packed: array.array) -> bytes:
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def with_typed_arrays(value: Any, wrap: Callable[[int, bytes], Any]) -> Any:
+    """Replace numeric lists in a JSON-like value with `wrap(element type, bytes)`."""
+    kind = type(value)
+    if kind is dict:
+        # Scalars are copied without a call; this walk is most of the encode cost
+        return {
+            key: with_typed_arrays(item, wrap) if type(item) in _CONTAINERS else item
+            for key, item in value.items()
+        }
+    if kind is list:
+        if len(value) >= TYPED_ARRAY_MIN:
+            typed = _typed_array(value)
+            if typed is not None:
+                return wrap(typed[0], _to_bytes(typed[1]))
+        return [with_typed_arrays(item, wrap) if type(item) in _CONTAINERS else item for item in value]
+    return value
+
+
+def encode(value: Any, encoding: str) -> bytes:
+    """Encode a JSON-like value as MessagePack or CBOR with typed arrays."""
+    if encoding == "msgpack":
+        return msgpack.packb(with_typed_arrays(value, msgpack.ExtType), use_bin_type=True)
+    return cbor2.dumps(with_typed_arrays(value, cbor2.CBORTag))
+
+
+def _tag_etag(etag: str, encoding: str) -> str:
+    """Distinct ETag per representation: "abc" becomes "abc-msgpack"."""
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else etag
+
+
+def _untag_if_none_match(value: str, encoding: str) -> str:
+    return value.replace(f'-{encoding}"', '"')
+
+
+class BinaryEncodingMiddleware:
+    """
+    ASGI middleware re-encoding JSON responses as MessagePack or CBOR.
+
+    Applies when the Accept header prefers application/msgpack or
+    application/cbor over JSON and the matching optional package is
+    installed. Numeric lists (per-core CPU, series) become typed arrays,
+    so constrained clients decode them without per-element parsing.
+    Streamed responses and non-JSON bodies pass through unchanged. Every
+    response carries `Vary: Accept`, JSON ones included. ETags
+    gain an encoding suffix, and bodies with an ETag are encoded once and
+    reused while the snapshot is unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, cache_size: int = PACKED_CACHE_SIZE):
+        self.app = app
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+
+    def _encode(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        key = (etag, encoding)
+        if etag is not None and key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        packed = encode(orjson.loads(body), encoding)
+        if etag is not None:
+            self._cache[key] = packed
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return packed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept", ""))
+        if encoding is None:
+            # JSON for this client, but the same URL can answer others in
+            # MessagePack/CBOR, so shared caches must key on Accept too
+            async def send_json(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(raw=message["headers"]).add_vary_header("Accept")
+                await send(message)
+
+            await self.app(scope, receive, send_json)
+            return
+
+        # Conditional requests carry the tagged ETag; handlers compare the plain one
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, _untag_if_none_match(value.decode("latin-1"), encoding).encode("latin-1"))
+            if name == b"if-none-match" else (name, value)
+            for name, value in scope["headers"]
+        ]
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_encoded(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                headers.add_vary_header("Accept")
+                if "etag" in headers:
+                    headers["etag"] = _tag_etag(headers["etag"], encoding)
+                start = message
+                passthrough = not headers.get("content-type", "").startswith("application/json")
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            if passthrough or message.get("more_body", False):
+                # Streaming or not JSON: send as is
+                passthrough = True
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if body:
+                try:
+                    body = self._encode(body, encoding, headers.get("etag"))
+                    headers["content-type"] = MEDIA_TYPES[encoding]
+                    headers["content-length"] = str(len(body))
+                except (orjson.JSONDecodeError, ValueError, TypeError) as e:
+                    logger.warning(f"Cannot encode response as {encoding}: {e}")
+            await send(start)
+            start = None
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_encoded)
@@ -0,0 +1,149 @@
+"""Bounded, named thread pools for blocking work."""
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+from app.models import PoolStats
+from app.services.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Worker threads per pool: docker/nmcli/lsof subprocesses, file I/O, psutil scans
+SUBPROCESS_WORKERS = int(os.getenv("SUBPROCESS_WORKERS", "8"))
+FILESYSTEM_WORKERS = int(os.getenv("FILESYSTEM_WORKERS", "4"))
+PSUTIL_WORKERS = int(os.getenv("PSUTIL_WORKERS", "4"))
+
+# Seconds a caller waits (queueing included) before giving up on a call
+EXECUTOR_TIMEOUT = float(os.getenv("EXECUTOR_TIMEOUT", "60"))
+
+
+class PoolTimeout(TimeoutError):
+    """A call did not finish within its pool's timeout."""
+
+    def __init__(self, pool: str, func: Callable, timeout: float):
+        self.pool = pool
+        name = getattr(func, "__qualname__", repr(func))
+        super().__init__(f"{name} did not finish within {timeout:g}s ({pool} pool)")
+
+
+class Pool:
+    """
+    A named thread pool with a fixed number of workers.
+
+    Calls beyond `max_workers` queue instead of starting more threads, so
+    a burst of slow docker calls can't starve file or psutil work in other
+    pools. Queue depth, time spent queued and time spent running are
+    tracked for /api/metrics and /api/debug/pools.
+
+    A call that exceeds the timeout raises PoolTimeout in the caller; the
+    worker thread keeps running until the call returns, so blocking calls
+    should still carry their own timeouts (e.g. subprocess `timeout=`).
+
+    Args:
+        name: Pool name used in thread names and metrics
+        max_workers: Maximum concurrently running calls
+        timeout: Default seconds to wait for a call, queueing included
+    """
+
+    def __init__(self, name: str, max_workers: int, timeout: float = EXECUTOR_TIMEOUT):
+        self.name = name
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.wait_time = Histogram()
+        self.run_time = Histogram()
+        self.active = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=f"{self.name}-pool"
+            )
+        return self._executor
+
+    def _call(self, func: Callable[..., T], args: tuple, submitted: float) -> T:
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        self.wait_time.observe(started - submitted)
+        failed = False
+        try:
+            return func(*args)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.run_time.observe(time.perf_counter() - started)
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.errors += failed
+
+    def _on_done(self, future: Future) -> None:
+        # A call cancelled before it started never left the queue
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any, timeout: Optional[float] = None) -> T:
+        """Run `func(*args)` on a worker and await its result."""
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        future = self.executor.submit(self._call, func, args, time.perf_counter())
+        future.add_done_callback(self._on_done)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # wait_for cancels the call if it never started; a running one can't be interrupted
+            with self._lock:
+                self.timeouts += 1
+            logger.warning(f"{self.name} pool: {getattr(func, '__qualname__', func)} timed out after {timeout:g}s")
+            raise PoolTimeout(self.name, func, timeout) from None
+
+    def stats(self) -> PoolStats:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return value * 1000 if value is not None else None
+
+        return PoolStats(
+            name=self.name,
+            max_workers=self.max_workers,
+            active=self.active,
+            queued=self.queued,
+            max_queued=self.max_queued,
+            completed=self.completed,
+            errors=self.errors,
+            timeouts=self.timeouts,
+            wait_p99_ms=ms(self.wait_time.quantile(0.99)),
+            run_p99_ms=ms(self.run_time.quantile(0.99)),
+        )
+
+    def shutdown(self) -> None:
+        """Stop accepting work; queued calls are dropped, running ones finish in the background."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+subprocess_pool = Pool("subprocess", SUBPROCESS_WORKERS)
+filesystem_pool = Pool("filesystem", FILESYSTEM_WORKERS)
+psutil_pool = Pool("psutil", PSUTIL_WORKERS)
+# Sampling profiles block a worker for their whole duration; one at a time,
+# away from the pools whose workload they measure
+profiler_pool = Pool("profiler", 1)
+
+pools = [subprocess_pool, filesystem_pool, psutil_pool, profiler_pool]
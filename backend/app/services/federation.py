@@ -0,0 +1,191 @@
+"""Federation: poll peer StonePieHome backends for merged multi-host views."""
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
+from urllib.parse import urlparse
+import orjson
+from app.models import PeerStatus
+
+# httpx is imported on first use; it adds ~0.1s to backend import time
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Peers as comma-separated `name=url` (or bare URLs, named by hostname)
+FEDERATION_PEERS = os.getenv("FEDERATION_PEERS", "")
+
+# How this backend labels its own data in merged views
+FEDERATION_HOST_NAME = os.getenv("FEDERATION_HOST_NAME", "") or socket.gethostname()
+
+# Seconds between polls of each peer, and the budget for one poll
+FEDERATION_INTERVAL = float(os.getenv("FEDERATION_INTERVAL", "2.0"))
+FEDERATION_TIMEOUT = float(os.getenv("FEDERATION_TIMEOUT", "1.5"))
+
+# Snapshot endpoints fetched from every peer
+PEER_ENDPOINTS = ("/api/system", "/api/services", "/api/docker/containers")
+
+
+def parse_peers(value: str) -> list[tuple[str, str]]:
+    """Parse FEDERATION_PEERS into (name, base URL) pairs."""
+    peers = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, url = entry.partition("=") if "=" in entry.split("://")[0] else ("", "", entry)
+        url = url.rstrip("/")
+        peers.append((name or urlparse(url).hostname or url, url))
+    return peers
+
+
+@dataclass
+class Peer:
+    """A peer backend and the latest snapshots polled from it."""
+    name: str
+    url: str
+    online: bool = False
+    last_seen: Optional[float] = None
+    latency: Optional[float] = None
+    error: Optional[str] = None
+    etags: dict[str, str] = field(default_factory=dict)
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+class Federation:
+    """
+    Polls peer backends and keeps their latest snapshots in memory.
+
+    Each peer has its own polling task, so a slow or unreachable host only
+    delays its own updates. Requests share one pooled keep-alive client
+    and send If-None-Match, so an unchanged snapshot costs the peer a 304.
+    Merged views are served from memory and never wait on a peer; a peer
+    whose last poll failed is reported offline and left out of them.
+
+    Args:
+        peers: (name, base URL) pairs
+        interval: Seconds between polls of each peer
+        timeout: Seconds allowed for one peer's whole poll
+        transport: httpx transport for the client (e.g. a local stand-in for peers)
+    """
+
+    def __init__(self, peers: list[tuple[str, str]], interval: float = FEDERATION_INTERVAL,
+                 timeout: float = FEDERATION_TIMEOUT, transport: Optional["httpx.AsyncBaseTransport"] = None):
+        self.peers = [Peer(name=name, url=url) for name, url in peers]
+        self.interval = interval
+        self.timeout = timeout
+        self.transport = transport
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.peers)
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=len(self.peers) * len(PEER_ENDPOINTS),
+                    max_keepalive_connections=len(self.peers) * len(PEER_ENDPOINTS),
+                ),
+            )
+        return self._client
+
+    async def _fetch(self, peer: Peer, path: str) -> None:
+        headers = {"If-None-Match": peer.etags[path]} if path in peer.etags and path in peer.data else {}
+        response = await self.client.get(f"{peer.url}{path}", headers=headers)
+        if response.status_code == 304:
+            return
+        response.raise_for_status()
+        peer.data[path] = orjson.loads(response.content)
+        if "etag" in response.headers:
+            peer.etags[path] = response.headers["etag"]
+
+    async def poll(self, peer: Peer) -> None:
+        """Refresh every snapshot from one peer within the timeout."""
+        import httpx
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(self._fetch(peer, path) for path in PEER_ENDPOINTS)),
+                self.timeout,
+            )
+        except (asyncio.TimeoutError, httpx.HTTPError, orjson.JSONDecodeError) as e:
+            if peer.online:
+                logger.warning(f"Peer {peer.name} ({peer.url}) is unreachable: {e!r}")
+            self._set_offline(peer, e)
+            return
+        if not peer.online:
+            logger.info(f"Peer {peer.name} ({peer.url}) is online")
+        peer.online = True
+        peer.error = None
+        peer.last_seen = time.time()
+        peer.latency = time.perf_counter() - started
+
+    @staticmethod
+    def _set_offline(peer: Peer, error: BaseException) -> None:
+        peer.online = False
+        peer.error = str(error) or type(error).__name__
+
+    async def _run(self, peer: Peer) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await self.poll(peer)
+            except Exception as e:
+                # e.g. a malformed peer URL or payload; keep polling so the
+                # peer recovers once fixed, logging each new error once
+                previous = peer.error
+                self._set_offline(peer, e)
+                if peer.error != previous:
+                    logger.exception(f"Polling peer {peer.name} ({peer.url}) failed: {e!r}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """Start polling every peer in the background."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run(peer)) for peer in self.peers]
+
+    async def stop(self) -> None:
+        """Stop polling and close pooled connections."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def snapshots(self, path: str) -> list[tuple[str, Any]]:
+        """(peer name, latest data) for one endpoint from every online peer."""
+        return [
+            (peer.name, peer.data[path])
+            for peer in self.peers
+            if peer.online and path in peer.data
+        ]
+
+    def status(self) -> list[PeerStatus]:
+        return [
+            PeerStatus(
+                name=peer.name,
+                url=peer.url,
+                online=peer.online,
+                last_seen=peer.last_seen,
+                latency_ms=peer.latency * 1000 if peer.latency is not None else None,
+                error=peer.error,
+            )
+            for peer in self.peers
+        ]
+
+
+federation = Federation(parse_peers(FEDERATION_PEERS))
@@ -0,0 +1,279 @@
+"""Reverse proxy from /apps/{name}/ to managed services."""
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Optional
+from fastapi import Request, WebSocket
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.websockets import WebSocketDisconnect
+from app.models import LatencyBucket, ProxyLatency
+from app.services.histogram import Histogram
+from app.services.registry import ServiceConfig
+
+# httpx is imported on first use; it adds ~0.1s to backend import time
+if TYPE_CHECKING:
+    import httpx
+
+# Try to import websockets for WebSocket passthrough (ships with uvicorn[standard])
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# httpx logs every request at INFO, which would log each proxied request twice
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Services are reached on the loopback interface
+UPSTREAM_HOST = "127.0.0.1"
+
+# Upstream timeouts (seconds) and connection pool size
+GATEWAY_TIMEOUT = float(os.getenv("GATEWAY_TIMEOUT", "60"))
+GATEWAY_CONNECT_TIMEOUT = 5.0
+GATEWAY_MAX_CONNECTIONS = int(os.getenv("GATEWAY_MAX_CONNECTIONS", "100"))
+GATEWAY_MAX_KEEPALIVE = 20
+
+# Headers that describe a single connection and must not be forwarded
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+}
+
+# Request headers forwarded on the upstream WebSocket handshake
+WEBSOCKET_FORWARD_HEADERS = ("cookie", "authorization", "origin", "user-agent")
+
+
+def upstream_port(config: ServiceConfig, path: str, websocket: bool = False) -> Optional[int]:
+    """
+    Pick the port a proxied path goes to.
+
+    `api/...` goes to the backend port and everything else to the frontend
+    port; WebSockets prefer a dedicated websocket port. Whichever port is
+    missing falls back to the other.
+    """
+    if websocket and config.websocket_port:
+        return config.websocket_port
+    if path == "api" or path.startswith("api/"):
+        return config.backend_port or config.frontend_port
+    return config.frontend_port or config.backend_port or config.websocket_port
+
+
+def _filter_headers(raw: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    """Drop hop-by-hop headers, including any named in Connection."""
+    connection_tokens = set()
+    for key, value in raw:
+        if key.lower() == b"connection":
+            connection_tokens.update(token.strip().lower() for token in value.decode("latin-1").split(","))
+    return [
+        (key, value) for key, value in raw
+        if key.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS | connection_tokens
+    ]
+
+
+class Gateway:
+    """
+    Forwards HTTP and WebSocket traffic under /apps/{name}/ to a service.
+
+    HTTP requests share one pooled keep-alive httpx client; request and
+    response bodies are streamed rather than buffered. Time to upstream
+    response headers is recorded in a histogram per service.
+    """
+
+    def __init__(self):
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._latency: dict[str, Histogram] = {}
+        self._errors: dict[str, int] = {}
+        self._websockets: dict[str, int] = {}
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(GATEWAY_TIMEOUT, connect=GATEWAY_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=GATEWAY_MAX_CONNECTIONS,
+                    max_keepalive_connections=GATEWAY_MAX_KEEPALIVE,
+                ),
+                follow_redirects=False,
+            )
+        return self._client
+
+    def _histogram(self, name: str) -> Histogram:
+        if name not in self._latency:
+            self._latency[name] = Histogram()
+        return self._latency[name]
+
+    def _forwarded_headers(self, request: Request, prefix: str) -> list[tuple[bytes, bytes]]:
+        headers = _filter_headers(list(request.headers.raw))
+        client_host = request.client.host if request.client else ""
+        forwarded_for = request.headers.get("x-forwarded-for")
+        headers = [
+            (key, value) for key, value in headers
+            if key.lower() not in (b"x-forwarded-for", b"x-forwarded-proto", b"x-forwarded-host", b"x-forwarded-prefix")
+        ]
+        headers += [
+            (b"x-forwarded-for", f"{forwarded_for}, {client_host}".encode() if forwarded_for else client_host.encode()),
+            (b"x-forwarded-proto", request.url.scheme.encode()),
+            (b"x-forwarded-host", request.headers.get("host", "").encode()),
+            (b"x-forwarded-prefix", prefix.encode()),
+        ]
+        return headers
+
+    async def forward(self, request: Request, name: str, port: int, path: str) -> Response:
+        """Proxy one HTTP request and stream the upstream response back."""
+        import httpx
+
+        prefix = f"/apps/{name}"
+        url = httpx.URL(scheme="http", host=UPSTREAM_HOST, port=port, path=f"/{path}")
+        if request.url.query:
+            url = url.copy_with(query=request.url.query.encode("latin-1"))
+        has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+        upstream_request = self.client.build_request(
+            request.method,
+            url,
+            headers=self._forwarded_headers(request, prefix),
+            content=request.stream() if has_body else None,
+        )
+
+        started = time.perf_counter()
+        try:
+            upstream = await self.client.send(upstream_request, stream=True)
+        except httpx.RequestError as e:
+            self._errors[name] = self._errors.get(name, 0) + 1
+            logger.warning(f"Proxy to {name} ({url}) failed: {e}")
+            return PlainTextResponse(f"Bad gateway: {name} is not reachable", status_code=502)
+        self._histogram(name).observe(time.perf_counter() - started)
+
+        upstream_origin = f"http://{UPSTREAM_HOST}:{port}"
+        headers = []
+        for key, value in _filter_headers(upstream.headers.raw):
+            if key.lower() == b"location":
+                location = value.decode("latin-1")
+                for origin in (upstream_origin, f"http://localhost:{port}"):
+                    if location.startswith(origin):
+                        location = prefix + location[len(origin):]
+                value = location.encode("latin-1")
+            headers.append((key, value))
+
+        response = StreamingResponse(
+            upstream.aiter_raw(),
+            status_code=upstream.status_code,
+            background=BackgroundTask(upstream.aclose),
+        )
+        response.raw_headers = headers
+        return response
+
+    async def forward_websocket(self, websocket: WebSocket, name: str, port: int, path: str) -> None:
+        """Accept a client WebSocket and relay frames to and from the service."""
+        if not WEBSOCKETS_AVAILABLE:
+            await websocket.close(code=1011)
+            return
+
+        query = websocket.url.query
+        url = f"ws://{UPSTREAM_HOST}:{port}/{path}" + (f"?{query}" if query else "")
+        extra_headers = [
+            (key, websocket.headers[key]) for key in WEBSOCKET_FORWARD_HEADERS
+            if key in websocket.headers
+        ]
+        try:
+            upstream = await websockets.connect(
+                url,
+                subprotocols=websocket.scope.get("subprotocols") or None,
+                extra_headers=extra_headers,
+                max_size=None,
+                open_timeout=GATEWAY_CONNECT_TIMEOUT,
+            )
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.InvalidHandshake) as e:
+            self._errors[name] = self._errors.get(name, 0) + 1
+            logger.warning(f"WebSocket proxy to {name} ({url}) failed: {e}")
+            await websocket.close(code=1011)
+            return
+
+        await websocket.accept(subprotocol=upstream.subprotocol)
+        self._websockets[name] = self._websockets.get(name, 0) + 1
+
+        async def client_to_upstream() -> None:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                if message.get("text") is not None:
+                    await upstream.send(message["text"])
+                elif message.get("bytes") is not None:
+                    await upstream.send(message["bytes"])
+
+        async def upstream_to_client() -> None:
+            async for message in upstream:
+                if isinstance(message, str):
+                    await websocket.send_text(message)
+                else:
+                    await websocket.send_bytes(message)
+
+        tasks = [asyncio.create_task(client_to_upstream()), asyncio.create_task(upstream_to_client())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await upstream.close()
+            try:
+                await websocket.close()
+            except (RuntimeError, WebSocketDisconnect):
+                pass
+
+    @property
+    def histograms(self) -> dict[str, Histogram]:
+        """Per-service latency histograms (do not mutate)."""
+        return self._latency
+
+    @property
+    def error_counts(self) -> dict[str, int]:
+        """Per-service failed upstream connection counts."""
+        return self._errors
+
+    def latency(self, name: str) -> ProxyLatency:
+        """Proxy latency statistics for one service."""
+        histogram = self._latency.get(name)
+        stats = ProxyLatency(
+            service=name,
+            errors=self._errors.get(name, 0),
+            websockets=self._websockets.get(name, 0),
+        )
+        if histogram is None or histogram.count == 0:
+            return stats
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return value * 1000 if value is not None else None
+
+        stats.requests = histogram.count
+        stats.mean_ms = histogram.sum / histogram.count * 1000
+        stats.p50_ms = ms(histogram.quantile(0.5))
+        stats.p90_ms = ms(histogram.quantile(0.9))
+        stats.p99_ms = ms(histogram.quantile(0.99))
+        stats.buckets = [
+            LatencyBucket(le=bound if bound != float("inf") else None, count=count)
+            for bound, count in histogram.cumulative()
+        ]
+        return stats
+
+    async def aclose(self) -> None:
+        """Close pooled upstream connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+gateway = Gateway()
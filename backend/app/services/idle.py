@@ -0,0 +1,240 @@
+"""Idle scale-to-zero for managed services with on-demand wake."""
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+import psutil
+from app.models import ServiceStatus
+from app.services.executor import subprocess_pool
+from app.services.journal import journal
+from app.services.orchestrator import wait_until_ready
+from app.services.process import (
+    get_service_status,
+    hold_ports,
+    is_sleeping,
+    release_ports,
+    start_service,
+    stop_service,
+)
+from app.services.registry import ServiceConfig, registry
+from app.services.sampler import sampler
+
+logger = logging.getLogger(__name__)
+
+# Seconds between idle checks
+IDLE_CHECK_INTERVAL = float(os.getenv("IDLE_CHECK_INTERVAL", "15"))
+
+# Buffer size for proxying the connection that woke a service
+PROXY_CHUNK_SIZE = 64 * 1024
+
+# Seconds to keep retrying the upstream connection after a wake; the bind
+# check used for readiness can pass early while held connections linger
+UPSTREAM_CONNECT_TIMEOUT = 10.0
+
+
+def count_connections(services: dict[str, ServiceConfig]) -> dict[str, int]:
+    """Established inbound connections per service, from one connection table read."""
+    port_owner = {
+        port: name
+        for name, config in services.items() if config.idle_timeout
+        for port in config.ports
+    }
+    counts = dict.fromkeys({name for name in port_owner.values()}, 0)
+    if not port_owner:
+        return counts
+    try:
+        connections = psutil.net_connections(kind='tcp')
+    except (psutil.AccessDenied, OSError) as e:
+        logger.warning(f"Cannot read connection table: {e}")
+        return counts
+    for conn in connections:
+        if conn.status == psutil.CONN_ESTABLISHED and conn.laddr and conn.laddr.port in port_owner:
+            counts[port_owner[conn.laddr.port]] += 1
+    return counts
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Copy bytes from reader to writer until EOF."""
+    try:
+        while True:
+            data = await reader.read(PROXY_CHUNK_SIZE)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+class WakeListener:
+    """
+    Holds a sleeping service's ports and wakes it on the first connection.
+
+    The first connection releases the ports, starts the service, waits for
+    readiness and is then proxied to the real service; connections arriving
+    while the service wakes wait for the same wake-up.
+    """
+
+    def __init__(self, manager: "IdleManager", config: ServiceConfig):
+        self.manager = manager
+        self.config = config
+        self._servers: list[asyncio.AbstractServer] = []
+
+    async def open(self) -> None:
+        for port in self.config.ports:
+            try:
+                server = await asyncio.start_server(
+                    lambda r, w, port=port: self._handle(r, w, port), host="0.0.0.0", port=port
+                )
+            except OSError as e:
+                logger.warning(f"Cannot hold port {port} for {self.config.name}: {e}")
+                continue
+            self._servers.append(server)
+
+    @property
+    def bound(self) -> bool:
+        """Whether at least one of the service's ports is held."""
+        return bool(self._servers)
+
+    def close(self) -> None:
+        for server in self._servers:
+            server.close()
+        self._servers = []
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, port: int) -> None:
+        ready = await self.manager.wake(self.config.name)
+        if not ready:
+            writer.close()
+            return
+        deadline = time.monotonic() + UPSTREAM_CONNECT_TIMEOUT
+        while True:
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", port)
+                break
+            except OSError as e:
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Woke {self.config.name} but port {port} refused: {e}")
+                    writer.close()
+                    return
+                await asyncio.sleep(0.2)
+        await asyncio.gather(_pipe(reader, upstream_writer), _pipe(upstream_reader, writer))
+
+
+class IdleManager:
+    """
+    Stops services with an `idle_timeout` once they've had no established
+    connections on their ports for that long, then holds their ports with a
+    WakeListener so the next request starts them again. Connection counts
+    come from the background sampler.
+    """
+
+    def __init__(self):
+        self._last_active: dict[str, float] = {}
+        self._waking: dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def wake(self, name: str) -> bool:
+        """
+        Start a sleeping (or stopped) service and wait until it's ready.
+
+        Concurrent callers share one start-up.
+        """
+        task = self._waking.get(name)
+        if task is None:
+            task = asyncio.create_task(self._wake(name))
+            self._waking[name] = task
+            task.add_done_callback(lambda _: self._waking.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def _wake(self, name: str) -> bool:
+        config = registry.get(name)
+        if config is None:
+            return False
+        logger.info(f"Waking {name}")
+        started = time.monotonic()
+        with journal.action("service", name, "wake", source="idle") as entry:
+            success, message = await start_service(name)
+            if not success:
+                logger.error(f"Failed to wake {name}: {message}")
+                entry.done(False, message)
+                return False
+            ready = await wait_until_ready(config)
+            entry.done(ready, None if ready else "Not ready before timeout")
+        self._last_active[name] = time.time()
+        logger.info(f"{name} woke in {time.monotonic() - started:.1f}s (ready={ready})")
+        return ready
+
+    async def _put_to_sleep(self, config: ServiceConfig) -> None:
+        logger.info(f"{config.name} idle for {config.idle_timeout:.0f}s, stopping")
+        with journal.action("service", config.name, "sleep", source="idle") as entry:
+            success, message = await stop_service(config.name)
+            entry.done(success, message)
+        if not success:
+            # Still running: leave it awake and keep checking it
+            logger.warning(f"Failed to stop idle {config.name}: {message}")
+            return
+        if config.wake_on_request:
+            listener = WakeListener(self, config)
+            await listener.open()
+            if listener.bound:
+                hold_ports(config.name, listener.close)
+            else:
+                logger.warning(f"No port of {config.name} could be held; it won't wake on request")
+
+    async def check(self) -> None:
+        """Stop any service that has been idle longer than its timeout."""
+        now = time.time()
+        # Every sample since the last check, so connections that came and
+        # went between checks still count as activity
+        active = {
+            name
+            for _, counts in sampler.history("service_connections", IDLE_CHECK_INTERVAL)
+            for name, count in counts.items() if count > 0
+        }
+        for name, config in registry.all().items():
+            if not config.idle_timeout or is_sleeping(name) or name in self._waking:
+                continue
+            status, _, _ = await subprocess_pool.run(get_service_status, config)
+            if status != ServiceStatus.RUNNING:
+                self._last_active.pop(name, None)
+                continue
+            if name in active or name not in self._last_active:
+                self._last_active[name] = now
+                continue
+            if now - self._last_active[name] >= config.idle_timeout:
+                del self._last_active[name]
+                await self._put_to_sleep(config)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(IDLE_CHECK_INTERVAL)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Idle check failed: {e}")
+
+    def start(self) -> None:
+        """Start idle checks on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop idle checks and release any held ports."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for name in registry.all():
+            release_ports(name)
+
+
+# Connection activity on ports of services with an idle timeout
+sampler.register("service_connections", lambda: count_connections(registry.all()))
+
+idle_manager = IdleManager()
@@ -0,0 +1,93 @@
+"""Background jobs for long-running actions."""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from app.models import Job, JobState
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for /api/jobs
+JOB_HISTORY = 50
+
+
+class JobConflict(Exception):
+    """A job of the same kind with different parameters is already running."""
+
+    def __init__(self, job: Job):
+        self.job = job
+        super().__init__(f"A {job.kind} job with different parameters is already running ({job.id})")
+
+
+class JobManager:
+    """
+    Runs long actions (e.g. docker prune) as tasks on the event loop.
+
+    The request that starts a job returns its id right away; clients poll
+    /api/jobs/{id} for the outcome. Submitting a kind that is already
+    running with the same parameters returns the running job instead of
+    starting a second one; different parameters raise JobConflict rather
+    than being silently dropped.
+
+    Args:
+        history: Finished jobs kept before the oldest are dropped
+    """
+
+    def __init__(self, history: int = JOB_HISTORY):
+        self.history = history
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def submit(self, kind: str, action: Callable[[], Awaitable[dict[str, Any]]],
+               params: Optional[dict[str, Any]] = None) -> Job:
+        """Start `action` as a job of `kind`; its return value becomes the job's result."""
+        for job in self._jobs.values():
+            if job.kind == kind and job.state in (JobState.PENDING, JobState.RUNNING):
+                if job.params != params:
+                    raise JobConflict(job)
+                return job
+
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind, params=params, created=time.time())
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(job, action))
+        self._prune()
+        return job
+
+    async def _run(self, job: Job, action: Callable[[], Awaitable[dict[str, Any]]]) -> None:
+        job.state = JobState.RUNNING
+        job.started = time.time()
+        try:
+            job.result = await action()
+            job.state = JobState.SUCCEEDED
+        except Exception as e:
+            logger.error(f"Job {job.kind} ({job.id}) failed: {e}")
+            job.error = str(e) or type(e).__name__
+            job.state = JobState.FAILED
+        finally:
+            job.finished = time.time()
+            self._tasks.pop(job.id, None)
+        logger.info(f"Job {job.kind} ({job.id}) {job.state.value} in {job.finished - job.started:.1f}s")
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished is not None]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        """All tracked jobs, newest first."""
+        return list(reversed(self._jobs.values()))
+
+    async def stop(self) -> None:
+        """Cancel jobs still running."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+job_manager = JobManager()
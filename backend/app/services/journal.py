@@ -0,0 +1,243 @@
+"""Append-only SQLite journal of service, container and system actions."""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from app.models import JournalEvent
+from app.services.executor import PoolTimeout, filesystem_pool
+
+logger = logging.getLogger(__name__)
+
+# Data directory for the journal database
+DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
+JOURNAL_FILE = DATA_DIR / "journal.db"
+
+# Buffered events are written in one transaction every interval, or as
+# soon as this many are waiting
+JOURNAL_FLUSH_INTERVAL = float(os.getenv("JOURNAL_FLUSH_INTERVAL", "1.0"))
+JOURNAL_BATCH_SIZE = 500
+
+# Events held in memory while the database is unwritable; the oldest are dropped beyond this
+JOURNAL_MAX_PENDING = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL,
+    action TEXT NOT NULL,
+    source TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    duration_ms REAL,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS events_by_time ON events (timestamp);
+CREATE INDEX IF NOT EXISTS events_by_target ON events (target, timestamp);
+CREATE TRIGGER IF NOT EXISTS events_no_update BEFORE UPDATE ON events
+    BEGIN SELECT RAISE(ABORT, 'journal is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS events_no_delete BEFORE DELETE ON events
+    BEGIN SELECT RAISE(ABORT, 'journal is append-only'); END;
+"""
+
+COLUMNS = "id, timestamp, kind, target, action, source, success, duration_ms, message"
+
+# Row awaiting insert: (timestamp, kind, target, action, source, success, duration_ms, message)
+Row = tuple[float, str, str, str, str, int, Optional[float], Optional[str]]
+
+
+class JournalAction:
+    """Times one action and records its outcome when the `with` block exits."""
+    __slots__ = ("journal", "kind", "target", "action", "source", "success", "message", "started")
+
+    def __init__(self, journal: "Journal", kind: str, target: str, action: str, source: str):
+        self.journal = journal
+        self.kind = kind
+        self.target = target
+        self.action = action
+        self.source = source
+        self.success = True
+        self.message: Optional[str] = None
+        self.started = 0.0
+
+    def done(self, success: bool, message: Optional[str] = None) -> None:
+        """Set the outcome (the default is success with no message)."""
+        self.success = success
+        self.message = message
+
+    def __enter__(self) -> "JournalAction":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.success = False
+            self.message = str(getattr(exc, "detail", None) or exc).strip() or exc_type.__name__
+        self.journal.record(
+            self.kind, self.target, self.action, self.success,
+            duration=time.perf_counter() - self.started,
+            message=self.message,
+            source=self.source,
+        )
+
+
+class Journal:
+    """
+    Durable record of every action, its duration and its outcome.
+
+    `record()` only appends to an in-memory buffer, so callers on the event
+    loop never touch the disk. A background task writes the buffer in one
+    transaction per flush into SQLite in WAL mode. Triggers reject
+    UPDATE and DELETE, so the journal is append-only. Time-range and
+    per-target queries are index range scans returning newest first, so
+    they stay fast however many years of events accumulate.
+
+    Args:
+        path: SQLite database file
+        flush_interval: Seconds between batched writes
+    """
+
+    def __init__(self, path: Path = JOURNAL_FILE, flush_interval: float = JOURNAL_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._buffer: list[Row] = []
+        self._buffer_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            # WAL with NORMAL sync survives process crashes; a power loss may drop the last batch
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    def record(self, kind: str, target: str, action: str, success: bool, duration: Optional[float] = None,
+               message: Optional[str] = None, source: str = "api") -> None:
+        """Queue an event for the next batched write (thread-safe, never blocks on I/O)."""
+        row = (
+            time.time(), kind, target, action, source, int(success),
+            duration * 1000 if duration is not None else None, message,
+        )
+        with self._buffer_lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= JOURNAL_BATCH_SIZE
+        if full and self._wakeup is not None:
+            try:
+                asyncio.get_running_loop()
+                self._wakeup.set()
+            except RuntimeError:
+                pass  # Recorded from a worker thread; the next timed flush picks it up
+
+    def action(self, kind: str, target: str, action: str, source: str = "api") -> JournalAction:
+        """Context manager recording an action's duration and outcome."""
+        return JournalAction(self, kind, target, action, source)
+
+    def flush(self) -> int:
+        """Write buffered events in one transaction (blocking). Returns the number written."""
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return 0
+        try:
+            with self._db_lock:
+                db = self._connect()
+                db.execute("BEGIN")
+                try:
+                    db.executemany(
+                        "INSERT INTO events (timestamp, kind, target, action, source, success, duration_ms, message)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    db.execute("COMMIT")
+                except sqlite3.Error:
+                    db.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write {len(rows)} journal event(s): {e}")
+            with self._buffer_lock:
+                # Retry with the next flush
+                self._buffer[:0] = rows
+                del self._buffer[:max(0, len(self._buffer) - JOURNAL_MAX_PENDING)]
+            return 0
+        self.written += len(rows)
+        return len(rows)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None, kind: Optional[str] = None,
+              target: Optional[str] = None, action: Optional[str] = None, success: Optional[bool] = None,
+              limit: int = 100) -> list[JournalEvent]:
+        """Events matching the filters, newest first (blocking; flushes pending events first)."""
+        self.flush()
+        clauses, params = [], []
+        for clause, value in (
+            ("kind = ?", kind),
+            ("target = ?", target),
+            ("action = ?", action),
+            ("success = ?", None if success is None else int(success)),
+            ("timestamp >= ?", start),
+            ("timestamp < ?", end),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {COLUMNS} FROM events {where} ORDER BY timestamp DESC, id DESC LIMIT ?"
+        with self._db_lock:
+            rows = self._connect().execute(sql, (*params, limit)).fetchall()
+        return [
+            JournalEvent(
+                id=row[0], timestamp=row[1], kind=row[2], target=row[3], action=row[4],
+                source=row[5], success=bool(row[6]), duration_ms=row[7], message=row[8],
+            )
+            for row in rows
+        ]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await filesystem_pool.run(self.flush)
+            except PoolTimeout as e:
+                logger.error(f"Journal flush failed: {e}")
+
+    def start(self) -> None:
+        """Start batched writing in the background on the running event loop."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the writer, flush what's left and close the database."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await filesystem_pool.run(self._close)
+
+    def _close(self) -> None:
+        self.flush()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+journal = Journal()
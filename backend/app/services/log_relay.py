@@ -0,0 +1,72 @@
+"""
+Size-capped rotating log files for captured service output.
+
+Also runnable on its own (standard library only), to keep writing a
+service's log after the backend has exited:
+
+    python log_relay.py <log path> <max bytes> <backup count> < pipe
+"""
+import logging
+import logging.handlers
+import os
+import sys
+from pathlib import Path
+
+# Bytes read from a service's output pipe at a time; a partial line (e.g. a
+# \r progress bar) longer than this is written out without waiting for \n
+CHUNK_SIZE = 65536
+
+
+def open_log(path: Path, max_bytes: int, backups: int) -> logging.Handler:
+    """Rotating log file handler writing each record as-is."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8",
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def split_lines(partial: bytes, chunk: bytes) -> tuple[list[bytes], bytes]:
+    """Complete lines in partial + chunk, and the unterminated remainder."""
+    *lines, partial = (partial + chunk).split(b"\n")
+    if len(partial) >= CHUNK_SIZE:
+        lines.append(partial)
+        partial = b""
+    return lines, partial
+
+
+def write_lines(handler: logging.Handler, lines: list[bytes]) -> None:
+    """Append output lines to a log (blocking; may rotate the file)."""
+    for line in lines:
+        handler.handle(logging.makeLogRecord({
+            "msg": line.decode("utf-8", errors="replace").rstrip("\r"),
+        }))
+
+
+def relay(fd: int, handler: logging.Handler) -> None:
+    """Copy output from a pipe into a log until EOF (blocking)."""
+    partial = b""
+    while True:
+        # os.read returns whatever is available, so lines aren't held back
+        # waiting for a full chunk
+        chunk = os.read(fd, CHUNK_SIZE)
+        if not chunk:
+            break
+        lines, partial = split_lines(partial, chunk)
+        write_lines(handler, lines)
+    if partial:
+        write_lines(handler, [partial])
+
+
+def main(argv: list[str]) -> None:
+    path, max_bytes, backups = argv
+    handler = open_log(Path(path), int(max_bytes), int(backups))
+    try:
+        relay(sys.stdin.fileno(), handler)
+    finally:
+        handler.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
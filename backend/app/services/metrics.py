@@ -1,67 +1,260 @@
+import logging
+import threading
 import psutil
-from typing import Optional
-from app.models import SystemMetrics
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from app.models import GpuMetrics, GpuProcess, MigInstance, SystemMetrics
+from app.services.disks import disk_io, mount_usage
+from app.services.pressure import pressure_sampler
+from app.services.sampler import sampler
+from app.services.sensors import cpu_temperature, temperature_sensors
+from app.services.startup import startup
+from app.services.telemetry import telemetry
+
+logger = logging.getLogger(__name__)
 
 # Try to import pynvml for NVIDIA GPU support
 try:
     import pynvml
-    pynvml.nvmlInit()
-    NVIDIA_AVAILABLE = True
-except Exception:
-    NVIDIA_AVAILABLE = False
-
-
-def get_cpu_temperature() -> Optional[float]:
-    """Get CPU temperature if available."""
-    try:
-        temps = psutil.sensors_temperatures()
-        if temps:
-            # Try common sensor names
-            for name in ['coretemp', 'cpu_thermal', 'k10temp', 'zenpower']:
-                if name in temps:
-                    # Return average of all cores
-                    core_temps = [t.current for t in temps[name]]
-                    if core_temps:
-                        return sum(core_temps) / len(core_temps)
-            # Fallback: try first available sensor
-            for sensor_list in temps.values():
-                if sensor_list:
-                    return sensor_list[0].current
-    except Exception:
-        pass
-    return None
+except ImportError:
+    pynvml = None
 
 
-def get_gpu_metrics() -> dict:
-    """Get NVIDIA GPU metrics if available."""
-    if not NVIDIA_AVAILABLE:
-        return {}
+def _decode(value: Any) -> Any:
+    """Decode NVML byte strings (older pynvml releases return bytes)."""
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+@dataclass
+class MigDevice:
+    """A MIG instance handle and its static info."""
+    index: int
+    handle: Any
+    uuid: Optional[str] = None
+    name: Optional[str] = None
+
+
+@dataclass
+class GpuDevice:
+    """A GPU handle and its static info, resolved once at init."""
+    index: int
+    handle: Any
+    name: str
+    uuid: Optional[str] = None
+    memory_total: Optional[int] = None
+    power_limit: Optional[float] = None
+    mig_devices: list[MigDevice] = field(default_factory=list)
+
+
+class GpuCollector:
+    """
+    Collects metrics for every NVIDIA GPU (and MIG instance) in one pass.
 
-    try:
-        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-        name = pynvml.nvmlDeviceGetName(handle)
-        if isinstance(name, bytes):
-            name = name.decode('utf-8')
+    Device handles and static info (name, UUID, total memory, power limit,
+    MIG layout) are resolved once in `init()`; each `sample()` only issues
+    the per-sample queries. Queries a device doesn't support return None
+    rather than failing the whole sample.
 
-        memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
-        utilization = pynvml.nvmlDeviceGetUtilizationRates(handle)
+    Args:
+        nvml: NVML binding module (pynvml or a stand-in with the same API)
+    """
 
+    def __init__(self, nvml: Any = None):
+        self.nvml = nvml
+        self.devices: list[GpuDevice] = []
+        self.available = False
+        self._lock = threading.Lock()
+
+    def _query(self, fn: Any, *args: Any) -> Any:
+        """Call an NVML function, returning None if unsupported or failing."""
         try:
-            temperature = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
+            return fn(*args)
         except Exception:
-            temperature = None
-
-        return {
-            "gpu_name": name,
-            "gpu_memory_total": memory.total,
-            "gpu_memory_used": memory.used,
-            "gpu_memory_percent": (memory.used / memory.total) * 100 if memory.total > 0 else 0,
-            "gpu_utilization": utilization.gpu,
-            "gpu_temperature": temperature,
-        }
-    except Exception:
+            return None
+
+    def init(self) -> bool:
+        """Initialize NVML and cache device handles and static info."""
+        if self.nvml is None:
+            return False
+
+        nvml = self.nvml
+        try:
+            nvml.nvmlInit()
+            count = nvml.nvmlDeviceGetCount()
+        except Exception as e:
+            logger.info(f"NVML unavailable, GPU metrics disabled: {e}")
+            return False
+
+        devices = []
+        for index in range(count):
+            try:
+                handle = nvml.nvmlDeviceGetHandleByIndex(index)
+            except Exception as e:
+                logger.warning(f"Failed to get handle for GPU {index}: {e}")
+                continue
+
+            memory = self._query(nvml.nvmlDeviceGetMemoryInfo, handle)
+            power_limit = self._query(nvml.nvmlDeviceGetEnforcedPowerLimit, handle)
+            device = GpuDevice(
+                index=index,
+                handle=handle,
+                name=_decode(self._query(nvml.nvmlDeviceGetName, handle)) or f"GPU {index}",
+                uuid=_decode(self._query(nvml.nvmlDeviceGetUUID, handle)),
+                memory_total=memory.total if memory else None,
+                power_limit=power_limit / 1000 if power_limit is not None else None,
+            )
+            device.mig_devices = self._discover_mig(handle)
+            devices.append(device)
+
+        with self._lock:
+            self.devices = devices
+            self.available = bool(devices)
+        logger.info(f"NVML initialized with {len(devices)} GPU(s)")
+        return self.available
+
+    def _discover_mig(self, handle: Any) -> list[MigDevice]:
+        """Enumerate MIG instance handles if MIG mode is enabled on a device."""
+        nvml = self.nvml
+        mode = self._query(nvml.nvmlDeviceGetMigMode, handle)
+        if not mode or mode[0] != nvml.NVML_DEVICE_MIG_ENABLE:
+            return []
+
+        instances = []
+        max_count = self._query(nvml.nvmlDeviceGetMaxMigDeviceCount, handle) or 0
+        for i in range(max_count):
+            mig_handle = self._query(nvml.nvmlDeviceGetMigDeviceHandleByIndex, handle, i)
+            if mig_handle is None:
+                continue
+            instances.append(MigDevice(
+                index=i,
+                handle=mig_handle,
+                uuid=_decode(self._query(nvml.nvmlDeviceGetUUID, mig_handle)),
+                name=_decode(self._query(nvml.nvmlDeviceGetName, mig_handle)),
+            ))
+        return instances
+
+    def _processes(self, device: GpuDevice) -> list[GpuProcess]:
+        """Per-process GPU memory for compute and graphics contexts on a device."""
+        nvml = self.nvml
+        processes: dict[int, GpuProcess] = {}
+        for fn in (nvml.nvmlDeviceGetComputeRunningProcesses,
+                   nvml.nvmlDeviceGetGraphicsRunningProcesses):
+            for proc in self._query(fn, device.handle) or []:
+                used = getattr(proc, "usedGpuMemory", None)
+                existing = processes.get(proc.pid)
+                if existing:
+                    # A process with both contexts is listed twice with the same
+                    # per-process total, so keep one figure rather than summing
+                    if used is not None:
+                        existing.used_memory = max(existing.used_memory or 0, used)
+                else:
+                    processes[proc.pid] = GpuProcess(
+                        pid=proc.pid, gpu_index=device.index, used_memory=used
+                    )
+        return list(processes.values())
+
+    def _sample_device(self, device: GpuDevice) -> GpuMetrics:
+        """Read the per-sample metrics for one device."""
+        nvml = self.nvml
+        handle = device.handle
+
+        memory = self._query(nvml.nvmlDeviceGetMemoryInfo, handle)
+        utilization = self._query(nvml.nvmlDeviceGetUtilizationRates, handle)
+        power = self._query(nvml.nvmlDeviceGetPowerUsage, handle)
+        encoder = self._query(nvml.nvmlDeviceGetEncoderUtilization, handle)
+        decoder = self._query(nvml.nvmlDeviceGetDecoderUtilization, handle)
+
+        memory_total = memory.total if memory else device.memory_total
+        memory_used = memory.used if memory else None
+
+        mig_instances = []
+        for mig in device.mig_devices:
+            mig_memory = self._query(nvml.nvmlDeviceGetMemoryInfo, mig.handle)
+            mig_instances.append(MigInstance(
+                index=mig.index,
+                uuid=mig.uuid,
+                name=mig.name,
+                memory_total=mig_memory.total if mig_memory else None,
+                memory_used=mig_memory.used if mig_memory else None,
+            ))
+
+        return GpuMetrics(
+            index=device.index,
+            name=device.name,
+            uuid=device.uuid,
+            memory_total=memory_total,
+            memory_used=memory_used,
+            memory_percent=(memory_used / memory_total) * 100 if memory_used is not None and memory_total else None,
+            utilization=utilization.gpu if utilization else None,
+            temperature=self._query(nvml.nvmlDeviceGetTemperature, handle, nvml.NVML_TEMPERATURE_GPU),
+            power_draw=power / 1000 if power is not None else None,
+            power_limit=device.power_limit,
+            clock_graphics=self._query(nvml.nvmlDeviceGetClockInfo, handle, nvml.NVML_CLOCK_GRAPHICS),
+            clock_memory=self._query(nvml.nvmlDeviceGetClockInfo, handle, nvml.NVML_CLOCK_MEM),
+            encoder_utilization=encoder[0] if encoder else None,
+            decoder_utilization=decoder[0] if decoder else None,
+            mig_instances=mig_instances,
+            processes=self._processes(device),
+        )
+
+    def sample(self) -> list[GpuMetrics]:
+        """Collect metrics for all devices in a single batched pass."""
+        if not self.available:
+            return []
+        with self._lock:
+            return [self._sample_device(device) for device in self.devices]
+
+    def process_memory(self) -> dict[int, int]:
+        """Map of PID to total GPU memory used across all devices."""
+        usage: dict[int, int] = {}
+        if not self.available:
+            return usage
+        with self._lock:
+            for device in self.devices:
+                for proc in self._processes(device):
+                    if proc.used_memory is not None:
+                        usage[proc.pid] = usage.get(proc.pid, 0) + proc.used_memory
+        return usage
+
+
+# NVML init can take seconds on some drivers, so it runs in the background
+# after the server is up; until then GPU metrics are empty
+gpu_collector = GpuCollector(pynvml)
+startup.register("nvml", gpu_collector.init)
+
+# Disk usage (refreshed every DISK_USAGE_TTL) and I/O rates, sampled in the background
+sampler.register("disk_usage", mount_usage.refresh)
+sampler.register("disk_io", disk_io.sample)
+
+# PSI, paging rates and per-container/per-service cgroup memory
+sampler.register("pressure", lambda: pressure_sampler.sample({
+    name: usage.pids
+    for name, usage in (sampler.latest("service_resources") or {}).items()
+}))
+
+
+def get_gpu_metrics() -> dict:
+    """
+    Get NVIDIA GPU metrics if available.
+
+    Returns the per-GPU list under `gpus`, plus the legacy top-level
+    `gpu_*` fields populated from the first device.
+    """
+    gpus = gpu_collector.sample()
+    if not gpus:
         return {}
 
+    primary = gpus[0]
+    return {
+        "gpu_name": primary.name,
+        "gpu_memory_total": primary.memory_total,
+        "gpu_memory_used": primary.memory_used,
+        "gpu_memory_percent": primary.memory_percent,
+        "gpu_utilization": primary.utilization,
+        "gpu_temperature": primary.temperature,
+        "gpus": gpus,
+    }
+
 
 def get_system_metrics() -> SystemMetrics:
     """Collect all system metrics."""
@@ -73,10 +266,17 @@ def get_system_metrics() -> SystemMetrics:
     cpu_count = psutil.cpu_count()
 
     memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
+    disks = sampler.latest("disk_usage") or mount_usage.refresh()
+    disk = mount_usage.get('/')
+    if disk is None or not (disk.responsive or disk.total):
+        # Root didn't answer the first background statvfs in time; block on it
+        # rather than report a zero-sized disk
+        disk = psutil.disk_usage('/')
 
-    gpu_metrics = get_gpu_metrics()
-    cpu_temp = get_cpu_temperature()
+    with telemetry.timer("collector", "gpu"):
+        gpu_metrics = get_gpu_metrics()
+    with telemetry.timer("collector", "temperatures"):
+        temperatures = temperature_sensors.read()
 
     return SystemMetrics(
         cpu_percent=cpu_percent,
@@ -88,6 +288,9 @@ def get_system_metrics() -> SystemMetrics:
         disk_total=disk.total,
         disk_used=disk.used,
         disk_percent=disk.percent,
-        cpu_temperature=cpu_temp,
+        cpu_temperature=cpu_temperature(temperatures),
+        temperatures=temperatures,
+        disks=disks,
+        disk_io=sampler.latest("disk_io") or [],
         **gpu_metrics
     )
@@ -0,0 +1,170 @@
+"""Dependency-ordered start/stop of the whole service stack."""
+import asyncio
+import logging
+import time
+from typing import Optional
+from app.models import StackActionResponse, StackServiceResult
+from app.services.executor import subprocess_pool
+from app.services.process import is_service_ready, start_service, stop_service
+from app.services.registry import ServiceConfig, registry
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a started service to become ready, and poll interval
+READY_TIMEOUT = 120.0
+READY_POLL_INTERVAL = 0.5
+
+
+class DependencyError(ValueError):
+    """Raised when the dependency graph is invalid (cycle or unknown service)."""
+
+
+def dependency_order(
+    services: dict[str, ServiceConfig],
+    names: list[str],
+    include_dependencies: bool = True,
+) -> list[str]:
+    """
+    Topologically sort services so dependencies come first.
+
+    Args:
+        services: Registry mapping
+        names: Services requested
+        include_dependencies: Also pull in transitive dependencies
+
+    Raises:
+        DependencyError: If a service is unknown or the graph has a cycle
+    """
+    selected: set[str] = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name in selected:
+            continue
+        if name not in services:
+            raise DependencyError(f"Unknown service: {name}")
+        selected.add(name)
+        if include_dependencies:
+            stack.extend(services[name].depends_on)
+
+    # Kahn's algorithm; sorted for a stable order among independent services
+    remaining = {name: set(services[name].depends_on) & selected for name in selected}
+    order = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            raise DependencyError(
+                f"Dependency cycle between: {', '.join(sorted(remaining))}"
+            )
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+async def wait_until_ready(config: ServiceConfig, timeout: float = READY_TIMEOUT) -> bool:
+    """Poll a service's readiness until it passes or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if await subprocess_pool.run(is_service_ready, config):
+            return True
+        await asyncio.sleep(READY_POLL_INTERVAL)
+    return False
+
+
+async def _run_graph(
+    order: list[str],
+    waits_on: dict[str, list[str]],
+    action,
+) -> StackActionResponse:
+    """
+    Run `action` for every service once everything it waits on has succeeded.
+
+    Independent services run concurrently. If a prerequisite fails, the
+    services waiting on it are skipped rather than run.
+    """
+    started = time.monotonic()
+    done: dict[str, asyncio.Future] = {
+        name: asyncio.get_running_loop().create_future() for name in order
+    }
+    results: dict[str, StackServiceResult] = {}
+
+    async def run(name: str) -> None:
+        prerequisites = [done[dep] for dep in waits_on[name] if dep in done]
+        outcomes = await asyncio.gather(*prerequisites)
+        if not all(outcomes):
+            failed = [dep for dep in waits_on[name] if dep in results and not results[dep].success]
+            results[name] = StackServiceResult(
+                name=name,
+                success=False,
+                message=f"Skipped: {', '.join(failed)} failed",
+            )
+            done[name].set_result(False)
+            return
+
+        service_started = time.monotonic()
+        try:
+            success, message = await action(name)
+        except Exception as e:
+            logger.error(f"Stack action failed for {name}: {e}")
+            success, message = False, str(e)
+        results[name] = StackServiceResult(
+            name=name,
+            success=success,
+            message=message,
+            seconds=time.monotonic() - service_started,
+        )
+        done[name].set_result(success)
+
+    await asyncio.gather(*(run(name) for name in order))
+    return StackActionResponse(
+        success=all(result.success for result in results.values()),
+        total_seconds=time.monotonic() - started,
+        results=[results[name] for name in order],
+    )
+
+
+async def start_all(names: Optional[list[str]] = None) -> StackActionResponse:
+    """
+    Start services (default: all) in dependency order.
+
+    Services with no pending dependencies start in parallel; each must pass
+    its readiness check before its dependents are started. Services that
+    are already ready are left alone.
+    """
+    services = registry.all()
+    order = dependency_order(services, names or list(services))
+
+    async def start(name: str) -> tuple[bool, str]:
+        config = services[name]
+        if await subprocess_pool.run(is_service_ready, config):
+            return True, f"{name} already running"
+        success, message = await start_service(name)
+        if not success:
+            return False, message
+        if not await wait_until_ready(config):
+            return False, f"{name} did not become ready within {READY_TIMEOUT:.0f}s"
+        return True, f"{name} ready"
+
+    response = await _run_graph(order, {name: services[name].depends_on for name in order}, start)
+    logger.info(f"Stack start finished in {response.total_seconds:.1f}s (success={response.success})")
+    return response
+
+
+async def stop_all(names: Optional[list[str]] = None) -> StackActionResponse:
+    """Stop services (default: all), stopping dependents before their dependencies."""
+    services = registry.all()
+    order = dependency_order(services, names or list(services), include_dependencies=False)
+
+    # Reverse the edges: a service waits for everything that depends on it
+    dependents: dict[str, list[str]] = {name: [] for name in order}
+    for name in order:
+        for dep in services[name].depends_on:
+            if dep in dependents:
+                dependents[dep].append(name)
+
+    response = await _run_graph(list(reversed(order)), dependents, stop_service)
+    logger.info(f"Stack stop finished in {response.total_seconds:.1f}s (success={response.success})")
+    return response
@@ -0,0 +1,218 @@
+"""Pressure Stall Information, paging activity and cgroup memory metrics."""
+import logging
+import os
+import time
+from typing import Optional
+import psutil
+from app.models import CgroupMemory, MemoryActivity, PressureMetrics, PressureStall
+
+logger = logging.getLogger(__name__)
+
+PSI_DIR = "/proc/pressure"
+VMSTAT_FILE = "/proc/vmstat"
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# /proc/vmstat counters turned into per-second rates
+VMSTAT_FIELDS = ("pswpin", "pswpout", "pgfault", "pgmajfault")
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_int(path: str) -> Optional[int]:
+    text = _read_text(path)
+    if text is None:
+        return None
+    text = text.strip()
+    if text == "max":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def parse_psi(text: str) -> PressureStall:
+    """Parse the `some`/`full` lines of a PSI file."""
+    values = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts or parts[0] not in ("some", "full"):
+            continue
+        for field in parts[1:]:
+            key, _, value = field.partition("=")
+            if key.startswith("avg"):
+                values[f"{parts[0]}_{key}"] = float(value)
+    return PressureStall(**values)
+
+
+def _cgroup_v1_memory_dir() -> Optional[str]:
+    """Mount point of the cgroup v1 memory controller, if any."""
+    path = os.path.join(CGROUP_ROOT, "memory")
+    return path if os.path.isdir(path) else None
+
+
+def _process_cgroup(pid: int) -> Optional[str]:
+    """The cgroup (v2 unified, or v1 memory controller) a process belongs to."""
+    text = _read_text(f"/proc/{pid}/cgroup")
+    if not text:
+        return None
+    unified = None
+    for line in text.splitlines():
+        hierarchy, controllers, path = line.split(":", 2)
+        if "memory" in controllers.split(","):
+            return path
+        if hierarchy == "0":
+            unified = path
+    return unified
+
+
+class CgroupReader:
+    """Reads memory usage for cgroups under either cgroup v2 or v1."""
+
+    def __init__(self, root: str = CGROUP_ROOT):
+        self.root = root
+        self.v2 = os.path.exists(os.path.join(root, "cgroup.controllers"))
+        self.v1_memory = None if self.v2 else _cgroup_v1_memory_dir()
+
+    def memory(self, cgroup: str) -> Optional[tuple[int, Optional[int], Optional[PressureStall]]]:
+        """(current, limit, pressure) for a cgroup path, or None if unreadable."""
+        relative = cgroup.lstrip("/")
+        if self.v2:
+            base = os.path.join(self.root, relative)
+            current = _read_int(os.path.join(base, "memory.current"))
+            if current is None:
+                return None
+            psi = _read_text(os.path.join(base, "memory.pressure"))
+            return current, _read_int(os.path.join(base, "memory.max")), parse_psi(psi) if psi else None
+        if self.v1_memory:
+            base = os.path.join(self.v1_memory, relative)
+            current = _read_int(os.path.join(base, "memory.usage_in_bytes"))
+            if current is None:
+                return None
+            limit = _read_int(os.path.join(base, "memory.limit_in_bytes"))
+            # v1 reports "no limit" as a huge page-aligned number
+            if limit is not None and limit >= 2 ** 62:
+                limit = None
+            return current, limit, None
+        return None
+
+    def docker_cgroups(self) -> dict[str, str]:
+        """Map of container ID to cgroup path for running Docker containers."""
+        found = {}
+        if self.v2:
+            candidates = [("system.slice", "docker-", ".scope"), ("docker", "", "")]
+            base_dir = self.root
+        elif self.v1_memory:
+            candidates = [("docker", "", ""), ("system.slice", "docker-", ".scope")]
+            base_dir = self.v1_memory
+        else:
+            return found
+
+        for parent, prefix, suffix in candidates:
+            try:
+                entries = os.listdir(os.path.join(base_dir, parent))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.startswith(prefix) or not entry.endswith(suffix):
+                    continue
+                container_id = entry[len(prefix):]
+                if suffix:
+                    container_id = container_id[:-len(suffix)]
+                if len(container_id) == 64:
+                    found[container_id] = f"/{parent}/{entry}"
+        return found
+
+
+class PressureSampler:
+    """
+    Samples PSI averages, paging rates and per-cgroup memory.
+
+    Paging counters from /proc/vmstat are turned into per-second rates
+    against the previous sample. Managed services are mapped to the cgroup
+    of their processes; when that is the backend's own cgroup (services
+    launched without their own scope) the entry is marked `shared`.
+    """
+
+    def __init__(self):
+        self.cgroups = CgroupReader()
+        self._previous_vmstat: Optional[tuple[float, dict[str, int]]] = None
+        self._own_cgroup = _process_cgroup(os.getpid())
+
+    def _psi(self, resource: str) -> Optional[PressureStall]:
+        text = _read_text(os.path.join(PSI_DIR, resource))
+        return parse_psi(text) if text else None
+
+    def _memory_activity(self) -> MemoryActivity:
+        now = time.monotonic()
+        counters = {}
+        for line in (_read_text(VMSTAT_FILE) or "").splitlines():
+            key, _, value = line.partition(" ")
+            if key in VMSTAT_FIELDS:
+                counters[key] = int(value)
+
+        rates = dict.fromkeys(VMSTAT_FIELDS, 0.0)
+        previous = self._previous_vmstat
+        self._previous_vmstat = (now, counters)
+        if previous and now > previous[0]:
+            elapsed = now - previous[0]
+            for key in VMSTAT_FIELDS:
+                if key in counters and key in previous[1]:
+                    rates[key] = (counters[key] - previous[1][key]) / elapsed
+
+        swap = psutil.swap_memory()
+        return MemoryActivity(
+            swap_total=swap.total,
+            swap_used=swap.used,
+            swap_in_per_sec=rates["pswpin"],
+            swap_out_per_sec=rates["pswpout"],
+            page_faults_per_sec=rates["pgfault"],
+            major_faults_per_sec=rates["pgmajfault"],
+        )
+
+    def _cgroup_entry(self, name: str, kind: str, cgroup: str) -> Optional[CgroupMemory]:
+        memory = self.cgroups.memory(cgroup)
+        if memory is None:
+            return None
+        current, limit, pressure = memory
+        return CgroupMemory(
+            name=name,
+            kind=kind,
+            cgroup=cgroup,
+            memory_current=current,
+            memory_max=limit,
+            memory_pressure=pressure,
+            shared=kind == "service" and cgroup == self._own_cgroup,
+        )
+
+    def sample(self, service_pids: Optional[dict[str, list[int]]] = None) -> PressureMetrics:
+        """Collect one pressure snapshot."""
+        cgroups = []
+        for container_id, cgroup in self.cgroups.docker_cgroups().items():
+            entry = self._cgroup_entry(container_id[:12], "container", cgroup)
+            if entry:
+                cgroups.append(entry)
+
+        for name, pids in (service_pids or {}).items():
+            cgroup = _process_cgroup(pids[0]) if pids else None
+            entry = self._cgroup_entry(name, "service", cgroup) if cgroup else None
+            if entry:
+                cgroups.append(entry)
+
+        return PressureMetrics(
+            cpu=self._psi("cpu"),
+            memory=self._psi("memory"),
+            io=self._psi("io"),
+            memory_activity=self._memory_activity(),
+            cgroups=cgroups,
+            timestamp=time.time(),
+        )
+
+
+pressure_sampler = PressureSampler()
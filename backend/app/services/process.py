@@ -3,47 +3,47 @@ import subprocess
 import os
 import time
 import logging
-from typing import Optional
-from app.models import ServiceInfo, ServiceStatus
+import urllib.error
+import urllib.request
+from typing import Callable, Optional
+from app.models import ServiceInfo, ServiceResources, ServiceStatus
+from app.services.executor import subprocess_pool
+from app.services.registry import ServiceConfig, registry
+from app.services.resources import resource_collector
+from app.services.sampler import sampler
+from app.services.supervisor import ProcessState, log_path, supervisor
+from app.services.telemetry import telemetry
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Known services configuration
-KNOWN_SERVICES = {
-    "FilaMama": {
-        "path": "/home/flatstone/Claude/FLATSTONE/FilaMama",
-        "frontend_port": 5100,
-        "backend_port": 5101,
-        "start_cmd": "./start.sh",
-        "icon": "folder",
-        "description": "File Manager"
-    },
-    "HollyWool": {
-        "path": "/home/flatstone/Claude/FLATSTONE/HollyWool",
-        "frontend_port": 5173,
-        "backend_port": 5172,
-        "start_cmd": "./start.sh",
-        "icon": "image",
-        "description": "AI Image & Video Generation"
-    },
-    "TextAile": {
-        "path": "/home/flatstone/Claude/FLATSTONE/TextAile",
-        "frontend_port": 5174,
-        "backend_port": 8001,
-        "start_cmd": "./start.sh",
-        "icon": "message-square",
-        "description": "AI Chat Interface"
-    },
-    "YoungerYou": {
-        "path": "/home/flatstone/Claude/FLATSTONE/YoungerYou",
-        "frontend_port": 4446,
-        "websocket_port": 4444,
-        "start_cmd": "./start.sh",
-        "icon": "sparkles",
-        "description": "AI Age Transformation"
-    }
-}
+# Per-service resource usage, sampled in the background
+sampler.register(
+    "service_resources",
+    lambda: resource_collector.sample(registry.all(), supervisor.pids()),
+)
+
+
+# Services scaled to zero for idleness, mapped to a callback releasing the
+# ports held on their behalf until the next request wakes them
+_port_holders: dict[str, Callable[[], None]] = {}
+
+
+def hold_ports(name: str, release: Callable[[], None]) -> None:
+    """Mark a service as sleeping while something else holds its ports."""
+    _port_holders[name] = release
+
+
+def release_ports(name: str) -> None:
+    """Release a sleeping service's held ports (no-op if not sleeping)."""
+    release = _port_holders.pop(name, None)
+    if release:
+        release()
+
+
+def is_sleeping(name: str) -> bool:
+    """Whether a service was stopped for idleness and will wake on request."""
+    return name in _port_holders
 
 
 def is_port_in_use(port: int) -> bool:
@@ -56,11 +56,30 @@ def is_port_in_use(port: int) -> bool:
             return True
 
 
-def get_service_status(service_config: dict) -> tuple[ServiceStatus, bool, bool]:
-    """Get the status of a service by checking its ports."""
-    frontend_port = service_config.get("frontend_port")
-    backend_port = service_config.get("backend_port")
-    websocket_port = service_config.get("websocket_port")
+def get_service_status(service_config: ServiceConfig) -> tuple[ServiceStatus, bool, bool]:
+    """
+    Get the status of a service.
+
+    Supervised services are answered from the supervisor's state; others
+    fall back to checking whether their ports are bound. Sleeping services
+    are stopped even though their ports are held.
+    """
+    if is_sleeping(service_config.name):
+        return ServiceStatus.STOPPED, False, False
+
+    supervised = supervisor.get(service_config.name)
+    if supervised and (supervised.alive or supervised.state == ProcessState.FAILED):
+        if supervised.state == ProcessState.FAILED:
+            return ServiceStatus.ERROR, False, False
+        return (
+            ServiceStatus.RUNNING,
+            service_config.frontend_port is not None,
+            service_config.backend_port is not None or service_config.websocket_port is not None,
+        )
+
+    frontend_port = service_config.frontend_port
+    backend_port = service_config.backend_port
+    websocket_port = service_config.websocket_port
 
     frontend_running = frontend_port is not None and is_port_in_use(frontend_port)
     backend_running = backend_port is not None and is_port_in_use(backend_port)
@@ -77,54 +96,77 @@ def get_service_status(service_config: dict) -> tuple[ServiceStatus, bool, bool]
     return status, frontend_running, backend_running
 
 
+def is_service_ready(config: ServiceConfig) -> bool:
+    """
+    Check whether a service is ready to serve requests.
+
+    Uses the configured health URL if there is one (any 2xx/3xx counts),
+    otherwise requires every configured port to be bound.
+    """
+    if is_sleeping(config.name):
+        return False
+    if config.health_url:
+        try:
+            with urllib.request.urlopen(config.health_url, timeout=2) as response:
+                return response.status < 400
+        except (urllib.error.URLError, OSError, ValueError):
+            return False
+    return bool(config.ports) and all(is_port_in_use(port) for port in config.ports)
+
+
 def get_all_services() -> list[ServiceInfo]:
     """Get information about all known services."""
     services = []
-    for name, config in KNOWN_SERVICES.items():
+    for name, config in registry.all().items():
         status, frontend_running, backend_running = get_service_status(config)
+        supervised = supervisor.get(name)
         services.append(ServiceInfo(
             name=name,
-            description=config["description"],
-            icon=config["icon"],
-            path=config["path"],
-            frontend_port=config.get("frontend_port"),
-            backend_port=config.get("backend_port"),
-            websocket_port=config.get("websocket_port"),
+            description=config.description,
+            icon=config.icon,
+            path=config.path,
+            frontend_port=config.frontend_port,
+            backend_port=config.backend_port,
+            websocket_port=config.websocket_port,
             status=status,
             frontend_running=frontend_running,
             backend_running=backend_running,
+            supervised=supervised is not None and supervised.alive,
+            pid=supervised.pid if supervised and supervised.alive else None,
+            restarts=supervised.restarts if supervised else 0,
+            sleeping=is_sleeping(name),
         ))
     return services
 
 
-def start_service(name: str) -> tuple[bool, str]:
-    """Start a service."""
-    if name not in KNOWN_SERVICES:
-        return False, f"Unknown service: {name}"
+def get_service_resources() -> dict[str, ServiceResources]:
+    """
+    Latest sampled resource usage of running services, by name.
+
+    Kept out of `get_all_services()` so the service list (and its ETag)
+    only changes when a service's state does, not on every sampler tick.
+    """
+    resources = sampler.latest("service_resources") or {}
+    # Sleeping services' ports are held by the dashboard itself
+    return {name: usage for name, usage in resources.items() if name in registry.all() and not is_sleeping(name)}
 
-    config = KNOWN_SERVICES[name]
-    path = config["path"]
-    start_cmd = config.get("start_cmd", "./start.sh")
 
-    if not os.path.exists(path):
-        return False, f"Service path not found: {path}"
+def get_service_history(name: str, seconds: Optional[float] = None) -> list[ServiceResources]:
+    """Get sampled resource usage history for a service."""
+    return [
+        resources[name]
+        for _, resources in sampler.history("service_resources", seconds)
+        if name in resources
+    ]
 
-    start_script = os.path.join(path, start_cmd)
-    if not os.path.exists(start_script):
-        return False, f"Start script not found: {start_script}"
 
-    try:
-        # Start the service in the background
-        subprocess.Popen(
-            [start_script],
-            cwd=path,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            start_new_session=True
-        )
-        return True, f"Started {name}"
-    except Exception as e:
-        return False, f"Failed to start {name}: {str(e)}"
+async def start_service(name: str) -> tuple[bool, str]:
+    """Start a service under the supervisor."""
+    config = registry.get(name)
+    if config is None:
+        return False, f"Unknown service: {name}"
+    release_ports(name)
+    return await supervisor.start(config)
 
 
 def graceful_kill_process(pid: str, timeout: float = 5.0) -> bool:
@@ -178,30 +220,40 @@ def graceful_kill_process(pid: str, timeout: float = 5.0) -> bool:
         return False
 
 
-def stop_service(name: str) -> tuple[bool, str]:
-    """Stop a service by gracefully terminating processes on its ports."""
-    if name not in KNOWN_SERVICES:
+async def stop_service(name: str) -> tuple[bool, str]:
+    """
+    Stop a service.
+
+    Supervised services are stopped through their process group; services
+    started outside the dashboard are found by the processes on their ports.
+    """
+    config = registry.get(name)
+    if config is None:
         return False, f"Unknown service: {name}"
+    if is_sleeping(name):
+        release_ports(name)
+        return True, f"Stopped {name}"
 
-    config = KNOWN_SERVICES[name]
-    ports_to_kill = []
+    supervised = supervisor.get(name)
+    if supervised and (supervised.alive or supervised.state == ProcessState.BACKOFF):
+        return await supervisor.stop(name)
+    return await subprocess_pool.run(stop_unsupervised_service, config)
 
-    if config.get("frontend_port"):
-        ports_to_kill.append(config["frontend_port"])
-    if config.get("backend_port"):
-        ports_to_kill.append(config["backend_port"])
-    if config.get("websocket_port"):
-        ports_to_kill.append(config["websocket_port"])
+
+def stop_unsupervised_service(config: ServiceConfig) -> tuple[bool, str]:
+    """Stop a service by gracefully terminating processes on its ports."""
+    name = config.name
 
     killed = False
-    for port in ports_to_kill:
+    for port in config.ports:
         try:
             # Find processes using the port
-            result = subprocess.run(
-                ["lsof", "-ti", f":{port}"],
-                capture_output=True,
-                text=True
-            )
+            with telemetry.timer("subprocess", "lsof"):
+                result = subprocess.run(
+                    ["lsof", "-ti", f":{port}"],
+                    capture_output=True,
+                    text=True
+                )
             if result.stdout.strip():
                 pids = result.stdout.strip().split('\n')
                 for pid in pids:
@@ -218,14 +270,14 @@ def stop_service(name: str) -> tuple[bool, str]:
 
 def get_service_logs(name: str, lines: int = 100) -> list[str]:
     """Get recent logs for a service."""
-    if name not in KNOWN_SERVICES:
+    config = registry.get(name)
+    if config is None:
         return [f"Unknown service: {name}"]
 
-    config = KNOWN_SERVICES[name]
-    path = config["path"]
+    path = config.path
 
-    # Look for common log files
-    log_files = [
+    # Captured supervisor output, configured log files, then common locations
+    log_files = [str(log_path(name))] + [os.path.join(path, p) for p in config.log_paths] + [
         os.path.join(path, "logs", "app.log"),
         os.path.join(path, "backend", "logs", "app.log"),
         os.path.join(path, "output.log"),
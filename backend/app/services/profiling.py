@@ -0,0 +1,222 @@
+"""Opt-in profiling: sampling profiles, per-request cProfile and event-loop lag monitoring."""
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import Counter, OrderedDict
+from typing import Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Set PROFILING_ENABLED=true to allow sampling profiles and per-request profiling
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+
+# Request header that turns on cProfile for one request, and the response
+# header carrying the id to fetch the result with
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Per-request profiles kept in memory
+PROFILE_KEEP = 20
+
+# Limits for on-demand sampling profiles
+MAX_PROFILE_SECONDS = 60.0
+MIN_SAMPLE_INTERVAL = 0.001
+
+# The event loop is considered blocked once a heartbeat is this late (seconds);
+# 0 disables the monitor, which also only runs with PROFILING_ENABLED=true
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", "0.25"))
+LOOP_HEARTBEAT_INTERVAL = 0.05
+
+# Innermost frames logged for a blocked loop
+LOOP_STACK_DEPTH = 12
+
+
+def _frame_stack(frame) -> list[str]:
+    """Root-first function names for a frame, in collapsed-stack form."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> str:
+    """
+    Sample every thread's stack for `seconds` (blocking).
+
+    Returns collapsed stacks ("frame;frame;frame count" per line), the
+    input format of flamegraph.pl and speedscope. Line numbers are kept so
+    different call sites in the same function stay apart.
+    """
+    seconds = min(seconds, MAX_PROFILE_SECONDS)
+    interval = max(interval, MIN_SAMPLE_INTERVAL)
+    own_thread = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    counts: Counter = Counter()
+
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            thread_name = names.get(thread_id, str(thread_id))
+            counts[";".join([thread_name] + _frame_stack(frame))] += 1
+        time.sleep(interval)
+
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+class ProfileStore:
+    """Keeps the most recent per-request cProfile results as text."""
+
+    def __init__(self, keep: int = PROFILE_KEEP):
+        self.keep = keep
+        self._profiles: OrderedDict[str, str] = OrderedDict()
+
+    def add(self, profile_id: str, profile: cProfile.Profile, label: str) -> None:
+        output = io.StringIO()
+        output.write(f"{label}\n\n")
+        pstats.Stats(profile, stream=output).sort_stats("cumulative").print_stats(40)
+        self._profiles[profile_id] = output.getvalue()
+        while len(self._profiles) > self.keep:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[str]:
+        return self._profiles.get(profile_id)
+
+    def ids(self) -> list[str]:
+        return list(reversed(self._profiles))
+
+
+class ProfilingMiddleware:
+    """
+    Runs a request under cProfile when it carries `X-Profile: 1`.
+
+    cProfile hooks the whole event loop thread, so other requests handled
+    concurrently show up in the profile too; use it against an otherwise
+    quiet backend. The profile id is returned in `X-Profile-Id`.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        requested = any(
+            key == PROFILE_HEADER.encode() and value not in (b"", b"0")
+            for key, value in scope["headers"]
+        )
+        if not requested:
+            await self.app(scope, receive, send)
+            return
+
+        profile = cProfile.Profile()
+        profile_id = uuid.uuid4().hex[:12]
+        label = f"{scope['method']} {scope['path']}"
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.disable()
+            self.store.add(profile_id, profile, label)
+
+
+class LoopMonitor:
+    """
+    Detects handlers that block the event loop.
+
+    A heartbeat task stamps the time every LOOP_HEARTBEAT_INTERVAL; a
+    watchdog thread notices when the stamp goes stale past the threshold
+    and logs the event loop thread's current stack once per stall, which
+    points at the blocking call. Observed lags feed a histogram.
+
+    Args:
+        threshold: Heartbeat lateness counted as a stall (seconds)
+        enabled: Run at all (opt-in with PROFILING_ENABLED by default)
+    """
+
+    def __init__(self, threshold: float = LOOP_LAG_THRESHOLD, enabled: bool = PROFILING_ENABLED):
+        self.threshold = threshold
+        self.enabled = enabled and threshold > 0
+        self.lag = Histogram()
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._beat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + LOOP_HEARTBEAT_INTERVAL
+            await asyncio.sleep(LOOP_HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self.lag.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._beat = now
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._beat
+            # The next beat is due LOOP_HEARTBEAT_INTERVAL after the last one
+            stalled_for = time.monotonic() - beat - LOOP_HEARTBEAT_INTERVAL
+            if stalled_for < self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame, limit=LOOP_STACK_DEPTH)) if frame else "(unavailable)\n"
+            logger.warning(
+                f"Event loop blocked for {stalled_for * 1000:.0f}ms+; current stack:\n{stack}"
+            )
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if not self.enabled or self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the heartbeat and watchdog."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+profile_store = ProfileStore()
+loop_monitor = LoopMonitor()
@@ -0,0 +1,225 @@
+"""Prometheus text exposition of request telemetry and host metrics."""
+import psutil
+from app.models import AlertState, PressureStall, ServiceStatus, SubsystemState
+from app.services.alerts import alert_engine
+from app.services.executor import pools
+from app.services.federation import federation
+from app.services.gateway import gateway
+from app.services.histogram import Histogram
+from app.services.journal import journal
+from app.services.metrics import gpu_collector
+from app.services.process import get_all_services, get_service_resources
+from app.services.profiling import loop_monitor
+from app.services.sampler import sampler
+from app.services.sensors import temperature_sensors
+from app.services.snapshot import caches
+from app.services.startup import startup
+from app.services.supervisor import supervisor
+from app.services.telemetry import telemetry
+
+# Prefix for every exported metric name
+PREFIX = "stonepie"
+
+# Starlette appends "; charset=utf-8" to text media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Exposition:
+    """
+    Accumulates metric families and renders them in the text format.
+
+    Samples are buffered per family, so a family's samples come out as one
+    contiguous group (as the format requires) however the calls interleave.
+    """
+
+    def __init__(self):
+        self._families: dict[str, list[str]] = {}
+
+    def _declare(self, name: str, kind: str, help_text: str) -> tuple[str, list[str]]:
+        full_name = f"{PREFIX}_{name}"
+        lines = self._families.get(full_name)
+        if lines is None:
+            lines = self._families[full_name] = [
+                f"# HELP {full_name} {help_text}",
+                f"# TYPE {full_name} {kind}",
+            ]
+        return full_name, lines
+
+    def sample(self, name: str, kind: str, help_text: str, value, labels: dict | None = None) -> None:
+        if value is None:
+            return
+        full_name, lines = self._declare(name, kind, help_text)
+        lines.append(f"{full_name}{_labels(labels or {})} {_number(value)}")
+
+    def histogram(self, name: str, help_text: str, histogram: Histogram, labels: dict) -> None:
+        full_name, lines = self._declare(name, "histogram", help_text)
+        for bound, count in histogram.cumulative():
+            bucket_labels = {**labels, "le": _number(bound)}
+            lines.append(f"{full_name}_bucket{_labels(bucket_labels)} {count}")
+        lines.append(f"{full_name}_sum{_labels(labels)} {_number(histogram.sum)}")
+        lines.append(f"{full_name}_count{_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "".join("\n".join(lines) + "\n" for lines in self._families.values())
+
+
+def _telemetry(out: Exposition) -> None:
+    out.sample("http_requests_in_flight", "gauge", "HTTP requests currently being served", telemetry.in_flight)
+    for (method, route), histogram in sorted(telemetry.requests.items()):
+        out.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route",
+            histogram,
+            {"method": method, "route": route},
+        )
+    for (method, route, status), count in sorted(telemetry.responses.items()):
+        out.sample(
+            "http_responses_total", "counter", "HTTP responses by route and status", count,
+            {"method": method, "route": route, "status": status},
+        )
+    for (kind, name), histogram in sorted(telemetry.timings.items()):
+        label = "collector" if kind == "collector" else "command"
+        out.histogram(
+            f"{kind}_duration_seconds",
+            f"Duration of {kind} calls",
+            histogram,
+            {label: name},
+        )
+    for name, histogram in sorted(gateway.histograms.items()):
+        out.histogram(
+            "proxy_request_duration_seconds",
+            "Time to upstream response headers for /apps proxying",
+            histogram,
+            {"service": name},
+        )
+    for name, count in sorted(gateway.error_counts.items()):
+        out.sample("proxy_errors_total", "counter", "Failed upstream connections for /apps proxying", count, {"service": name})
+    for pool in pools:
+        labels = {"pool": pool.name}
+        out.sample("pool_workers", "gauge", "Worker threads in a blocking-work pool", pool.max_workers, labels)
+        out.sample("pool_active", "gauge", "Calls running in a blocking-work pool", pool.active, labels)
+        out.sample("pool_queued", "gauge", "Calls waiting for a worker", pool.queued, labels)
+        out.sample("pool_timeouts_total", "counter", "Calls that exceeded the pool timeout", pool.timeouts, labels)
+        out.sample("pool_errors_total", "counter", "Calls that raised", pool.errors, labels)
+        out.histogram("pool_wait_seconds", "Time calls spent queued for a worker", pool.wait_time, labels)
+        out.histogram("pool_run_seconds", "Time calls spent running on a worker", pool.run_time, labels)
+    for cache in caches:
+        labels = {"collector": cache.name}
+        out.sample("snapshot_coalesced_total", "counter", "Requests that joined an in-flight collector refresh", cache.coalesced, labels)
+        out.sample("snapshot_stale_total", "counter", "Requests served an expired snapshot while it refreshed", cache.stale_served, labels)
+    for peer in federation.peers:
+        labels = {"peer": peer.name}
+        out.sample("federation_peer_up", "gauge", "Whether the last poll of a peer backend succeeded", int(peer.online), labels)
+        out.sample("federation_peer_poll_seconds", "gauge", "Duration of the last successful peer poll", peer.latency, labels)
+    for alert in alert_engine.active():
+        if alert.state == AlertState.FIRING:
+            labels = {"rule": alert.rule, "metric": alert.metric, "severity": alert.severity}
+            out.sample("alert_firing", "gauge", "Alerts currently firing", 1, labels)
+    out.sample("alert_rules", "gauge", "Loaded alerting rules", len(alert_engine.rules))
+    out.sample("alert_evaluation_seconds", "gauge", "Duration of the last alert rule evaluation", alert_engine.last_evaluation_seconds)
+    out.sample("journal_events_written_total", "counter", "Actions written to the journal", journal.written)
+    out.sample("import_seconds", "gauge", "Seconds from process start to app import", startup.import_seconds)
+    out.sample("first_response_seconds", "gauge", "Seconds from process start to first response", startup.first_response_seconds)
+    for status in startup.info().subsystems:
+        out.sample(
+            "subsystem_ready", "gauge", "Whether a background-initialized subsystem is ready",
+            int(status.state == SubsystemState.READY), {"subsystem": status.name},
+        )
+    out.histogram("event_loop_lag_seconds", "Event loop heartbeat lateness", loop_monitor.lag, {})
+    out.sample("event_loop_stalls_total", "counter", "Event loop stalls past the lag threshold", loop_monitor.stalls)
+
+
+def _pressure(out: Exposition, resource: str, stall: PressureStall | None) -> None:
+    if stall is None:
+        return
+    for kind in ("some", "full"):
+        for window in ("avg10", "avg60", "avg300"):
+            out.sample(
+                "pressure_percent", "gauge", "Pressure stall information averages",
+                getattr(stall, f"{kind}_{window}"),
+                {"resource": resource, "kind": kind, "window": window},
+            )
+
+
+def _host(out: Exposition) -> None:
+    # Non-blocking: percentages since the previous call
+    per_core = psutil.cpu_percent(interval=None, percpu=True)
+    if per_core:
+        out.sample("cpu_percent", "gauge", "Overall CPU utilisation", sum(per_core) / len(per_core))
+    for core, percent in enumerate(per_core):
+        out.sample("cpu_core_percent", "gauge", "Per-core CPU utilisation", percent, {"core": core})
+
+    memory = psutil.virtual_memory()
+    out.sample("memory_total_bytes", "gauge", "Total physical memory", memory.total)
+    out.sample("memory_used_bytes", "gauge", "Used physical memory", memory.used)
+
+    for disk in sampler.latest("disk_usage") or []:
+        labels = {"mountpoint": disk.mountpoint, "device": disk.device, "fstype": disk.fstype}
+        out.sample("disk_total_bytes", "gauge", "Filesystem size", disk.total, labels)
+        out.sample("disk_used_bytes", "gauge", "Filesystem bytes used", disk.used, labels)
+        out.sample("disk_responsive", "gauge", "Whether statvfs answered in time", int(disk.responsive), labels)
+    for io in sampler.latest("disk_io") or []:
+        labels = {"device": io.device}
+        out.sample("disk_read_bytes_per_second", "gauge", "Disk read throughput", io.read_bytes_per_sec, labels)
+        out.sample("disk_write_bytes_per_second", "gauge", "Disk write throughput", io.write_bytes_per_sec, labels)
+        out.sample("disk_utilization_percent", "gauge", "Disk busy time", io.utilization, labels)
+
+    for gpu in gpu_collector.sample():
+        labels = {"gpu": gpu.index, "name": gpu.name}
+        out.sample("gpu_utilization_percent", "gauge", "GPU utilisation", gpu.utilization, labels)
+        out.sample("gpu_memory_used_bytes", "gauge", "GPU memory used", gpu.memory_used, labels)
+        out.sample("gpu_memory_total_bytes", "gauge", "GPU memory total", gpu.memory_total, labels)
+        out.sample("gpu_temperature_celsius", "gauge", "GPU temperature", gpu.temperature, labels)
+        out.sample("gpu_power_watts", "gauge", "GPU power draw", gpu.power_draw, labels)
+
+    for reading in temperature_sensors.read():
+        out.sample(
+            "temperature_celsius", "gauge", "Hardware sensor temperatures", reading.current,
+            {"chip": reading.chip, "label": reading.label, "kind": reading.kind},
+        )
+
+    pressure = sampler.latest("pressure")
+    if pressure:
+        _pressure(out, "cpu", pressure.cpu)
+        _pressure(out, "memory", pressure.memory)
+        _pressure(out, "io", pressure.io)
+        activity = pressure.memory_activity
+        out.sample("swap_used_bytes", "gauge", "Swap in use", activity.swap_used)
+        out.sample("major_page_faults_per_second", "gauge", "Major page fault rate", activity.major_faults_per_sec)
+
+
+def _services(out: Exposition) -> None:
+    resources = get_service_resources()
+    for service in get_all_services():
+        labels = {"service": service.name}
+        out.sample("service_up", "gauge", "Whether a managed service is running", int(service.status == ServiceStatus.RUNNING), labels)
+        out.sample("service_restarts_total", "counter", "Supervisor restarts of a service", supervisor.restart_count(service.name), labels)
+        usage = resources.get(service.name) if service.status == ServiceStatus.RUNNING else None
+        if usage:
+            out.sample("service_cpu_percent", "gauge", "Service CPU usage", usage.cpu_percent, labels)
+            out.sample("service_memory_rss_bytes", "gauge", "Service resident memory", usage.memory_rss, labels)
+
+
+def render_metrics() -> str:
+    """Render every metric family (blocking; run off the event loop)."""
+    out = Exposition()
+    _telemetry(out)
+    _host(out)
+    _services(out)
+    return out.render()
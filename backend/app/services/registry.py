@@ -0,0 +1,290 @@
+"""Hot-reloadable registry of managed services."""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import yaml
+from pathlib import Path
+from typing import Optional
+from pydantic import BaseModel, ValidationError
+from app.services.executor import filesystem_pool
+
+logger = logging.getLogger(__name__)
+
+# Data directory for the registry file
+DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
+REGISTRY_FILE = DATA_DIR / "services.yaml"
+
+# Directory holding sibling projects; relative service paths resolve against it
+PROJECTS_DIR = Path(os.getenv(
+    "SERVICES_PROJECTS_DIR",
+    str(Path(__file__).parent.parent.parent.parent.parent)
+))
+
+# Seconds between registry file checks and sibling ports.json rescans
+RELOAD_CHECK_INTERVAL = 1.0
+DISCOVERY_INTERVAL = 30.0
+
+# Project name of this dashboard, never listed as a managed service
+SELF_PROJECT = "StonePieHome"
+
+
+class ResourceLimits(BaseModel):
+    """Optional resource limits for a service."""
+    memory_max: Optional[int] = None  # Bytes
+    cpu_percent: Optional[float] = None
+    gpu_memory_max: Optional[int] = None  # Bytes
+
+
+class ServiceConfig(BaseModel):
+    """Configuration for one managed service."""
+    name: str
+    path: str
+    description: str = ""
+    icon: str = "box"
+    frontend_port: Optional[int] = None
+    backend_port: Optional[int] = None
+    websocket_port: Optional[int] = None
+    start_cmd: str = "./start.sh"
+    health_url: Optional[str] = None
+    log_paths: list[str] = []
+    depends_on: list[str] = []
+    limits: ResourceLimits = ResourceLimits()
+    idle_timeout: Optional[float] = None  # Seconds without connections before stopping
+    wake_on_request: bool = True
+    discovered: bool = False
+
+    @property
+    def ports(self) -> list[int]:
+        """All ports the service is configured to listen on."""
+        return [
+            port for port in (self.frontend_port, self.backend_port, self.websocket_port)
+            if port
+        ]
+
+
+class RegistryFile(BaseModel):
+    """Schema of services.yaml."""
+    services: dict[str, dict] = {}
+
+
+# Services written to a fresh services.yaml
+DEFAULT_SERVICES = {
+    "FilaMama": {
+        "path": "FilaMama",
+        "frontend_port": 5100,
+        "backend_port": 5101,
+        "icon": "folder",
+        "description": "File Manager",
+    },
+    "HollyWool": {
+        "path": "HollyWool",
+        "frontend_port": 5173,
+        "backend_port": 5172,
+        "icon": "image",
+        "description": "AI Image & Video Generation",
+    },
+    "TextAile": {
+        "path": "TextAile",
+        "frontend_port": 5174,
+        "backend_port": 8001,
+        "icon": "message-square",
+        "description": "AI Chat Interface",
+    },
+    "YoungerYou": {
+        "path": "YoungerYou",
+        "frontend_port": 4446,
+        "websocket_port": 4444,
+        "icon": "sparkles",
+        "description": "AI Age Transformation",
+    },
+}
+
+
+def _resolve_path(path: str, projects_dir: Path) -> str:
+    """Resolve a service path relative to the projects directory."""
+    return str(projects_dir / os.path.expanduser(path))
+
+
+def discover_ports_files(projects_dir: Path = PROJECTS_DIR) -> dict[str, dict]:
+    """
+    Build service entries from sibling projects' ports.json allocations.
+
+    Each ports.json looks like StonePieHome's own:
+    {"project": "...", "allocated": {"frontend": 8020, "backend": 8021}}
+    """
+    discovered = {}
+    try:
+        candidates = sorted(projects_dir.glob("*/ports.json"))
+    except OSError:
+        return discovered
+
+    for ports_file in candidates:
+        try:
+            with open(ports_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Skipping unreadable {ports_file}: {e}")
+            continue
+
+        project = data.get("project") or ports_file.parent.name
+        allocated = data.get("allocated") or {}
+        if project == SELF_PROJECT or not isinstance(allocated, dict):
+            continue
+        discovered[project] = {
+            "path": str(ports_file.parent),
+            "frontend_port": allocated.get("frontend"),
+            "backend_port": allocated.get("backend"),
+            "websocket_port": allocated.get("websocket"),
+        }
+    return discovered
+
+
+def build_services(
+    configured: dict[str, dict],
+    discovered: dict[str, dict],
+    projects_dir: Path = PROJECTS_DIR,
+) -> dict[str, ServiceConfig]:
+    """
+    Merge configured and discovered entries into validated configs.
+
+    Configured fields win; discovered ports fill in anything not set.
+    Invalid entries are logged and skipped.
+    """
+    services = {}
+    for name in {**discovered, **configured}:
+        configured_entry = configured.get(name) or {}
+        if not isinstance(configured_entry, dict):
+            logger.error(f"Invalid service entry '{name}': expected a mapping")
+            continue
+        entry = {k: v for k, v in discovered.get(name, {}).items() if v is not None}
+        entry.update(configured_entry)
+        entry["name"] = name
+        entry["discovered"] = name not in configured
+        try:
+            config = ServiceConfig(**entry)
+        except ValidationError as e:
+            logger.error(f"Invalid service entry '{name}': {e}")
+            continue
+        services[name] = config.model_copy(update={"path": _resolve_path(config.path, projects_dir)})
+    return services
+
+
+class ServiceRegistry:
+    """
+    In-memory service registry backed by services.yaml.
+
+    Once started, a background task re-checks the file every
+    RELOAD_CHECK_INTERVAL seconds in the filesystem pool, so reads never
+    touch the disk on the event loop; before that (scripts, tests) it is
+    re-checked at most that often when the registry is read. Sibling
+    ports.json files are rescanned every DISCOVERY_INTERVAL seconds. A new mapping is built off to the side and
+    swapped in with a single assignment, so readers always see either the
+    old or the new registry; a file that fails to parse keeps the old one.
+
+    Args:
+        registry_file: Path to services.yaml
+        projects_dir: Directory scanned for sibling ports.json files
+    """
+
+    def __init__(self, registry_file: Path = REGISTRY_FILE, projects_dir: Path = PROJECTS_DIR):
+        self.registry_file = registry_file
+        self.projects_dir = projects_dir
+        self._services: dict[str, ServiceConfig] = {}
+        self._configured: dict[str, dict] = {}
+        self._discovered: dict[str, dict] = {}
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._last_discovery = 0.0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_file(self) -> None:
+        """Write the default registry if none exists yet."""
+        if self.registry_file.exists():
+            return
+        self.registry_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.registry_file, 'w') as f:
+            yaml.dump({"services": DEFAULT_SERVICES}, f, default_flow_style=False, sort_keys=False)
+        logger.info(f"Created default service registry at {self.registry_file}")
+
+    def _load_file(self) -> Optional[dict[str, dict]]:
+        """Parse and validate services.yaml, or None on error."""
+        try:
+            with open(self.registry_file, 'r') as f:
+                data = yaml.safe_load(f) or {}
+            return RegistryFile(**data).services
+        except (OSError, yaml.YAMLError, ValidationError, TypeError) as e:
+            logger.error(f"Failed to load service registry {self.registry_file}: {e}")
+            return None
+
+    def reload(self, force: bool = False) -> None:
+        """Reload the registry file and rediscover ports.json if due."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_check < RELOAD_CHECK_INTERVAL:
+                return
+            self._last_check = now
+
+            changed = False
+            try:
+                self._ensure_file()
+                mtime = self.registry_file.stat().st_mtime
+            except OSError as e:
+                logger.error(f"Cannot access service registry: {e}")
+                mtime = None
+            if force or mtime != self._mtime:
+                configured = self._load_file() if mtime is not None else None
+                if configured is not None:
+                    self._configured = configured
+                    changed = True
+                self._mtime = mtime
+
+            if force or now - self._last_discovery >= DISCOVERY_INTERVAL:
+                self._last_discovery = now
+                discovered = discover_ports_files(self.projects_dir)
+                if discovered != self._discovered:
+                    self._discovered = discovered
+                    changed = True
+
+            if changed:
+                self._services = build_services(self._configured, self._discovered, self.projects_dir)
+                logger.info(f"Service registry loaded with {len(self._services)} service(s)")
+
+    def all(self) -> dict[str, ServiceConfig]:
+        """Current name-to-config mapping (do not mutate)."""
+        if self._task is None:
+            self.reload()
+        return self._services
+
+    def get(self, name: str) -> Optional[ServiceConfig]:
+        """Config for one service, or None if unknown."""
+        return self.all().get(name)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(RELOAD_CHECK_INTERVAL)
+            try:
+                await filesystem_pool.run(self.reload)
+            except Exception as e:
+                logger.error(f"Service registry reload failed: {e}")
+
+    async def start(self) -> None:
+        """Load the registry in the filesystem pool, then keep reloading it in the background."""
+        if self._task is None:
+            await filesystem_pool.run(self.reload, True)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+registry = ServiceRegistry()
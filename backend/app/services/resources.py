@@ -0,0 +1,188 @@
+"""Per-service process resource attribution."""
+import logging
+import os
+import time
+from typing import Optional
+import psutil
+from app.models import ServiceResources
+from app.services.metrics import gpu_collector
+from app.services.registry import ServiceConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _cwd_within(pid: int, path: str) -> bool:
+    """Whether a process's working directory is inside a service path."""
+    try:
+        cwd = psutil.Process(pid).cwd()
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return False
+    return cwd == path or cwd.startswith(path.rstrip(os.sep) + os.sep)
+
+
+def _getsid(pid: int) -> Optional[int]:
+    """Session ID of a process, or None if it has exited."""
+    try:
+        return os.getsid(pid)
+    except OSError:
+        return None
+
+
+class ServiceResourceCollector:
+    """
+    Attributes CPU, memory, fd and GPU usage to managed services.
+
+    A service's processes are found by taking the processes listening on
+    its ports, walking up through ancestors in the same session that run
+    from the service directory (e.g. its start.sh) and including every
+    descendant of that top process. Each sample makes one pass over the
+    process table and one connection table read for all services;
+    psutil.Process objects are kept between samples so CPU percentages are
+    measured over the sampling interval.
+    """
+
+    def __init__(self):
+        self._procs: dict[int, psutil.Process] = {}
+
+    def _listening_pids(self) -> dict[int, set[int]]:
+        """Map of listening port to PIDs, from one connection table read."""
+        listeners: dict[int, set[int]] = {}
+        try:
+            connections = psutil.net_connections(kind='inet')
+        except (psutil.AccessDenied, OSError) as e:
+            logger.warning(f"Cannot read connection table: {e}")
+            return listeners
+        for conn in connections:
+            if conn.status == psutil.CONN_LISTEN and conn.laddr and conn.pid:
+                listeners.setdefault(conn.laddr.port, set()).add(conn.pid)
+        return listeners
+
+    def _process_tree(
+        self,
+        roots: set[int],
+        path: str,
+        parents: dict[int, int],
+        children: dict[int, list[int]],
+    ) -> set[int]:
+        """Expand listener PIDs to their launching ancestor and all descendants."""
+        tops = set()
+        for pid in roots:
+            sid = _getsid(pid)
+            top = pid
+            while True:
+                parent = parents.get(top, 0)
+                if parent <= 1 or _getsid(parent) != sid or not _cwd_within(parent, path):
+                    break
+                top = parent
+            tops.add(top)
+
+        tree = set()
+        stack = list(tops)
+        while stack:
+            pid = stack.pop()
+            if pid in tree:
+                continue
+            tree.add(pid)
+            stack.extend(children.get(pid, []))
+        return tree
+
+    def _measure(self, pid: int) -> Optional[dict]:
+        """Read resource usage for one process, reusing its Process object."""
+        proc = self._procs.get(pid)
+        try:
+            if proc is None:
+                proc = psutil.Process(pid)
+                self._procs[pid] = proc
+            with proc.oneshot():
+                cpu = proc.cpu_percent(interval=None)
+                try:
+                    memory = proc.memory_full_info()
+                    pss = getattr(memory, "pss", None)
+                except psutil.AccessDenied:
+                    memory = proc.memory_info()
+                    pss = None
+                try:
+                    fds = proc.num_fds()
+                except (psutil.AccessDenied, AttributeError):
+                    fds = 0
+                return {
+                    "cpu": cpu,
+                    "rss": memory.rss,
+                    "pss": pss,
+                    "threads": proc.num_threads(),
+                    "fds": fds,
+                }
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            self._procs.pop(pid, None)
+        except psutil.AccessDenied:
+            pass
+        return None
+
+    def sample(
+        self,
+        services: dict[str, ServiceConfig],
+        known_pids: Optional[dict[str, int]] = None,
+    ) -> dict[str, ServiceResources]:
+        """
+        Collect aggregated resource usage for every service in one sweep.
+
+        Args:
+            services: Registry mapping
+            known_pids: Launcher PIDs of supervised services, used as tree
+                roots in addition to the port listeners
+        """
+        known_pids = known_pids or {}
+        parents: dict[int, int] = {}
+        children: dict[int, list[int]] = {}
+        for proc in psutil.process_iter(['pid', 'ppid']):
+            pid, ppid = proc.info['pid'], proc.info['ppid']
+            if ppid is None:
+                continue
+            parents[pid] = ppid
+            children.setdefault(ppid, []).append(pid)
+
+        listeners = self._listening_pids()
+        gpu_memory = gpu_collector.process_memory()
+
+        results = {}
+        seen: set[int] = set()
+        now = time.time()
+        for name, config in services.items():
+            roots: set[int] = set()
+            for port in config.ports:
+                roots |= listeners.get(port, set())
+            if name in known_pids:
+                roots.add(known_pids[name])
+            if not roots:
+                continue
+
+            pids = self._process_tree(roots, config.path, parents, children)
+            seen |= pids
+            usage = ServiceResources(pids=sorted(pids), timestamp=now)
+            pss_total = 0
+            pss_known = True
+            for pid in pids:
+                stats = self._measure(pid)
+                if stats is None:
+                    continue
+                usage.cpu_percent += stats["cpu"]
+                usage.memory_rss += stats["rss"]
+                usage.threads += stats["threads"]
+                usage.open_fds += stats["fds"]
+                usage.gpu_memory += gpu_memory.get(pid, 0)
+                if stats["pss"] is None:
+                    pss_known = False
+                else:
+                    pss_total += stats["pss"]
+            usage.memory_pss = pss_total if pss_known else None
+            results[name] = usage
+
+        # Drop cached Process objects for processes no longer attributed
+        for pid in list(self._procs):
+            if pid not in seen:
+                del self._procs[pid]
+
+        return results
+
+
+resource_collector = ServiceResourceCollector()
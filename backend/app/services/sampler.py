@@ -0,0 +1,112 @@
+"""Background metrics sampler with bounded in-memory history."""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+from app.services.executor import PoolTimeout, psutil_pool
+from app.services.telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+# Seconds between samples and number of samples kept per collector
+SAMPLER_INTERVAL = float(os.getenv("SAMPLER_INTERVAL", "2.0"))
+SAMPLER_HISTORY = int(os.getenv("SAMPLER_HISTORY", "1800"))
+
+
+class Sampler:
+    """
+    Runs registered collectors on a fixed interval off the event loop.
+
+    Each tick runs every collector once in the psutil pool, stores the
+    result as the latest value and appends it to a bounded history.
+
+    Args:
+        interval: Seconds between ticks
+        history_size: Samples kept per collector
+    """
+
+    def __init__(self, interval: float = SAMPLER_INTERVAL, history_size: int = SAMPLER_HISTORY):
+        self.interval = interval
+        self.history_size = history_size
+        self._collectors: dict[str, Callable[[], Any]] = {}
+        self._latest: dict[str, tuple[float, Any]] = {}
+        self._history: dict[str, deque] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, collector: Callable[[], Any]) -> None:
+        """Register a collector to run on every tick."""
+        self._collectors[name] = collector
+        self._history[name] = deque(maxlen=self.history_size)
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Call `listener` on the event loop after every tick; it must not block."""
+        self._listeners.append(listener)
+
+    def latest_timestamp(self, name: str) -> Optional[float]:
+        """When a collector last produced a value, or None before the first tick."""
+        sample = self._latest.get(name)
+        return sample[0] if sample else None
+
+    def latest(self, name: str) -> Any:
+        """Most recent value from a collector, or None before the first tick."""
+        sample = self._latest.get(name)
+        return sample[1] if sample else None
+
+    def history(self, name: str, seconds: Optional[float] = None) -> list[tuple[float, Any]]:
+        """(timestamp, value) samples for a collector, optionally limited to the last N seconds."""
+        samples = self._history.get(name)
+        if not samples:
+            return []
+        if seconds is None:
+            return list(samples)
+        cutoff = time.time() - seconds
+        return [sample for sample in samples if sample[0] >= cutoff]
+
+    def tick(self) -> None:
+        """Run every collector once (blocking)."""
+        for name, collector in self._collectors.items():
+            try:
+                with telemetry.timer("collector", f"sampler.{name}"):
+                    value = collector()
+            except Exception as e:
+                logger.error(f"Sampler collector '{name}' failed: {e}")
+                continue
+            sample = (time.time(), value)
+            self._latest[name] = sample
+            self._history[name].append(sample)
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await psutil_pool.run(self.tick)
+            except PoolTimeout as e:
+                logger.error(f"Sampler tick failed: {e}")
+            for listener in self._listeners:
+                try:
+                    listener()
+                except Exception as e:
+                    logger.error(f"Sampler listener failed: {e}")
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, self.interval - elapsed))
+
+    def start(self) -> None:
+        """Start sampling in the background on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background sampling task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+sampler = Sampler()
@@ -0,0 +1,220 @@
+"""Temperature sensor discovery and low-overhead sampling via hwmon."""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from app.models import TemperatureReading
+from app.services.startup import startup
+
+logger = logging.getLogger(__name__)
+
+HWMON_DIR = "/sys/class/hwmon"
+THERMAL_DIR = "/sys/class/thermal"
+
+# How often (seconds) to check the hwmon directory for hotplugged chips
+HOTPLUG_CHECK_INTERVAL = 30.0
+
+# hwmon chip names grouped by what they measure
+CPU_CHIPS = {"coretemp", "k10temp", "zenpower", "cpu_thermal", "cpu-thermal", "soc_thermal"}
+NVME_CHIPS = {"nvme"}
+GPU_CHIPS = {"amdgpu", "nouveau", "radeon"}
+
+
+@dataclass
+class SensorInput:
+    """An opened temperature input file."""
+    chip: str
+    label: str
+    kind: str
+    path: str
+    fd: int
+
+
+def _read_text(path: str) -> Optional[str]:
+    """Read a small sysfs attribute, or None if missing."""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def classify(chip: str, label: str) -> str:
+    """Classify a sensor as package, core, cpu, nvme, gpu or other."""
+    chip = chip.lower()
+    label = label.lower()
+    if chip in CPU_CHIPS or "cpu" in chip:
+        if label.startswith("package") or label in ("tctl", "tdie"):
+            return "package"
+        if label.startswith("core") or label.startswith("tccd"):
+            return "core"
+        return "cpu"
+    if chip in NVME_CHIPS:
+        return "nvme"
+    if chip in GPU_CHIPS or "gpu" in chip:
+        return "gpu"
+    return "other"
+
+
+class TemperatureSensors:
+    """
+    Discovers temperature inputs once and samples them with pread.
+
+    Discovery walks hwmon (and thermal zones as a fallback) and keeps each
+    `temp*_input` file open, so a sample is one pread per sensor instead of
+    the directory walk psutil.sensors_temperatures() does on every call.
+    Discovery is repeated only when the set of hwmon chips changes (checked
+    every HOTPLUG_CHECK_INTERVAL seconds). A sensor whose read fails is
+    dropped and picked up again by the next such check, so one flaky
+    sensor doesn't cost a full rediscovery per sample. Until the first
+    discovery (run in the background at startup) reads return nothing.
+
+    Args:
+        hwmon_dir: hwmon class directory
+        thermal_dir: thermal class directory
+    """
+
+    def __init__(self, hwmon_dir: str = HWMON_DIR, thermal_dir: str = THERMAL_DIR):
+        self.hwmon_dir = hwmon_dir
+        self.thermal_dir = thermal_dir
+        self.inputs: list[SensorInput] = []
+        self.discovered = False
+        self._chips: frozenset[str] = frozenset()
+        self._dropped = False
+        self._last_hotplug_check = 0.0
+        self._lock = threading.Lock()
+
+    def _list_chips(self) -> frozenset[str]:
+        try:
+            return frozenset(os.listdir(self.hwmon_dir))
+        except OSError:
+            return frozenset()
+
+    def _close(self) -> None:
+        for sensor in self.inputs:
+            try:
+                os.close(sensor.fd)
+            except OSError:
+                pass
+        self.inputs = []
+
+    def _open(self, chip: str, label: str, path: str) -> Optional[SensorInput]:
+        """Open a sensor input, skipping ones that can't currently be read."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            int(os.pread(fd, 32, 0))
+        except (OSError, ValueError):
+            os.close(fd)
+            return None
+        return SensorInput(chip=chip, label=label, kind=classify(chip, label), path=path, fd=fd)
+
+    def discover(self) -> bool:
+        """(Re)discover temperature inputs and open them; True if any were found."""
+        with self._lock:
+            self._close()
+            chips = self._list_chips()
+            inputs = []
+            for entry in sorted(chips):
+                chip_dir = os.path.join(self.hwmon_dir, entry)
+                chip = _read_text(os.path.join(chip_dir, "name")) or entry
+                try:
+                    files = sorted(os.listdir(chip_dir))
+                except OSError:
+                    continue
+                for filename in files:
+                    if not (filename.startswith("temp") and filename.endswith("_input")):
+                        continue
+                    prefix = filename[:-len("_input")]
+                    label = _read_text(os.path.join(chip_dir, f"{prefix}_label")) or prefix
+                    sensor = self._open(chip, label, os.path.join(chip_dir, filename))
+                    if sensor:
+                        inputs.append(sensor)
+
+            # Some SoCs only expose CPU temperature as a thermal zone
+            if not any(s.kind in ("package", "core", "cpu") for s in inputs):
+                try:
+                    zones = sorted(z for z in os.listdir(self.thermal_dir) if z.startswith("thermal_zone"))
+                except OSError:
+                    zones = []
+                for zone in zones:
+                    zone_dir = os.path.join(self.thermal_dir, zone)
+                    zone_type = _read_text(os.path.join(zone_dir, "type")) or zone
+                    sensor = self._open(zone_type, zone, os.path.join(zone_dir, "temp"))
+                    if sensor:
+                        inputs.append(sensor)
+
+            self.inputs = inputs
+            self._chips = chips
+            self._dropped = False
+            self._last_hotplug_check = time.monotonic()
+            self.discovered = True
+        logger.info(f"Discovered {len(inputs)} temperature sensor(s)")
+        return bool(inputs)
+
+    def _check_hotplug(self) -> None:
+        now = time.monotonic()
+        if now - self._last_hotplug_check < HOTPLUG_CHECK_INTERVAL:
+            return
+        self._last_hotplug_check = now
+        if self._list_chips() != self._chips:
+            logger.info("hwmon chips changed, rediscovering temperature sensors")
+            self.discover()
+        elif self._dropped:
+            self.discover()
+
+    def read(self) -> list[TemperatureReading]:
+        """Read every discovered sensor."""
+        if not self.discovered:
+            return []
+        self._check_hotplug()
+        readings = []
+        failed = []
+        with self._lock:
+            for sensor in self.inputs:
+                try:
+                    raw = os.pread(sensor.fd, 32, 0)
+                    value = int(raw) / 1000.0
+                except (OSError, ValueError):
+                    failed.append(sensor)
+                    continue
+                readings.append(TemperatureReading(
+                    chip=sensor.chip, label=sensor.label, kind=sensor.kind, current=value
+                ))
+            for sensor in failed:
+                # A device went away (e.g. NVMe removed) or a sensor is flaky;
+                # the next hotplug check rediscovers the layout
+                logger.warning(f"Dropping temperature sensor {sensor.chip}/{sensor.label}: read failed")
+                self.inputs.remove(sensor)
+                try:
+                    os.close(sensor.fd)
+                except OSError:
+                    pass
+                self._dropped = True
+        return readings
+
+
+def cpu_temperature(readings: list[TemperatureReading]) -> Optional[float]:
+    """
+    Pick a single CPU temperature from sensor readings.
+
+    Prefers the hottest package sensor, then the average of per-core
+    sensors, then the average of any other CPU sensors, and finally the
+    first unclassified sensor (e.g. acpitz or x86_pkg_temp zones).
+    """
+    for kind in ("package", "core", "cpu"):
+        values = [r.current for r in readings if r.kind == kind]
+        if values:
+            return max(values) if kind == "package" else sum(values) / len(values)
+    for reading in readings:
+        if reading.kind == "other":
+            return reading.current
+    return None
+
+
+temperature_sensors = TemperatureSensors()
+startup.register("sensors", temperature_sensors.discover)
@@ -0,0 +1,159 @@
+"""Cached collector snapshots with ETags for conditional GET."""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.services.executor import Pool
+from app.services.telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """An encoded collector result and the ETag derived from it."""
+    body: bytes
+    etag: str
+    timestamp: float
+
+
+def encode_snapshot(value: Any) -> Snapshot:
+    """Encode a collector result once and hash it into a strong ETag."""
+    body = orjson.dumps(jsonable_encoder(value))
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    return Snapshot(body=body, etag=f'"{digest}"', timestamp=time.time())
+
+
+class SnapshotCache:
+    """
+    Caches the encoded output of a collector for a short TTL.
+
+    Polls arriving within the TTL reuse the stored body and ETag, so a
+    matching If-None-Match costs a string comparison instead of running the
+    collector and encoding the response again.
+
+    `fetch()` additionally coalesces refreshes: concurrent callers for the
+    same arguments share one in-flight collector run (single-flight), so
+    five tabs polling at once run `docker ps` once. Within the `stale`
+    window after the TTL, callers get the previous snapshot immediately
+    while a single background refresh replaces it (stale-while-revalidate).
+
+    Args:
+        collector: Callable producing the response value
+        ttl: Seconds a snapshot stays fresh
+        stale: Further seconds an expired snapshot may be served while refreshing
+        pool: Thread pool `fetch()` runs the collector in
+    """
+
+    def __init__(self, collector: Callable[..., Any], ttl: float = 1.0, stale: float = 0.0,
+                 pool: Optional[Pool] = None):
+        self.collector = collector
+        self.name = getattr(collector, "__name__", "collector")
+        self.ttl = ttl
+        self.stale = stale
+        self.pool = pool
+        self.coalesced = 0  # Callers that joined an in-flight refresh
+        self.stale_served = 0
+        self._snapshots: dict[Hashable, Snapshot] = {}
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        caches.append(self)
+
+    def _cached(self, args: tuple) -> tuple[Optional[Snapshot], float]:
+        """The stored snapshot for `args` and its age in seconds."""
+        with self._lock:
+            snapshot = self._snapshots.get(args)
+        if snapshot is None:
+            return None, float("inf")
+        return snapshot, time.time() - snapshot.timestamp
+
+    def _collect(self, args: tuple, generation: int) -> Snapshot:
+        with telemetry.timer("collector", self.name):
+            snapshot = encode_snapshot(self.collector(*args))
+        with self._lock:
+            # Don't resurrect data from before an invalidate()
+            if generation == self._generation:
+                self._snapshots[args] = snapshot
+        return snapshot
+
+    def get(self, *args: Hashable) -> Snapshot:
+        """Return a fresh snapshot for the given collector arguments (blocking)."""
+        snapshot, age = self._cached(args)
+        if snapshot and age < self.ttl:
+            return snapshot
+        return self._collect(args, self._generation)
+
+    def _refresh(self, args: tuple) -> asyncio.Future:
+        """Start a refresh for `args` in the pool, or join the one in flight."""
+        flight = self._inflight.get(args)
+        if flight is not None:
+            self.coalesced += 1
+            return flight
+
+        flight = asyncio.ensure_future(self.pool.run(self._collect, args, self._generation))
+        self._inflight[args] = flight
+
+        def done(future: asyncio.Future) -> None:
+            if self._inflight.get(args) is future:
+                del self._inflight[args]
+            if not future.cancelled() and future.exception() is not None:
+                logger.warning(f"Refreshing {self.name} failed: {future.exception()}")
+
+        flight.add_done_callback(done)
+        return flight
+
+    async def fetch(self, *args: Hashable) -> Snapshot:
+        """Like `get()`, but coalesced, stale-while-revalidate and run in the cache's pool."""
+        snapshot, age = self._cached(args)
+        if snapshot and age < self.ttl:
+            return snapshot
+        if self.pool is None:
+            return self.get(*args)
+        if snapshot and age < self.ttl + self.stale:
+            self._refresh(args)
+            self.stale_served += 1
+            return snapshot
+        # Shielded so a client disconnecting doesn't cancel a shared refresh
+        return await asyncio.shield(self._refresh(args))
+
+    def prefetch(self, *args: Hashable) -> None:
+        """Start a background refresh so a later `fetch()` finds it done or in flight."""
+        if self.pool is not None:
+            self._refresh(args)
+
+    def invalidate(self) -> None:
+        """Drop cached snapshots, e.g. after a state-changing action."""
+        with self._lock:
+            self._snapshots.clear()
+            self._generation += 1
+        # Later callers start a new refresh instead of joining one begun before the change
+        self._inflight.clear()
+
+
+# Every cache, for metrics
+caches: list[SnapshotCache] = []
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def snapshot_response(request: Request, snapshot: Snapshot) -> Response:
+    """Build a 200 response from a snapshot, or 304 if the client's copy is current."""
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
@@ -0,0 +1,115 @@
+"""Background initialization and readiness of slow subsystems."""
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Optional
+import psutil
+from app.models import StartupInfo, SubsystemState, SubsystemStatus
+from app.services.executor import Pool, filesystem_pool
+
+logger = logging.getLogger(__name__)
+
+
+def _process_started() -> float:
+    """Wall-clock time this process was created (falls back to now)."""
+    try:
+        # Clock ticks since boot; exact, unlike psutil's whole-second boot time
+        with open("/proc/self/stat") as f:
+            ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        age = time.clock_gettime(time.CLOCK_BOOTTIME) - ticks / os.sysconf("SC_CLK_TCK")
+        return time.time() - age
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        return psutil.Process().create_time()
+    except psutil.Error:
+        return time.time()
+
+
+class Startup:
+    """
+    Runs registered subsystem initializers after the server is listening.
+
+    Modules register an init callable at import time instead of running
+    it; `start()` (called from the app lifespan) runs them concurrently in
+    their blocking-work pools, so NVML, sensor discovery and the docker/nmcli probes
+    never delay binding the port or the first response. Each init returns
+    True when the subsystem is usable and False when it is absent on this
+    host; exceptions mark it failed.
+
+    Also records import time and time to the first response, both measured
+    from process creation.
+    """
+
+    def __init__(self):
+        self.process_started = _process_started()
+        self.import_seconds: Optional[float] = None
+        self.first_response_seconds: Optional[float] = None
+        self._initializers: dict[str, tuple[Callable[[], bool], Pool]] = {}
+        self._status: dict[str, SubsystemStatus] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, init: Callable[[], bool], pool: Pool = filesystem_pool) -> None:
+        """Register an initializer to run in the background in `pool` at startup."""
+        self._initializers[name] = (init, pool)
+        self._status[name] = SubsystemStatus(name=name, state=SubsystemState.PENDING)
+
+    def mark_imported(self) -> None:
+        """Record that the application finished importing."""
+        self.import_seconds = time.time() - self.process_started
+
+    def mark_first_response(self) -> None:
+        """Record the first response sent (later calls are ignored)."""
+        if self.first_response_seconds is None:
+            self.first_response_seconds = time.time() - self.process_started
+            logger.info(f"First response {self.first_response_seconds:.2f}s after process start")
+
+    def is_ready(self, name: str) -> bool:
+        status = self._status.get(name)
+        return status is not None and status.state == SubsystemState.READY
+
+    async def _init(self, name: str, init: Callable[[], bool], pool: Pool) -> None:
+        self._status[name] = SubsystemStatus(name=name, state=SubsystemState.INITIALIZING)
+        started = time.monotonic()
+        try:
+            available = await pool.run(init)
+        except Exception as e:
+            logger.error(f"Initializing {name} failed: {e}")
+            state, message = SubsystemState.FAILED, str(e)
+        else:
+            state = SubsystemState.READY if available else SubsystemState.UNAVAILABLE
+            message = None
+        seconds = time.monotonic() - started
+        self._status[name] = SubsystemStatus(name=name, state=state, seconds=seconds, message=message)
+        logger.info(f"Subsystem {name} {state.value} after {seconds:.2f}s")
+
+    async def _init_all(self) -> None:
+        # Let the server finish binding before competing for the GIL
+        await asyncio.sleep(0)
+        await asyncio.gather(*(self._init(name, *entry) for name, entry in self._initializers.items()))
+
+    def start(self) -> None:
+        """Start initializing every registered subsystem in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._init_all())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def info(self) -> StartupInfo:
+        """Startup timings and per-subsystem readiness."""
+        return StartupInfo(
+            import_seconds=self.import_seconds,
+            first_response_seconds=self.first_response_seconds,
+            subsystems=list(self._status.values()),
+        )
+
+
+startup = Startup()
@@ -0,0 +1,343 @@
+"""In-backend supervisor for managed service processes."""
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+from app.services import log_relay
+from app.services.executor import PoolTimeout, filesystem_pool, subprocess_pool
+from app.services.journal import journal
+from app.services.registry import ServiceConfig
+
+logger = logging.getLogger(__name__)
+
+# Captured service output; kept out of data/, which is served over HTTP
+LOGS_DIR = Path(os.getenv(
+    "SUPERVISOR_LOG_DIR", str(Path(__file__).parent.parent.parent.parent / "logs")
+))
+
+# Size cap per log file and number of rotated files kept
+LOG_MAX_BYTES = int(os.getenv("SUPERVISOR_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("SUPERVISOR_LOG_BACKUPS", "3"))
+
+# Stop supervised services when the backend exits; by default they keep
+# running, so restarting the dashboard doesn't take every service down
+STOP_ON_EXIT = os.getenv("SUPERVISOR_STOP_ON_EXIT", "false").lower() == "true"
+
+# Restart backoff: doubles from BACKOFF_INITIAL up to BACKOFF_MAX, reset after
+# the process has stayed up for STABLE_AFTER seconds
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 60.0
+STABLE_AFTER = 60.0
+MAX_RESTARTS = int(os.getenv("SUPERVISOR_MAX_RESTARTS", "10"))
+
+# Seconds between SIGTERM and SIGKILL when stopping
+STOP_TIMEOUT = 5.0
+
+
+class ProcessState(str, Enum):
+    STARTING = "starting"
+    RUNNING = "running"
+    DETACHED = "detached"  # Launcher exited 0 but left its process group running
+    BACKOFF = "backoff"
+    STOPPED = "stopped"
+    FAILED = "failed"
+
+
+@dataclass
+class SupervisedProcess:
+    """Runtime state of one supervised service."""
+    name: str
+    config: ServiceConfig
+    state: ProcessState = ProcessState.STOPPED
+    process: Optional[asyncio.subprocess.Process] = None
+    pid: Optional[int] = None
+    started_at: Optional[float] = None
+    restarts: int = 0
+    last_exit_code: Optional[int] = None
+    stop_requested: bool = False
+    backoff: float = BACKOFF_INITIAL
+    tasks: list[asyncio.Task] = field(default_factory=list)
+    log_handler: Optional[logging.Handler] = None
+    output: Optional[asyncio.ReadTransport] = None
+    output_reader: Optional[asyncio.StreamReader] = None
+
+    @property
+    def alive(self) -> bool:
+        if self.state == ProcessState.DETACHED:
+            return self.pid is not None and _group_alive(self.pid)
+        return self.state in (ProcessState.STARTING, ProcessState.RUNNING)
+
+
+def _group_alive(pgid: int) -> bool:
+    """Whether any process in a process group is still running."""
+    try:
+        os.killpg(pgid, 0)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+def _open_log(name: str) -> logging.Handler:
+    """Size-capped rotating log file for a service's captured output."""
+    return log_relay.open_log(log_path(name), LOG_MAX_BYTES, LOG_BACKUP_COUNT)
+
+
+def log_path(name: str) -> Path:
+    """Path of the current captured-output log for a service."""
+    return LOGS_DIR / f"{name}.log"
+
+
+def _relay_output(fd: int, path: Path) -> None:
+    """Hand a service's output pipe to a detached log_relay writing its rotating log (blocking)."""
+    try:
+        # The event loop made the pipe non-blocking; the relay expects blocking reads
+        os.set_blocking(fd, True)
+        subprocess.Popen(
+            [sys.executable, log_relay.__file__, str(path), str(LOG_MAX_BYTES), str(LOG_BACKUP_COUNT)],
+            stdin=fd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+        )
+    finally:
+        os.close(fd)
+
+
+class Supervisor:
+    """
+    Keeps track of service processes started from the dashboard.
+
+    Each service runs in its own session with stdout/stderr on a pipe that
+    an asyncio reader drains in fixed-size chunks; the lines are written to
+    a rotating log file in the filesystem pool. A watcher task awaits the
+    process exit (reaping it) and restarts crashed services with
+    exponential backoff. Launch scripts that exit 0 while leaving their
+    process group running are tracked as DETACHED and not restarted.
+
+    When the backend exits, services keep running (their pipes are handed
+    to a detached log_relay process that keeps the same size cap and
+    rotation) unless
+    SUPERVISOR_STOP_ON_EXIT=true.
+    """
+
+    def __init__(self):
+        self._processes: dict[str, SupervisedProcess] = {}
+        # Crash restarts since the backend started; unlike SupervisedProcess.restarts
+        # this isn't reset by a manual start, so it can be exported as a counter
+        self._restart_counts: dict[str, int] = {}
+
+    def get(self, name: str) -> Optional[SupervisedProcess]:
+        """Supervision state for a service (O(1) lookup)."""
+        return self._processes.get(name)
+
+    def restart_count(self, name: str) -> int:
+        """Crash restarts of a service since the backend started."""
+        return self._restart_counts.get(name, 0)
+
+    def pids(self) -> dict[str, int]:
+        """PIDs of live supervised services."""
+        return {
+            name: proc.pid for name, proc in self._processes.items()
+            if proc.alive and proc.pid is not None
+        }
+
+    async def _spawn(self, proc: SupervisedProcess) -> None:
+        config = proc.config
+        start_script = os.path.join(config.path, config.start_cmd)
+        proc.state = ProcessState.STARTING
+        # Our own pipe rather than PIPE, so the read end can outlive the
+        # backend (see _detach)
+        read_fd, write_fd = os.pipe()
+        try:
+            proc.process = await asyncio.create_subprocess_exec(
+                start_script,
+                cwd=config.path,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=write_fd,
+                stderr=asyncio.subprocess.STDOUT,
+                start_new_session=True,
+            )
+        except OSError:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        reader = asyncio.StreamReader()
+        transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(read_fd, "rb", buffering=0)
+        )
+        proc.output, proc.output_reader = transport, reader
+        proc.pid = proc.process.pid
+        proc.started_at = time.monotonic()
+        proc.state = ProcessState.RUNNING
+        if proc.log_handler is None:
+            proc.log_handler = _open_log(proc.name)
+        proc.tasks = [
+            asyncio.create_task(self._pump_output(proc.name, proc.log_handler, transport, reader)),
+            asyncio.create_task(self._watch(proc, proc.process)),
+        ]
+        logger.info(f"Supervisor started {proc.name} (PID {proc.pid})")
+
+    async def _pump_output(self, name: str, handler: logging.Handler,
+                           transport: asyncio.ReadTransport, reader: asyncio.StreamReader) -> None:
+        """
+        Copy the child's output into its rotating log file until EOF.
+
+        Reads fixed-size chunks rather than lines, so output without
+        newlines can't overrun the reader and stop the pipe being drained.
+        """
+        partial = b""
+        try:
+            while True:
+                chunk = await reader.read(log_relay.CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines, partial = log_relay.split_lines(partial, chunk)
+                if lines:
+                    await self._write_output(name, handler, lines)
+            if partial:
+                await self._write_output(name, handler, [partial])
+        finally:
+            transport.close()
+
+    async def _write_output(self, name: str, handler: logging.Handler, lines: list[bytes]) -> None:
+        try:
+            await filesystem_pool.run(log_relay.write_lines, handler, lines)
+        except PoolTimeout as e:
+            # The write still completes in the pool; keep draining the pipe
+            logger.warning(f"Writing {name} output is slow: {e}")
+
+    async def _watch(self, proc: SupervisedProcess, process: asyncio.subprocess.Process) -> None:
+        """Reap the process and decide whether to restart it."""
+        code = await process.wait()
+        proc.last_exit_code = code
+        uptime = time.monotonic() - (proc.started_at or time.monotonic())
+
+        if proc.stop_requested:
+            proc.state = ProcessState.STOPPED
+            return
+
+        if code == 0 and _group_alive(process.pid):
+            # start.sh-style launcher that backgrounded the real servers
+            proc.state = ProcessState.DETACHED
+            logger.info(f"{proc.name} launcher exited, process group {process.pid} still running")
+            return
+
+        if uptime >= STABLE_AFTER:
+            proc.backoff = BACKOFF_INITIAL
+        if proc.restarts >= MAX_RESTARTS:
+            proc.state = ProcessState.FAILED
+            logger.error(f"{proc.name} exited with {code}; giving up after {proc.restarts} restarts")
+            return
+
+        proc.state = ProcessState.BACKOFF
+        delay = proc.backoff
+        proc.backoff = min(proc.backoff * 2, BACKOFF_MAX)
+        logger.warning(f"{proc.name} exited with {code}; restarting in {delay:.0f}s")
+        await asyncio.sleep(delay)
+        if proc.stop_requested:
+            proc.state = ProcessState.STOPPED
+            return
+        proc.restarts += 1
+        self._restart_counts[proc.name] = self._restart_counts.get(proc.name, 0) + 1
+        try:
+            with journal.action("service", proc.name, "restart", source="supervisor") as entry:
+                entry.done(True, f"Exited with {code}")
+                await self._spawn(proc)
+        except OSError as e:
+            proc.state = ProcessState.FAILED
+            logger.error(f"Failed to restart {proc.name}: {e}")
+
+    async def start(self, config: ServiceConfig) -> tuple[bool, str]:
+        """Start and supervise a service."""
+        existing = self._processes.get(config.name)
+        if existing and existing.alive:
+            return True, f"{config.name} is already running"
+
+        if not os.path.exists(config.path):
+            return False, f"Service path not found: {config.path}"
+        start_script = os.path.join(config.path, config.start_cmd)
+        if not os.path.exists(start_script):
+            return False, f"Start script not found: {start_script}"
+
+        proc = SupervisedProcess(name=config.name, config=config)
+        if existing:
+            # Replace a crashed/backing-off entry without letting it respawn
+            existing.stop_requested = True
+            for task in existing.tasks:
+                task.cancel()
+            proc.log_handler = existing.log_handler
+        self._processes[config.name] = proc
+        try:
+            await self._spawn(proc)
+        except OSError as e:
+            proc.state = ProcessState.FAILED
+            return False, f"Failed to start {config.name}: {str(e)}"
+        return True, f"Started {config.name}"
+
+    async def stop(self, name: str, timeout: float = STOP_TIMEOUT) -> tuple[bool, str]:
+        """Stop a supervised service's whole process group: SIGTERM, then SIGKILL."""
+        proc = self._processes.get(name)
+        if proc is None or proc.pid is None:
+            return True, f"{name} was not running"
+
+        proc.stop_requested = True
+        pgid = proc.pid
+        was_alive = proc.alive or _group_alive(pgid)
+        if _group_alive(pgid):
+            os.killpg(pgid, signal.SIGTERM)
+            logger.info(f"Sent SIGTERM to {name} process group {pgid}")
+            deadline = time.monotonic() + timeout
+            while _group_alive(pgid) and time.monotonic() < deadline:
+                await asyncio.sleep(0.2)
+            if _group_alive(pgid):
+                logger.warning(f"{name} didn't terminate gracefully, using SIGKILL")
+                try:
+                    os.killpg(pgid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+        for task in proc.tasks:
+            if task is not asyncio.current_task():
+                task.cancel()
+        proc.state = ProcessState.STOPPED
+        return True, f"Stopped {name}" if was_alive else f"{name} was not running"
+
+    async def _detach(self, proc: SupervisedProcess) -> None:
+        """Leave a service running without the backend, its output still going to its log."""
+        proc.stop_requested = True
+        pump, *others = proc.tasks
+        for task in others:
+            task.cancel()
+        transport, reader = proc.output, proc.output_reader
+        if transport is None or transport.is_closing():
+            return
+        # Stop reading, write out what was already read, then give the pipe to a relay
+        transport.pause_reading()
+        relay_fd = os.dup(transport.get_extra_info("pipe").fileno())
+        reader.feed_eof()
+        await asyncio.gather(pump, return_exceptions=True)
+        try:
+            await subprocess_pool.run(_relay_output, relay_fd, log_path(proc.name))
+        except (OSError, PoolTimeout) as e:
+            logger.error(f"Failed to relay {proc.name} output: {e}")
+            return
+        logger.info(f"Left {proc.name} (PID {proc.pid}) running")
+
+    async def shutdown(self) -> None:
+        """Detach from (or, with SUPERVISOR_STOP_ON_EXIT=true, stop) every service when the backend exits."""
+        live = [proc for proc in self._processes.values() if proc.alive]
+        if STOP_ON_EXIT:
+            await asyncio.gather(*(self.stop(proc.name) for proc in live))
+        else:
+            await asyncio.gather(*(self._detach(proc) for proc in live))
+        for proc in self._processes.values():
+            if proc.log_handler:
+                proc.log_handler.close()
+
+
+supervisor = Supervisor()
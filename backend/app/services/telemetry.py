@@ -0,0 +1,109 @@
+"""Request, collector and subprocess timing for the /api/metrics endpoint."""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.histogram import Histogram
+from app.services.startup import startup
+
+# Route label for requests that matched no route, so 404 probes can't
+# create unbounded label values
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope: Scope) -> str:
+    """Route template for a request, the mount path for mounted apps, or UNMATCHED_ROUTE."""
+    # The router stores the match in the scope it was handed, which is ours
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope and scope.get("root_path"):
+        return scope["root_path"]
+    return UNMATCHED_ROUTE
+
+
+class Telemetry:
+    """
+    In-process counters and latency histograms.
+
+    Requests are keyed by method and route template (not the raw path),
+    collectors and subprocess calls by name, so label cardinality stays
+    bounded by the code rather than by traffic.
+    """
+
+    def __init__(self):
+        self.requests: dict[tuple[str, str], Histogram] = {}
+        self.responses: dict[tuple[str, str, int], int] = {}
+        self.timings: dict[tuple[str, str], Histogram] = {}
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def _get_histogram(self, table: dict, key: tuple) -> Histogram:
+        histogram = table.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = table.setdefault(key, Histogram())
+        return histogram
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        self._get_histogram(self.requests, (method, route)).observe(seconds)
+        key = (method, route, status)
+        with self._lock:
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+    def observe(self, kind: str, name: str, seconds: float) -> None:
+        """Record the duration of a collector ("collector") or command ("subprocess")."""
+        self._get_histogram(self.timings, (kind, name)).observe(seconds)
+
+    @contextmanager
+    def timer(self, kind: str, name: str) -> Iterator[None]:
+        """Time the enclosed block, including when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(kind, name, time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and in-flight count per route.
+
+    Latency is measured until the response body has been fully sent, so
+    streamed responses are timed end to end.
+    """
+
+    def __init__(self, app: ASGIApp, telemetry: "Telemetry"):
+        self.app = app
+        self.telemetry = telemetry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                startup.mark_first_response()
+            await send(message)
+
+        self.telemetry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.telemetry.in_flight -= 1
+            self.telemetry.observe_request(
+                scope["method"],
+                route_label(scope),
+                status,
+                time.perf_counter() - started,
+            )
+
+
+telemetry = Telemetry()
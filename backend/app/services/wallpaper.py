@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional
 from pydantic import BaseModel
 from fastapi import UploadFile
+from app.services.executor import filesystem_pool
 
 # Directories
 STATIC_DIR = Path(__file__).parent.parent.parent / "static"
@@ -82,7 +83,7 @@ def get_wallpaper_by_id(wallpaper_id: str) -> Optional[WallpaperInfo]:
 
 async def upload_wallpaper(file: UploadFile) -> WallpaperInfo:
     """Handle user wallpaper upload."""
-    ensure_directories()
+    await filesystem_pool.run(ensure_directories)
 
     # Generate unique filename
     ext = Path(file.filename).suffix.lower() if file.filename else '.jpg'
@@ -94,9 +95,8 @@ async def upload_wallpaper(file: UploadFile) -> WallpaperInfo:
     filepath = USER_WALLPAPERS_DIR / filename
 
     # Save the file
-    with open(filepath, 'wb') as f:
-        content = await file.read()
-        f.write(content)
+    content = await file.read()
+    await filesystem_pool.run(filepath.write_bytes, content)
 
     wallpaper_id = f"user-custom-{unique_id}"
     return WallpaperInfo(
@@ -0,0 +1,85 @@
+"""Alert evaluation benchmark: cost of one sampler tick with many rules.
+
+Builds N rules over a synthetic metric namespace shaped like a busy box
+(GPUs, mounts, containers, services) and times AlertEngine.evaluate() on
+fresh values each tick, excluding the one-off binding of rules to metrics.
+A third of the rules use rate conditions and a third a `for` duration;
+values drift within range with occasional spikes that fire alerts.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_alerts [--rules 500] [--ticks 2000]
+"""
+import argparse
+import random
+import statistics
+import time
+from app.services.alerts import AlertEngine, AlertRule
+
+
+def synthetic_metrics() -> dict[str, float]:
+    metrics = {"cpu.percent": 0.0, "cpu.temperature": 0.0, "memory.percent": 0.0}
+    for gpu in range(4):
+        for key in ("temperature", "utilization", "memory_percent", "power"):
+            metrics[f"gpu.{gpu}.{key}"] = 0.0
+    for mount in ("/", "/home", "/data", "/var/lib/docker"):
+        metrics[f"disk.{mount}.percent"] = 0.0
+    for container in range(50):
+        metrics[f"container.c{container}.running"] = 1.0
+    for service in range(30):
+        for key in ("up", "cpu_percent", "memory_rss", "restarts"):
+            metrics[f"service.s{service}.{key}"] = 0.0
+    return metrics
+
+
+def synthetic_rules(count: int, metrics: dict[str, float]) -> dict[str, AlertRule]:
+    names = list(metrics)
+    rules = {}
+    for i in range(count):
+        # Mostly exact names, with some globs spanning many series
+        metric = names[i % len(names)] if i % 50 else "container.*.running"
+        kind = i % 3
+        rules[f"rule{i}"] = AlertRule(
+            name=f"rule{i}",
+            metric=metric,
+            above=80 if kind != 1 else None,
+            rate_above=5 if kind == 1 else None,
+            for_seconds=30 if kind == 2 else 0,
+        )
+    return rules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=2000)
+    args = parser.parse_args()
+
+    metrics = synthetic_metrics()
+    engine = AlertEngine()
+    engine.rules = synthetic_rules(args.rules, metrics)
+    engine.evaluate(metrics, 0.0)
+
+    rng = random.Random(0)
+    keys = list(metrics)
+    timings = []
+    transitions = 0
+    for tick in range(1, args.ticks + 1):
+        # Values drift within the normal range, with occasional spikes
+        for key in keys:
+            value = metrics[key] + rng.gauss(0, 2)
+            metrics[key] = 95.0 if rng.random() < 0.001 else min(max(value, 0.0), 70.0)
+        started = time.perf_counter()
+        transitions += len(engine.evaluate(metrics, tick * 2.0))
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    print(f"{args.rules} rules, {len(engine._series)} series, {len(metrics)} metrics, {args.ticks} ticks")
+    print(f"median  {statistics.median(timings) * 1e6:8.1f} µs/tick")
+    print(f"p99     {timings[int(len(timings) * 0.99)] * 1e6:8.1f} µs/tick")
+    print(f"per series {statistics.median(timings) / len(engine._series) * 1e9:.0f} ns")
+    print(f"{transitions} transitions")
+
+
+if __name__ == "__main__":
+    main()
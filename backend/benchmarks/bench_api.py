@@ -0,0 +1,300 @@
+"""Load-test benchmark for the polled API endpoints.
+
+Starts the backend in a child process with psutil, NVML, docker and nmcli
+replaced by deterministic stubs (see benchmarks/stubs.py), then hammers
+each endpoint with concurrent polling clients. Reports p50/p90/p99
+latency, throughput and how far the server's event loop fell behind
+while serving (from its loop lag monitor), and saves the results as JSON
+under benchmarks/results/ named after the current commit so runs can be
+compared across commits.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_api [--clients 8] [--duration 5] [--etag]
+    python -m benchmarks.bench_api --compare benchmarks/results/<commit>.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+import httpx
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+DEFAULT_ENDPOINTS = [
+    "/api/system",
+    "/api/services",
+    "/api/docker/containers",
+    "/api/wifi",
+    "/api/network/status",
+    "/api/system/pressure",
+    "/api/metrics",
+]
+
+# Loop stalls longer than this (seconds) are counted while benchmarking
+LOOP_STALL_THRESHOLD = "0.05"
+
+
+def serve(args: argparse.Namespace) -> None:
+    """Child process: install stubs and run the app with uvicorn."""
+    import uvicorn
+
+    work_dir = Path(tempfile.mkdtemp(prefix="stonepie-bench-"))
+    from benchmarks import stubs
+    stubs.install(
+        work_dir,
+        containers=args.containers,
+        networks=args.networks,
+        cores=args.cores,
+        interfaces=args.interfaces,
+        connections=args.connections,
+        gpus=args.gpus,
+    )
+
+    # A fixed registry of services that aren't running
+    from app.services.registry import registry
+    registry.registry_file = work_dir / "services.yaml"
+    registry.projects_dir = work_dir
+    registry.registry_file.write_text(json.dumps({"services": {
+        f"Service{i}": {"path": f"Service{i}", "frontend_port": 39000 + i * 2, "backend_port": 39001 + i * 2}
+        for i in range(args.services)
+    }}))
+    registry.reload(force=True)
+
+    from app.main import app
+    from app.services.histogram import Histogram
+    from app.services.profiling import loop_monitor
+
+    @app.post("/bench/reset-loop", include_in_schema=False)
+    async def reset_loop():
+        loop_monitor.lag = Histogram()
+        loop_monitor.max_lag = 0.0
+        loop_monitor.stalls = 0
+        return {}
+
+    logging.getLogger("app.services.profiling").setLevel(logging.ERROR)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(sorted_values: list[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def _poller(client: httpx.AsyncClient, path: str, deadline: float, etag: bool,
+                  latencies: list[float], errors: list[int]) -> None:
+    """Poll one endpoint back-to-back until the deadline, like a dashboard tab."""
+    headers = {}
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            await response.aread()
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - started)
+        if response.status_code not in (200, 304):
+            errors.append(response.status_code)
+        if etag and "etag" in response.headers:
+            headers["If-None-Match"] = response.headers["etag"]
+
+
+async def bench_endpoint(client: httpx.AsyncClient, path: str, clients: int,
+                         duration: float, warmup: float, etag: bool) -> dict:
+    """Run `clients` concurrent pollers against one endpoint."""
+    await _run_pollers(client, path, clients, warmup, etag)
+    await client.post("/bench/reset-loop")
+
+    latencies, errors = await _run_pollers(client, path, clients, duration, etag)
+    loop = (await client.get("/api/debug/loop")).json()
+
+    latencies.sort()
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / duration, 1),
+        "p50_ms": ms(_percentile(latencies, 0.5)),
+        "p90_ms": ms(_percentile(latencies, 0.9)),
+        "p99_ms": ms(_percentile(latencies, 0.99)),
+        "max_ms": ms(latencies[-1] if latencies else None),
+        "loop_max_lag_ms": round(loop["max_lag_ms"], 3),
+        "loop_p99_lag_ms": loop["p99_lag_ms"],
+        "loop_stalls": loop["stalls"],
+    }
+
+
+async def _run_pollers(client: httpx.AsyncClient, path: str, clients: int,
+                       duration: float, etag: bool) -> tuple[list[float], list[int]]:
+    latencies: list[float] = []
+    errors: list[int] = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        _poller(client, path, deadline, etag, latencies, errors) for _ in range(clients)
+    ))
+    return latencies, errors
+
+
+async def run_benchmarks(base_url: str, args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        results = {}
+        for path in args.endpoints:
+            results[path] = await bench_endpoint(
+                client, path, args.clients, args.duration, args.warmup, args.etag
+            )
+            _print_row(path, results[path])
+        return results
+
+
+def _print_header() -> None:
+    print(f"{'endpoint':<26} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+          f"{'loop lag':>9} {'stalls':>6} {'errors':>6}")
+
+
+def _print_row(path: str, result: dict) -> None:
+    print(f"{path:<26} {result['throughput_rps']:>8.1f} {result['p50_ms'] or 0:>8.2f} "
+          f"{result['p90_ms'] or 0:>8.2f} {result['p99_ms'] or 0:>8.2f} "
+          f"{result['loop_max_lag_ms']:>7.1f}ms {result['loop_stalls']:>6} {result['errors']:>6}")
+
+
+def _git_commit() -> str:
+    """Short commit hash, suffixed with -dirty for uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True
+        ).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline_file: Path) -> None:
+    """Print per-endpoint changes against a saved result file."""
+    baseline = json.loads(baseline_file.read_text())
+    print(f"\nCompared with {baseline['commit']} ({baseline_file.name}):")
+    print(f"{'endpoint':<26} {'req/s':>10} {'p50':>10} {'p99':>10} {'loop lag':>10}")
+
+    def change(new, old) -> str:
+        if not new or not old:
+            return "n/a"
+        return f"{(new - old) / old * 100:+.0f}%"
+
+    for path, result in current["endpoints"].items():
+        old = baseline["endpoints"].get(path)
+        if old is None:
+            continue
+        print(f"{path:<26} {change(result['throughput_rps'], old['throughput_rps']):>10} "
+              f"{change(result['p50_ms'], old['p50_ms']):>10} "
+              f"{change(result['p99_ms'], old['p99_ms']):>10} "
+              f"{change(result['loop_max_lag_ms'], old['loop_max_lag_ms']):>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoints", nargs="+", default=DEFAULT_ENDPOINTS)
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent polling clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds measured per endpoint")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds per endpoint")
+    parser.add_argument("--etag", action="store_true", help="Send If-None-Match like the dashboard")
+    parser.add_argument("--output", type=Path, help="Result file (default: results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Saved result file to compare against")
+    # Stub sizes
+    parser.add_argument("--containers", type=int, default=50)
+    parser.add_argument("--networks", type=int, default=30)
+    parser.add_argument("--cores", type=int, default=20)
+    parser.add_argument("--interfaces", type=int, default=32)
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--gpus", type=int, default=1)
+    parser.add_argument("--services", type=int, default=6)
+    # Internal: run as the benchmarked server
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    port = _free_port()
+    stub_args = [
+        f"--{name}={getattr(args, name)}"
+        for name in ("containers", "networks", "cores", "interfaces", "connections", "gpus", "services")
+    ]
+    # Profiling enables the loop lag monitor; requests don't send X-Profile
+    env = {
+        **os.environ, "PROFILING_ENABLED": "true",
+        "LOOP_LAG_THRESHOLD": LOOP_STALL_THRESHOLD, "SAMPLER_INTERVAL": "2.0",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_api", "--serve", f"--port={port}", *stub_args],
+        cwd=Path(__file__).parent.parent,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/api/health", timeout=1)
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise SystemExit("Benchmark server failed to start")
+                time.sleep(0.2)
+
+        print(f"{args.clients} clients x {args.duration:.0f}s per endpoint"
+              f"{' with ETags' if args.etag else ''}\n")
+        _print_header()
+        endpoints = asyncio.run(run_benchmarks(base_url, args))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    commit = _git_commit()
+    result = {
+        "commit": commit,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("serve", "port", "output", "compare")
+        },
+        "endpoints": endpoints,
+    }
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
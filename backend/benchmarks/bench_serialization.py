@@ -0,0 +1,204 @@
+"""Serialization and compression benchmark for the heaviest polled endpoints.
+
+Compares the per-request CPU cost of FastAPI's default JSONResponse against
+ORJSONResponse, with and without gzip, on synthetic payloads sized like a
+busy host (many network interfaces, many Docker containers).
+
+It then compares JSON against the optional MessagePack and CBOR encodings
+(with typed arrays for numeric lists) on /api/system and
+/api/network/status payloads: body size, gzipped size, server encode time
+and client-side decode time.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_serialization [--interfaces 64] [--containers 200] [--cores 20]
+"""
+import argparse
+import gzip
+import time
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app.models import DiskIO, DiskUsage, SystemMetrics
+from app.routes.docker import ContainerInfo
+from app.routes.network import NetworkInterface, NetworkStats, NetworkStatus
+from app.services import encoding
+
+
+def build_network_status(count: int) -> NetworkStatus:
+    """Build a network status payload with `count` interfaces."""
+    interfaces = []
+    stats = []
+    for i in range(count):
+        name = f"veth{i:04x}"
+        interfaces.append(NetworkInterface(
+            name=name,
+            mac_address=f"02:42:ac:11:{i // 256:02x}:{i % 256:02x}",
+            ipv4_address=f"172.17.{i // 256}.{i % 256}",
+            ipv4_netmask="255.255.0.0",
+            ipv6_address=f"fd00::{i:x}",
+            is_up=True,
+            speed=10000,
+            mtu=1500,
+        ))
+        stats.append(NetworkStats(
+            interface=name,
+            bytes_sent=123456789 * (i + 1),
+            bytes_recv=987654321 * (i + 1),
+            packets_sent=123456 * (i + 1),
+            packets_recv=654321 * (i + 1),
+            errors_in=0,
+            errors_out=0,
+            drop_in=i,
+            drop_out=0,
+        ))
+    return NetworkStatus(
+        hostname="spark",
+        interfaces=interfaces,
+        stats=stats,
+        connections_count=512,
+        established_connections=128,
+    )
+
+
+def build_system_metrics(cores: int) -> SystemMetrics:
+    """Build a system metrics payload for a host with `cores` CPU cores."""
+    return SystemMetrics(
+        cpu_percent=37.4,
+        cpu_per_core=[round((i * 7.3) % 100, 1) for i in range(cores)],
+        cpu_count=cores,
+        memory_total=128 * 1024 ** 3,
+        memory_used=71 * 1024 ** 3,
+        memory_percent=55.5,
+        disk_total=4 * 1000 ** 4,
+        disk_used=3 * 1000 ** 4,
+        disk_percent=75.0,
+        gpu_name="NVIDIA GB10",
+        gpu_utilization=91.0,
+        gpu_temperature=71.0,
+        cpu_temperature=64.5,
+        disks=[
+            DiskUsage(mountpoint=f"/mnt/disk{i}", device=f"/dev/nvme{i}n1", fstype="ext4",
+                      total=2 * 1000 ** 4, used=1000 ** 4, free=1000 ** 4, percent=50.0)
+            for i in range(4)
+        ],
+        disk_io=[
+            DiskIO(device=f"nvme{i}n1", read_bytes_per_sec=1.5e6 * i, write_bytes_per_sec=2.5e5 * i,
+                   read_iops=120.0 * i, write_iops=40.0 * i, await_ms=0.4)
+            for i in range(4)
+        ],
+    )
+
+
+def build_containers(count: int) -> list[ContainerInfo]:
+    """Build a container list with `count` entries."""
+    return [
+        ContainerInfo(
+            id=f"{i:012x}",
+            name=f"stack_service_{i}",
+            image=f"registry.local/team/model-server:{i % 7}.0",
+            status=f"Up {i % 48} hours (healthy)",
+            state="running",
+            ports=[f"0.0.0.0:{8000 + i}->8000/tcp", f":::{8000 + i}->8000/tcp"],
+            created="2026-01-20 10:00:00 +0000 UTC",
+        )
+        for i in range(count)
+    ]
+
+
+def measure(label: str, render, iterations: int) -> float:
+    """Run `render` repeatedly and return CPU microseconds per call."""
+    render()  # warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        render()
+    elapsed = time.process_time() - start
+    per_call = elapsed / iterations * 1e6
+    print(f"  {label:<28} {per_call:10.1f} us/request")
+    return per_call
+
+
+def bench_payload(name: str, payload, iterations: int) -> None:
+    """Benchmark rendering one payload with each response class."""
+    content = jsonable_encoder(payload)
+    std_body = JSONResponse(content=content).body
+    fast_body = ORJSONResponse(content=content).body
+    print(f"\n{name}: {len(std_body)} bytes JSON, "
+          f"{len(gzip.compress(fast_body, 6))} bytes gzip")
+
+    std = measure("JSONResponse", lambda: JSONResponse(content=content), iterations)
+    fast = measure("ORJSONResponse", lambda: ORJSONResponse(content=content), iterations)
+    measure(
+        "ORJSONResponse + gzip",
+        lambda: gzip.compress(ORJSONResponse(content=content).body, 6),
+        iterations,
+    )
+    saved = std - fast
+    print(f"  CPU saved per request:       {saved:10.1f} us ({saved / std * 100:.0f}%)")
+
+
+def bench_binary(name: str, payload, iterations: int) -> None:
+    """Compare JSON with MessagePack and CBOR on size and encode/decode time."""
+    content = jsonable_encoder(payload)
+    json_body = orjson.dumps(content)
+    print(f"\n{name}")
+    print(f"  {'encoding':<10} {'bytes':>8} {'gzip':>8} {'encode us':>10} {'decode us':>10}")
+
+    def row(label: str, body: bytes, encode_call, decode_call) -> None:
+        encode_call()
+        decode_call()
+        start = time.process_time()
+        for _ in range(iterations):
+            encode_call()
+        encode_us = (time.process_time() - start) / iterations * 1e6
+        start = time.process_time()
+        for _ in range(iterations):
+            decode_call()
+        decode_us = (time.process_time() - start) / iterations * 1e6
+        print(f"  {label:<10} {len(body):>8} {len(gzip.compress(body, 6)):>8} {encode_us:>10.1f} {decode_us:>10.1f}")
+
+    # Encode time includes parsing the JSON body, as the middleware does
+    row("json", json_body, lambda: orjson.dumps(content), lambda: orjson.loads(json_body))
+    for kind, decode in (
+        ("msgpack", lambda body: encoding.msgpack.unpackb(body)),
+        ("cbor", lambda body: encoding.cbor2.loads(body)),
+    ):
+        if not encoding.available()[kind]:
+            print(f"  {kind:<10} (not installed)")
+            continue
+        body = encoding.encode(content, kind)
+        row(kind, body, lambda: encoding.encode(orjson.loads(json_body), kind), lambda: decode(body))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interfaces", type=int, default=64)
+    parser.add_argument("--containers", type=int, default=200)
+    parser.add_argument("--cores", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    bench_payload(
+        f"/api/network/status ({args.interfaces} interfaces)",
+        build_network_status(args.interfaces),
+        args.iterations,
+    )
+    bench_payload(
+        f"/api/docker/containers ({args.containers} containers)",
+        build_containers(args.containers),
+        args.iterations,
+    )
+    bench_binary(
+        f"/api/system ({args.cores} cores)",
+        build_system_metrics(args.cores),
+        args.iterations,
+    )
+    bench_binary(
+        f"/api/network/status ({args.interfaces} interfaces)",
+        build_network_status(args.interfaces),
+        args.iterations,
+    )
+
+
+if __name__ == "__main__":
+    main()
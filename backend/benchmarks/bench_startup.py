@@ -0,0 +1,147 @@
+"""Startup benchmark: import time and time to first response.
+
+Runs each measurement in a fresh interpreter several times and reports the
+median and best:
+
+- import: wall time of `python -c "import app.main"`
+- first response: from spawning uvicorn to the first successful
+  /api/health response, plus the backend's own view of the same from
+  /api/health/startup (measured from process creation)
+- subsystems: how long each background-initialized subsystem took
+
+Results are saved as JSON under benchmarks/results/ named
+startup-<commit>.json so runs can be compared across commits.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_startup [--runs 5]
+    python -m benchmarks.bench_startup --compare benchmarks/results/startup-<commit>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+import httpx
+from benchmarks.bench_api import RESULTS_DIR, _free_port, _git_commit
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Give up on a server that hasn't answered within this many seconds
+STARTUP_TIMEOUT = 30.0
+
+
+def measure_import() -> float:
+    """Seconds for a fresh interpreter to import the app."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import app.main"], cwd=BACKEND_DIR, check=True)
+    return time.perf_counter() - started
+
+
+def measure_first_response() -> dict:
+    """Spawn uvicorn and time the first successful health check."""
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "LOOP_LAG_THRESHOLD": "0"},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        while True:
+            try:
+                httpx.get(f"{base_url}/api/health", timeout=1)
+                break
+            except httpx.HTTPError:
+                if time.perf_counter() - started > STARTUP_TIMEOUT or server.poll() is not None:
+                    raise SystemExit("Backend failed to start")
+                time.sleep(0.01)
+        first_response = time.perf_counter() - started
+
+        # Wait for background initialization to settle
+        while True:
+            info = httpx.get(f"{base_url}/api/health/startup", timeout=5).json()
+            pending = [s for s in info["subsystems"] if s["state"] in ("pending", "initializing")]
+            if not pending or time.perf_counter() - started > STARTUP_TIMEOUT:
+                break
+            time.sleep(0.05)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    return {
+        "first_response": first_response,
+        "reported_import": info["import_seconds"],
+        "reported_first_response": info["first_response_seconds"],
+        "subsystems": {s["name"]: {"state": s["state"], "seconds": s["seconds"]} for s in info["subsystems"]},
+    }
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "best_ms": round(min(values) * 1000, 1),
+    }
+
+
+def compare(current: dict, baseline_file: Path) -> None:
+    """Print changes against a saved result file."""
+    baseline = json.loads(baseline_file.read_text())
+    print(f"\nCompared with {baseline['commit']} ({baseline_file.name}):")
+    for key in ("import", "first_response"):
+        new, old = current[key]["median_ms"], baseline.get(key, {}).get("median_ms")
+        change = f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+        print(f"{key:<16} {change:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--output", type=Path, help="Result file (default: results/startup-<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Saved result file to compare against")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    runs = [measure_first_response() for _ in range(args.runs)]
+
+    commit = _git_commit()
+    result = {
+        "commit": commit,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "runs": args.runs,
+        "import": _summary(imports),
+        "first_response": _summary([run["first_response"] for run in runs]),
+        "reported_import": _summary([run["reported_import"] for run in runs]),
+        "reported_first_response": _summary([
+            run["reported_first_response"] for run in runs if run["reported_first_response"] is not None
+        ] or [0.0]),
+        "subsystems": runs[-1]["subsystems"],
+    }
+
+    print(f"{'measurement':<26} {'median ms':>10} {'best ms':>10}")
+    for key in ("import", "first_response", "reported_import", "reported_first_response"):
+        print(f"{key:<26} {result[key]['median_ms']:>10.1f} {result[key]['best_ms']:>10.1f}")
+    print("\nSubsystems (last run):")
+    for name, status in result["subsystems"].items():
+        seconds = f"{status['seconds'] * 1000:.1f}ms" if status["seconds"] is not None else "-"
+        print(f"  {name:<12} {status['state']:<12} {seconds:>10}")
+
+    output = args.output or RESULTS_DIR / f"startup-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Deterministic stand-ins for psutil, NVML, docker and nmcli.
+
+Used by the API benchmark so results depend on the code under test rather
+than on the host it runs on. docker and nmcli are replaced by small shell
+scripts placed first on PATH, so the fork/exec cost of the real
+subprocess calls is still measured; psutil functions and NVML are
+replaced in-process with fixed data. Blocking behaviour is preserved:
+the psutil.cpu_percent stub still sleeps for the requested interval.
+"""
+import json
+import os
+import socket
+import stat
+import time
+from pathlib import Path
+from types import SimpleNamespace as NS
+import psutil
+
+
+class FakeNvml:
+    """Minimal pynvml stand-in reporting `count` identical GPUs."""
+
+    NVML_TEMPERATURE_GPU = 0
+    NVML_CLOCK_GRAPHICS = 0
+    NVML_CLOCK_MEM = 2
+    NVML_DEVICE_MIG_ENABLE = 1
+
+    def __init__(self, count: int = 1):
+        self.count = count
+
+    def nvmlInit(self):
+        pass
+
+    def nvmlDeviceGetCount(self):
+        return self.count
+
+    def nvmlDeviceGetHandleByIndex(self, index):
+        return index
+
+    def nvmlDeviceGetName(self, handle):
+        return "NVIDIA GB10"
+
+    def nvmlDeviceGetUUID(self, handle):
+        return f"GPU-0000000{handle}"
+
+    def nvmlDeviceGetMemoryInfo(self, handle):
+        return NS(total=128 * 1024 ** 3, used=42 * 1024 ** 3)
+
+    def nvmlDeviceGetEnforcedPowerLimit(self, handle):
+        return 240000
+
+    def nvmlDeviceGetMigMode(self, handle):
+        return (0, 0)
+
+    def nvmlDeviceGetUtilizationRates(self, handle):
+        return NS(gpu=73, memory=41)
+
+    def nvmlDeviceGetTemperature(self, handle, sensor):
+        return 64
+
+    def nvmlDeviceGetPowerUsage(self, handle):
+        return 151000
+
+    def nvmlDeviceGetClockInfo(self, handle, clock):
+        return 2400
+
+    def nvmlDeviceGetEncoderUtilization(self, handle):
+        return (0, 167000)
+
+    def nvmlDeviceGetDecoderUtilization(self, handle):
+        return (0, 167000)
+
+    def nvmlDeviceGetComputeRunningProcesses(self, handle):
+        return [NS(pid=4242, usedGpuMemory=30 * 1024 ** 3)]
+
+    def nvmlDeviceGetGraphicsRunningProcesses(self, handle):
+        return []
+
+
+def docker_ps_output(count: int) -> str:
+    """`docker ps --format json` output for `count` containers."""
+    lines = []
+    for i in range(count):
+        lines.append(json.dumps({
+            "ID": f"{i:064x}",
+            "Names": f"stack_service_{i}",
+            "Image": f"registry.local/team/model-server:{i % 7}.0",
+            "Status": f"Up {i % 48} hours (healthy)",
+            "State": "running" if i % 5 else "exited",
+            "Ports": f"0.0.0.0:{8000 + i}->8000/tcp, :::{8000 + i}->8000/tcp",
+            "CreatedAt": "2026-01-20 10:00:00 +0000 UTC",
+        }))
+    return "\n".join(lines) + "\n"
+
+
+def nmcli_wifi_output(count: int) -> str:
+    """`nmcli -t -f SSID,SIGNAL,SECURITY,IN-USE dev wifi list` output."""
+    lines = [f"Network-{i}:{90 - i % 80}:WPA2:{'*' if i == 0 else ''}" for i in range(count)]
+    return "\n".join(lines) + "\n"
+
+
+def write_commands(bin_dir: Path, containers: int, networks: int) -> None:
+    """Write fake `docker` and `nmcli` executables serving canned output."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    (bin_dir / "docker_ps.txt").write_text(docker_ps_output(containers))
+    (bin_dir / "docker_info.json").write_text(json.dumps({
+        "Containers": containers,
+        "ContainersRunning": containers - containers // 5,
+        "ContainersPaused": 0,
+        "ContainersStopped": containers // 5,
+        "Images": 42,
+        "ServerVersion": "27.0.0",
+        "Driver": "overlay2",
+        "MemTotal": 128 * 1024 ** 3,
+        "NCPU": 20,
+    }) + "\n")
+    (bin_dir / "nmcli_wifi.txt").write_text(nmcli_wifi_output(networks))
+    (bin_dir / "nmcli_active.txt").write_text("Network-0:802-11-wireless:wlan0\n")
+
+    scripts = {
+        "docker": (
+            '#!/bin/sh\n'
+            'DIR="$(dirname "$0")"\n'
+            'case "$1" in\n'
+            '  ps) cat "$DIR/docker_ps.txt" ;;\n'
+            '  info) cat "$DIR/docker_info.json" ;;\n'
+            '  *) echo "$2" ;;\n'
+            'esac\n'
+        ),
+        "nmcli": (
+            '#!/bin/sh\n'
+            'DIR="$(dirname "$0")"\n'
+            'case "$*" in\n'
+            '  *"wifi list"*) cat "$DIR/nmcli_wifi.txt" ;;\n'
+            '  *"connection show"*) cat "$DIR/nmcli_active.txt" ;;\n'
+            'esac\n'
+        ),
+    }
+    for name, body in scripts.items():
+        path = bin_dir / name
+        path.write_text(body)
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def patch_psutil(cores: int, interfaces: int, connections: int) -> None:
+    """Replace host-dependent psutil calls with fixed data of the given size."""
+    per_core = [float(10 + (i * 7) % 80) for i in range(cores)]
+
+    def cpu_percent(interval=None, percpu=False):
+        if interval:
+            time.sleep(interval)
+        return list(per_core) if percpu else sum(per_core) / cores
+
+    names = [f"veth{i:04x}" for i in range(interfaces)]
+    addrs = {
+        name: [
+            NS(family=socket.AF_INET, address=f"172.17.{i // 256}.{i % 256}", netmask="255.255.0.0"),
+            NS(family=psutil.AF_LINK, address=f"02:42:ac:11:{i // 256:02x}:{i % 256:02x}", netmask=None),
+        ]
+        for i, name in enumerate(names)
+    }
+    stats = {name: NS(isup=True, speed=10000, mtu=1500) for name in names}
+    io = {
+        name: NS(bytes_sent=i * 1000, bytes_recv=i * 2000, packets_sent=i, packets_recv=i,
+                 errin=0, errout=0, dropin=0, dropout=0)
+        for i, name in enumerate(names)
+    }
+    conns = [
+        NS(
+            fd=-1, family=socket.AF_INET, type=socket.SOCK_STREAM,
+            laddr=NS(ip="127.0.0.1", port=20000 + i), raddr=NS(ip="10.0.0.2", port=443),
+            status="ESTABLISHED" if i % 3 else "LISTEN", pid=None,
+        )
+        for i in range(connections)
+    ]
+    memory = NS(total=128 * 1024 ** 3, available=80 * 1024 ** 3, used=48 * 1024 ** 3, percent=37.5)
+
+    psutil.cpu_percent = cpu_percent
+    psutil.cpu_count = lambda logical=True: cores
+    psutil.virtual_memory = lambda: memory
+    psutil.net_if_addrs = lambda: addrs
+    psutil.net_if_stats = lambda: stats
+    psutil.net_io_counters = lambda pernic=False: io if pernic else NS(**{
+        field: sum(getattr(c, field) for c in io.values()) for field in vars(next(iter(io.values())))
+    })
+    psutil.net_connections = lambda kind="inet": conns
+
+
+def install(work_dir: Path, containers: int, networks: int, cores: int,
+            interfaces: int, connections: int, gpus: int) -> None:
+    """Install every stub; must run before the app is imported."""
+    bin_dir = work_dir / "bin"
+    write_commands(bin_dir, containers, networks)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+    patch_psutil(cores, interfaces, connections)
+
+    from app.services import metrics
+    # Initialized in the background at startup like real NVML
+    metrics.gpu_collector.nvml = FakeNvml(gpus)
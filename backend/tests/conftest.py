@@ -0,0 +1,8 @@
+"""Keep tests from writing into the real data directory."""
+import pytest
+from app.services.registry import registry
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_registry(tmp_path_factory):
+    registry.registry_file = tmp_path_factory.mktemp("data") / "services.yaml"
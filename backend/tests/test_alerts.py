@@ -0,0 +1,42 @@
+"""Alert metric collection tests."""
+import subprocess
+from app.models import ServiceResources
+from app.services import alerts
+from app.services.container_stats import ContainerStatsHistory
+from app.services.registry import ServiceConfig
+
+
+class FakeRegistry:
+    def all(self):
+        return {name: ServiceConfig(name=name, path=f"/srv/{name}") for name in ("web", "worker")}
+
+
+def test_container_and_service_metrics_come_from_sampled_state(monkeypatch):
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("alert collection ran a subprocess")
+
+    monkeypatch.setattr(subprocess, "run", no_subprocess)
+    monkeypatch.setattr(subprocess, "Popen", no_subprocess)
+
+    history = ContainerStatsHistory()
+    history.record(
+        {"aaaaaaaaaaaa": ("db", (0.0, 1.0, 100, 1.0, 0, 0))},
+        {"aaaaaaaaaaaa": "db", "bbbbbbbbbbbb": "cache"},
+    )
+    monkeypatch.setattr(alerts, "container_stats", history)
+    monkeypatch.setattr(alerts, "registry", FakeRegistry())
+    monkeypatch.setattr(alerts, "get_service_resources", lambda: {
+        "web": ServiceResources(pids=[1], cpu_percent=12.5, memory_rss=2048, timestamp=0.0),
+    })
+
+    metrics = alerts.collect_alert_metrics({"container", "service"})
+    assert metrics == {
+        "container.db.running": 1.0,
+        "container.cache.running": 0.0,
+        "service.web.up": 1.0,
+        "service.web.restarts": 0,
+        "service.web.cpu_percent": 12.5,
+        "service.web.memory_rss": 2048,
+        "service.worker.up": 0.0,
+        "service.worker.restarts": 0,
+    }
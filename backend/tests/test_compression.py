@@ -0,0 +1,35 @@
+"""Compression is skipped for proxied app responses."""
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from app.services.compression import CompressionMiddleware
+
+BODY = "data: tick\n\n" * 500
+
+
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, compressor=lambda inner: GZipMiddleware(inner, minimum_size=100))
+
+    @app.get("/api/big")
+    def big():
+        return PlainTextResponse(BODY)
+
+    @app.get("/apps/svc/events")
+    def events():
+        return StreamingResponse(iter([BODY]), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_api_responses_are_compressed():
+    response = client().get("/api/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == BODY
+
+
+def test_proxied_app_responses_pass_through():
+    response = client().get("/apps/svc/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == BODY
@@ -0,0 +1,23 @@
+"""Sampling profile route tests."""
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.routes import debug
+from app.services.executor import filesystem_pool
+
+
+def test_overlapping_profiles_are_rejected(monkeypatch):
+    monkeypatch.setattr(debug, "PROFILING_ENABLED", True)
+
+    async def run():
+        first = asyncio.create_task(debug.sample_profile(seconds=0.5, interval=0.01))
+        await asyncio.sleep(0.05)
+        # The shared pools stay free while the profile runs
+        assert filesystem_pool.active == 0
+        with pytest.raises(HTTPException) as rejected:
+            await debug.sample_profile(seconds=0.5, interval=0.01)
+        assert rejected.value.status_code == 409
+        await first
+        return await debug.sample_profile(seconds=0.1, interval=0.01)
+
+    assert isinstance(asyncio.run(run()), str)
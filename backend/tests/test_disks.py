@@ -0,0 +1,51 @@
+"""MountUsageCache tests with a hung mount."""
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from app.services import disks
+from app.services.disks import MountUsageCache
+
+
+@pytest.fixture
+def hung_mount(monkeypatch):
+    """`/` answers statvfs at once; `/mnt/nfs` hangs until released."""
+    release = threading.Event()
+
+    def disk_usage(mountpoint):
+        if mountpoint == "/mnt/nfs":
+            release.wait()
+        return SimpleNamespace(total=100, used=40, free=60, percent=40.0)
+
+    monkeypatch.setattr(disks, "list_mounts", lambda: [
+        SimpleNamespace(mountpoint="/", device="/dev/sda1", fstype="ext4"),
+        SimpleNamespace(mountpoint="/mnt/nfs", device="server:/export", fstype="nfs4"),
+    ])
+    monkeypatch.setattr(disks.psutil, "disk_usage", disk_usage)
+    yield release
+    release.set()
+
+
+def test_hung_mount_is_reported_unresponsive(hung_mount):
+    cache = MountUsageCache(ttl=0, timeout=0.1)
+    usage = {disk.mountpoint: disk for disk in cache.refresh()}
+    assert usage["/"].total == 100 and usage["/"].responsive
+    assert usage["/mnt/nfs"].total == 0 and not usage["/mnt/nfs"].responsive
+
+    hung_mount.set()
+    time.sleep(0.05)
+    usage = {disk.mountpoint: disk for disk in cache.refresh()}
+    assert usage["/mnt/nfs"].total == 100 and usage["/mnt/nfs"].responsive
+
+
+def test_callers_do_not_queue_behind_a_hung_mount(hung_mount):
+    cache = MountUsageCache(ttl=60, timeout=1.0)
+    first = threading.Thread(target=cache.refresh)
+    first.start()
+    time.sleep(0.1)
+
+    # The first refresh is still waiting on /mnt/nfs; this one returns the cache at once
+    started = time.monotonic()
+    cache.refresh()
+    assert time.monotonic() - started < 0.5
+    first.join()
@@ -0,0 +1,53 @@
+"""Typed array encoding tests."""
+import array
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.services.encoding import (
+    FLOAT32_LE, FLOAT64_LE, MSGPACK_AVAILABLE, SINT64_LE, UINT32_LE,
+    BinaryEncodingMiddleware, with_typed_arrays,
+)
+
+
+def typed(values: list) -> tuple[int, list]:
+    """Element type and decoded values of a list sent as a typed array."""
+    code, data = with_typed_arrays(values, lambda code, data: (code, data))
+    decoded = array.array({UINT32_LE: "I", SINT64_LE: "q", FLOAT32_LE: "f", FLOAT64_LE: "d"}[code])
+    decoded.frombytes(data)
+    return code, decoded.tolist()
+
+
+def test_exact_floats_use_float32():
+    values = [0.0, 0.5, 12.25, 100.0]
+    assert typed(values) == (FLOAT32_LE, values)
+
+
+def test_inexact_floats_keep_float64_precision():
+    for values in ([12.3, 45.6, 7.8, 9.1], [0.5, 0.25, 1.5, 1234567.8]):
+        assert typed(values) == (FLOAT64_LE, values)
+
+
+def test_integers():
+    assert typed([1, 2, 3, 2 ** 32 - 1]) == (UINT32_LE, [1, 2, 3, 2 ** 32 - 1])
+    assert typed([-1, 2, 3, 2 ** 40]) == (SINT64_LE, [-1, 2, 3, 2 ** 40])
+
+
+def test_short_mixed_and_huge_lists_stay_plain():
+    for values in ([1.5, 2.5], [1, "a", 2, 3], [1, 2, 3, 2 ** 70]):
+        assert with_typed_arrays(values, lambda code, data: (code, data)) == values
+
+
+def test_every_response_varies_on_accept():
+    app = FastAPI()
+    app.add_middleware(BinaryEncodingMiddleware)
+
+    @app.get("/api/data")
+    def data():
+        return {"values": [1, 2, 3, 4]}
+
+    client = TestClient(app)
+    accepts = ["application/json", "*/*"]
+    if MSGPACK_AVAILABLE:
+        accepts.append("application/msgpack")
+    for accept in accepts:
+        response = client.get("/api/data", headers={"Accept": accept})
+        assert "accept" in response.headers["vary"].lower(), accept
@@ -0,0 +1,153 @@
+"""Federation polling tests against local httpx stand-ins for peer backends."""
+import asyncio
+import httpx
+from app.services.federation import PEER_ENDPOINTS, Federation, parse_peers
+
+
+class FakePeer:
+    """Serves fixed snapshots with ETags and answers If-None-Match with 304."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.down = False
+        self.broken = False
+        self.version = 1
+        self.requests: list[httpx.Request] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.down:
+            raise httpx.ConnectError("Connection refused", request=request)
+        if self.broken:
+            raise KeyError("version")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        etag = f'"{request.url.path}-{self.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, json={"path": request.url.path, "version": self.version}, headers={"ETag": etag})
+
+
+def federation(peer: FakePeer, timeout: float = 1.0) -> Federation:
+    return Federation([("spark2", "http://spark2:8021")], timeout=timeout, transport=httpx.MockTransport(peer))
+
+
+def test_parse_peers():
+    assert parse_peers("spark2=http://spark2.local:8021/, http://spark3:8021,") == [
+        ("spark2", "http://spark2.local:8021"),
+        ("spark3", "http://spark3:8021"),
+    ]
+
+
+def test_poll_stores_snapshots_and_revalidates_with_etags():
+    peer = FakePeer()
+    fed = federation(peer)
+
+    async def run():
+        await fed.poll(fed.peers[0])
+        first = len(peer.requests)
+        await fed.poll(fed.peers[0])
+        revalidated = peer.requests[first:]
+        peer.version = 2
+        await fed.poll(fed.peers[0])
+        await fed.stop()
+        return revalidated
+
+    revalidated = asyncio.run(run())
+    assert [r.headers["if-none-match"] for r in revalidated] == [f'"{path}-1"' for path in PEER_ENDPOINTS]
+    assert fed.peers[0].online
+    assert fed.snapshots("/api/system") == [("spark2", {"path": "/api/system", "version": 2})]
+    assert fed.status()[0].latency_ms is not None
+
+
+def test_unchanged_snapshot_keeps_data_on_304():
+    peer = FakePeer()
+    fed = federation(peer)
+
+    async def run():
+        await fed.poll(fed.peers[0])
+        await fed.poll(fed.peers[0])
+        await fed.stop()
+
+    asyncio.run(run())
+    assert fed.snapshots("/api/services") == [("spark2", {"path": "/api/services", "version": 1})]
+
+
+def test_slow_peer_times_out_and_goes_offline():
+    fed = federation(FakePeer(delay=1.0), timeout=0.1)
+
+    async def run():
+        await fed.poll(fed.peers[0])
+        await fed.stop()
+
+    asyncio.run(run())
+    status = fed.status()[0]
+    assert not status.online
+    assert status.error
+    assert fed.snapshots("/api/system") == []
+
+
+def test_unreachable_peer_is_offline_and_left_out_of_merged_views():
+    peer = FakePeer()
+    fed = federation(peer)
+
+    async def run():
+        await fed.poll(fed.peers[0])
+        assert fed.snapshots("/api/docker/containers")
+        peer.down = True
+        await fed.poll(fed.peers[0])
+        offline = (fed.status()[0], fed.snapshots("/api/docker/containers"))
+        peer.down = False
+        await fed.poll(fed.peers[0])
+        await fed.stop()
+        return offline
+
+    status, merged = asyncio.run(run())
+    assert not status.online
+    assert "Connection refused" in status.error
+    assert merged == []
+    # Back online on the next successful poll
+    assert fed.peers[0].online and fed.status()[0].error is None
+
+
+def test_each_peer_polls_independently():
+    slow, fast = FakePeer(delay=1.0), FakePeer()
+
+    def route(request: httpx.Request):
+        return (slow if request.url.host == "slow" else fast)(request)
+
+    fed = Federation(
+        [("slow", "http://slow:8021"), ("fast", "http://fast:8021")],
+        interval=0.05, timeout=0.2, transport=httpx.MockTransport(route),
+    )
+
+    async def run():
+        fed.start()
+        await asyncio.sleep(0.15)
+        await fed.stop()
+
+    asyncio.run(run())
+    online = {peer.name: peer.online for peer in fed.peers}
+    assert online == {"slow": False, "fast": True}
+    assert len(fast.requests) >= 2 * len(PEER_ENDPOINTS)
+
+
+def test_unexpected_error_marks_peer_offline_and_polling_continues():
+    peer = FakePeer()
+    peer.broken = True
+    fed = Federation([("spark2", "http://spark2:8021")], interval=0.02, transport=httpx.MockTransport(peer))
+
+    async def run():
+        fed.start()
+        await asyncio.sleep(0.1)
+        broken = fed.status()[0]
+        peer.broken = False
+        await asyncio.sleep(0.1)
+        await fed.stop()
+        return broken
+
+    broken = asyncio.run(run())
+    assert not broken.online
+    assert "version" in broken.error
+    # The polling task survived and picked the peer back up
+    assert fed.peers[0].online
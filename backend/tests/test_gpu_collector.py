@@ -0,0 +1,184 @@
+"""GpuCollector tests against a fake NVML binding."""
+from types import SimpleNamespace
+import pytest
+from app.services.metrics import GpuCollector
+
+
+class NVMLError(Exception):
+    pass
+
+
+class FakeNvml:
+    """Minimal pynvml stand-in: `gpus` maps index to a dict of device properties."""
+
+    NVML_DEVICE_MIG_ENABLE = 1
+    NVML_TEMPERATURE_GPU = 0
+    NVML_CLOCK_GRAPHICS = 0
+    NVML_CLOCK_MEM = 2
+
+    def __init__(self, gpus: dict, count: int | None = None):
+        self.gpus = gpus
+        self.count = len(gpus) if count is None else count
+
+    def nvmlInit(self):
+        pass
+
+    def nvmlDeviceGetCount(self):
+        return self.count
+
+    def nvmlDeviceGetHandleByIndex(self, index):
+        if index not in self.gpus:
+            raise NVMLError("GPU is lost")
+        return self.gpus[index]
+
+    def _get(self, handle, key):
+        value = handle.get(key)
+        if value is None or isinstance(value, Exception):
+            raise value or NVMLError("Not Supported")
+        return value
+
+    def nvmlDeviceGetName(self, handle):
+        return self._get(handle, "name")
+
+    def nvmlDeviceGetUUID(self, handle):
+        return self._get(handle, "uuid")
+
+    def nvmlDeviceGetMemoryInfo(self, handle):
+        total, used = self._get(handle, "memory")
+        return SimpleNamespace(total=total, used=used)
+
+    def nvmlDeviceGetEnforcedPowerLimit(self, handle):
+        return self._get(handle, "power_limit")
+
+    def nvmlDeviceGetPowerUsage(self, handle):
+        return self._get(handle, "power")
+
+    def nvmlDeviceGetUtilizationRates(self, handle):
+        return SimpleNamespace(gpu=self._get(handle, "utilization"), memory=0)
+
+    def nvmlDeviceGetTemperature(self, handle, sensor):
+        return self._get(handle, "temperature")
+
+    def nvmlDeviceGetClockInfo(self, handle, clock):
+        return self._get(handle, "clock")
+
+    def nvmlDeviceGetEncoderUtilization(self, handle):
+        return (self._get(handle, "encoder"), 0)
+
+    def nvmlDeviceGetDecoderUtilization(self, handle):
+        return (self._get(handle, "decoder"), 0)
+
+    def nvmlDeviceGetMigMode(self, handle):
+        return (self._get(handle, "mig_mode"), 0)
+
+    def nvmlDeviceGetMaxMigDeviceCount(self, handle):
+        return len(self._get(handle, "mig"))
+
+    def nvmlDeviceGetMigDeviceHandleByIndex(self, handle, index):
+        child = self._get(handle, "mig")[index]
+        if child is None:
+            raise NVMLError("Not Found")
+        return child
+
+    def nvmlDeviceGetComputeRunningProcesses(self, handle):
+        return self._get(handle, "compute")
+
+    def nvmlDeviceGetGraphicsRunningProcesses(self, handle):
+        return self._get(handle, "graphics")
+
+
+def proc(pid: int, used: int | None):
+    return SimpleNamespace(pid=pid, usedGpuMemory=used)
+
+
+def gpu(**overrides) -> dict:
+    device = {
+        "name": "NVIDIA Test", "uuid": "GPU-0", "memory": (16_000, 4_000),
+        "power_limit": 300_000, "power": 150_000, "utilization": 50, "temperature": 60,
+        "clock": 1500, "encoder": 0, "decoder": 0, "mig_mode": 0, "compute": [], "graphics": [],
+    }
+    device.update(overrides)
+    return device
+
+
+def collector(nvml: FakeNvml) -> GpuCollector:
+    gpus = GpuCollector(nvml)
+    assert gpus.init()
+    return gpus
+
+
+def test_sample_reads_static_and_dynamic_metrics():
+    [metrics] = collector(FakeNvml({0: gpu()})).sample()
+    assert metrics.name == "NVIDIA Test"
+    assert metrics.memory_percent == 25.0
+    assert metrics.power_draw == 150.0
+    assert metrics.power_limit == 300.0
+
+
+def test_missing_handle_skips_device():
+    gpus = collector(FakeNvml({1: gpu(uuid="GPU-1")}, count=2))
+    assert [metrics.index for metrics in gpus.sample()] == [1]
+
+
+def test_no_handles_means_unavailable():
+    gpus = GpuCollector(FakeNvml({}, count=1))
+    assert not gpus.init()
+    assert gpus.sample() == []
+    assert gpus.process_memory() == {}
+
+
+def test_unsupported_queries_return_none():
+    [metrics] = collector(FakeNvml({0: gpu(power=None, temperature=NVMLError("Not Supported"))})).sample()
+    assert metrics.power_draw is None
+    assert metrics.temperature is None
+    assert metrics.utilization == 50
+
+
+def test_mig_children_are_enumerated_and_sampled():
+    children = [
+        {"uuid": "MIG-0", "name": "1g.10gb", "memory": (10_000, 1_000)},
+        None,
+        {"uuid": "MIG-2", "name": "1g.10gb", "memory": NVMLError("Not Supported")},
+    ]
+    [metrics] = collector(FakeNvml({0: gpu(mig_mode=1, mig=children)})).sample()
+    assert [(mig.index, mig.uuid) for mig in metrics.mig_instances] == [(0, "MIG-0"), (2, "MIG-2")]
+    assert metrics.mig_instances[0].memory_used == 1_000
+    assert metrics.mig_instances[1].memory_total is None
+
+
+def test_mig_disabled_has_no_instances():
+    [metrics] = collector(FakeNvml({0: gpu(mig_mode=0, mig=[{"uuid": "MIG-0"}])})).sample()
+    assert metrics.mig_instances == []
+
+
+def test_process_query_errors_leave_other_lists():
+    nvml = FakeNvml({0: gpu(compute=NVMLError("Insufficient Permissions"), graphics=[proc(7, 100)])})
+    [metrics] = collector(nvml).sample()
+    assert [(p.pid, p.used_memory) for p in metrics.processes] == [(7, 100)]
+
+
+def test_process_query_errors_on_every_list():
+    nvml = FakeNvml({0: gpu(compute=NVMLError("Unknown"), graphics=NVMLError("Unknown"))})
+    gpus = collector(nvml)
+    assert gpus.sample()[0].processes == []
+    assert gpus.process_memory() == {}
+
+
+def test_process_in_both_lists_is_counted_once():
+    nvml = FakeNvml({0: gpu(compute=[proc(7, 500), proc(8, None)], graphics=[proc(7, 500), proc(8, 200)])})
+    gpus = collector(nvml)
+    assert gpus.process_memory() == {7: 500, 8: 200}
+
+
+def test_process_memory_sums_across_devices():
+    nvml = FakeNvml({
+        0: gpu(compute=[proc(7, 500)]),
+        1: gpu(uuid="GPU-1", compute=[proc(7, 300)], graphics=[proc(7, 300)]),
+    })
+    assert collector(nvml).process_memory() == {7: 800}
+
+
+@pytest.mark.parametrize("name", [b"NVIDIA Bytes", "NVIDIA Bytes"])
+def test_byte_strings_are_decoded(name):
+    [metrics] = collector(FakeNvml({0: gpu(name=name)})).sample()
+    assert metrics.name == "NVIDIA Bytes"
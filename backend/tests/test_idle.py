@@ -0,0 +1,92 @@
+"""Idle scale-to-zero tests with stand-ins for the service control calls."""
+import asyncio
+import socket
+import time
+import pytest
+from app.models import ServiceStatus
+from app.services import idle
+from app.services.idle import IdleManager
+from app.services.process import is_sleeping, release_ports
+from app.services.registry import ServiceConfig
+
+
+@pytest.fixture
+def busy_port():
+    """A port some other process is still listening on."""
+    sock = socket.socket()
+    sock.bind(("0.0.0.0", 0))
+    sock.listen()
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+@pytest.fixture
+def config(busy_port):
+    yield ServiceConfig(name="svc", path="/nonexistent", backend_port=busy_port, idle_timeout=60)
+    release_ports("svc")
+
+
+def stop_result(monkeypatch, success: bool, message: str) -> None:
+    async def stop_service(name):
+        return success, message
+    monkeypatch.setattr(idle, "stop_service", stop_service)
+
+
+def test_failed_stop_leaves_service_awake(config, monkeypatch):
+    stop_result(monkeypatch, False, "Permission denied")
+    asyncio.run(IdleManager()._put_to_sleep(config))
+    assert not is_sleeping("svc")
+
+
+def test_unbindable_ports_leave_service_awake(config, monkeypatch):
+    # Stopped, but the port is still taken (e.g. by an unmanaged process)
+    stop_result(monkeypatch, True, "Stopped svc")
+    asyncio.run(IdleManager()._put_to_sleep(config))
+    assert not is_sleeping("svc")
+
+
+class FakeSampler:
+    def __init__(self, samples: list[tuple[float, dict]]):
+        self.samples = samples
+
+    def history(self, name, seconds=None):
+        cutoff = time.time() - seconds
+        return [sample for sample in self.samples if sample[0] >= cutoff]
+
+
+class FakeRegistry:
+    def __init__(self, config: ServiceConfig):
+        self.config = config
+
+    def all(self):
+        return {self.config.name: self.config}
+
+
+def run_check(monkeypatch, config: ServiceConfig, samples: list[tuple[float, dict]]) -> list[str]:
+    """Names put to sleep by one check of a service idle since well before its timeout."""
+    slept = []
+
+    async def put_to_sleep(config):
+        slept.append(config.name)
+
+    monkeypatch.setattr(idle, "sampler", FakeSampler(samples))
+    monkeypatch.setattr(idle, "registry", FakeRegistry(config))
+    monkeypatch.setattr(idle, "get_service_status", lambda config: (ServiceStatus.RUNNING, True, True))
+    manager = IdleManager()
+    manager._last_active["svc"] = time.time() - 2 * config.idle_timeout
+    monkeypatch.setattr(manager, "_put_to_sleep", put_to_sleep)
+    asyncio.run(manager.check())
+    return slept
+
+
+def test_connections_between_checks_count_as_activity(config, monkeypatch):
+    now = time.time()
+    # A short request seen in an earlier sample; the latest sample is empty
+    samples = [(now - 8, {"svc": 0}), (now - 6, {"svc": 1}), (now - 1, {"svc": 0})]
+    assert run_check(monkeypatch, config, samples) == []
+
+
+def test_no_connections_in_window_is_idle(config, monkeypatch):
+    now = time.time()
+    samples = [(now - idle.IDLE_CHECK_INTERVAL - 5, {"svc": 3}), (now - 1, {"svc": 0})]
+    assert run_check(monkeypatch, config, samples) == ["svc"]
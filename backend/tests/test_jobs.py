@@ -0,0 +1,37 @@
+"""JobManager and prune request tests."""
+import asyncio
+import pytest
+from pydantic import ValidationError
+from app.models import JobState
+from app.routes.docker import PruneRequest
+from app.services.jobs import JobConflict, JobManager
+
+
+def test_same_running_job_is_shared_and_different_params_conflict():
+    async def run():
+        jobs = JobManager()
+        release = asyncio.Event()
+
+        async def action():
+            await release.wait()
+            return {"ok": True}
+
+        first = jobs.submit("prune", action, {"targets": ["images"]})
+        assert jobs.submit("prune", action, {"targets": ["images"]}) is first
+        with pytest.raises(JobConflict):
+            jobs.submit("prune", action, {"targets": ["volumes"]})
+        release.set()
+        await asyncio.sleep(0.01)
+        assert first.state == JobState.SUCCEEDED
+        # Finished jobs don't block new ones
+        second = jobs.submit("prune", action, {"targets": ["volumes"]})
+        assert second is not first
+        await jobs.stop()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("body", [{}, {"targets": []}, {"targets": ["everything"]}])
+def test_prune_requires_explicit_targets(body):
+    with pytest.raises(ValidationError):
+        PruneRequest(**body)
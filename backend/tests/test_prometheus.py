@@ -0,0 +1,47 @@
+"""Prometheus exposition format tests."""
+from app.services.histogram import Histogram
+from app.services.prometheus import Exposition, render_metrics
+
+
+def families(text: str) -> list[str]:
+    """Metric family of each sample line, in order."""
+    names = []
+    for line in text.splitlines():
+        if line.startswith("#") or not line:
+            continue
+        name = line.split("{")[0].split(" ")[0]
+        for suffix in ("_bucket", "_sum", "_count"):
+            if name.endswith(suffix) and name[:-len(suffix)] in text:
+                name = name[:-len(suffix)]
+        names.append(name)
+    return names
+
+
+def assert_contiguous(text: str) -> None:
+    seen = []
+    for name in families(text):
+        if not seen or seen[-1] != name:
+            assert name not in seen, f"{name} samples are not contiguous"
+            seen.append(name)
+
+
+def test_interleaved_samples_are_grouped_by_family():
+    out = Exposition()
+    for pool in ("a", "b"):
+        out.sample("pool_workers", "gauge", "Workers", 4, {"pool": pool})
+        out.sample("pool_active", "gauge", "Active", 1, {"pool": pool})
+        out.histogram("pool_wait_seconds", "Wait", Histogram(), {"pool": pool})
+    text = out.render()
+    assert_contiguous(text)
+    assert text.count("# TYPE stonepie_pool_workers gauge") == 1
+    assert text.index('pool_workers{pool="b"}') < text.index("# HELP stonepie_pool_active")
+
+
+def test_none_values_are_skipped():
+    out = Exposition()
+    out.sample("disk_total_bytes", "gauge", "Size", None, {"mountpoint": "/"})
+    assert out.render() == ""
+
+
+def test_rendered_metrics_are_contiguous():
+    assert_contiguous(render_metrics())
@@ -0,0 +1,38 @@
+"""Service registry reload tests."""
+import asyncio
+import threading
+import time
+from app.services import registry as registry_module
+from app.services.registry import ServiceRegistry
+
+
+def test_started_registry_reloads_off_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_module, "RELOAD_CHECK_INTERVAL", 0.05)
+    registry_file = tmp_path / "services.yaml"
+    registry_file.write_text("services:\n  one:\n    path: /srv/one\n")
+    registry = ServiceRegistry(registry_file, projects_dir=tmp_path)
+    reload_threads = []
+    reload = registry.reload
+
+    def tracked_reload(force=False):
+        reload_threads.append(threading.current_thread())
+        reload(force)
+
+    registry.reload = tracked_reload
+
+    async def run():
+        await registry.start()
+        try:
+            assert list(registry.all()) == ["one"]
+            time.sleep(0.01)  # Keep the new file's mtime apart from the old one
+            registry_file.write_text("services:\n  two:\n    path: /srv/two\n")
+            deadline = time.monotonic() + 5
+            while list(registry.all()) != ["two"]:
+                assert time.monotonic() < deadline, "registry never reloaded"
+                await asyncio.sleep(0.02)
+        finally:
+            await registry.stop()
+
+    asyncio.run(run())
+    assert reload_threads
+    assert threading.main_thread() not in reload_threads
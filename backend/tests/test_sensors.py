@@ -0,0 +1,58 @@
+"""TemperatureSensors tests against a fake hwmon/thermal tree."""
+import os
+from app.models import TemperatureReading
+from app.services import sensors
+from app.services.sensors import TemperatureSensors, cpu_temperature
+
+
+def write_chip(hwmon, entry: str, name: str, temps: dict[str, int]) -> None:
+    chip = hwmon / entry
+    chip.mkdir(parents=True)
+    (chip / "name").write_text(f"{name}\n")
+    for prefix, millidegrees in temps.items():
+        (chip / f"{prefix}_input").write_text(f"{millidegrees}\n")
+
+
+def reading(kind: str, current: float) -> TemperatureReading:
+    return TemperatureReading(chip="chip", label="label", kind=kind, current=current)
+
+
+def test_cpu_temperature_prefers_package_then_cores():
+    assert cpu_temperature([reading("core", 50), reading("package", 60), reading("package", 70)]) == 70
+    assert cpu_temperature([reading("core", 50), reading("core", 60), reading("other", 90)]) == 55
+
+
+def test_cpu_temperature_falls_back_to_first_other():
+    assert cpu_temperature([reading("nvme", 40), reading("other", 45), reading("other", 80)]) == 45
+    assert cpu_temperature([reading("nvme", 40)]) is None
+
+
+def test_acpitz_only_host_reports_cpu_temperature(tmp_path):
+    write_chip(tmp_path / "hwmon", "hwmon0", "acpitz", {"temp1": 42000})
+    temperatures = TemperatureSensors(str(tmp_path / "hwmon"), str(tmp_path / "thermal"))
+    assert temperatures.discover()
+    assert cpu_temperature(temperatures.read()) == 42.0
+
+
+def test_failed_read_drops_sensor_until_next_hotplug_check(tmp_path, monkeypatch):
+    hwmon = tmp_path / "hwmon"
+    write_chip(hwmon, "hwmon0", "coretemp", {"temp1": 50000, "temp2": 52000})
+    temperatures = TemperatureSensors(str(hwmon), str(tmp_path / "thermal"))
+    temperatures.discover()
+
+    discoveries = []
+    original = temperatures.discover
+    monkeypatch.setattr(temperatures, "discover", lambda: discoveries.append(1) or original())
+
+    # Make one input unreadable
+    flaky = next(s for s in temperatures.inputs if s.path.endswith("temp2_input"))
+    os.close(flaky.fd)
+    flaky.fd = os.open(os.devnull, os.O_WRONLY)
+
+    assert len(temperatures.read()) == 1
+    assert len(temperatures.read()) == 1
+    assert discoveries == []
+
+    monkeypatch.setattr(sensors, "HOTPLUG_CHECK_INTERVAL", 0.0)
+    assert len(temperatures.read()) == 2
+    assert discoveries == [1]
@@ -0,0 +1,136 @@
+"""Supervisor tests with real child processes writing to the output pipe."""
+import asyncio
+import os
+import signal
+import time
+import pytest
+from app.services import supervisor as supervisor_module
+from app.services.registry import ServiceConfig
+from app.services.supervisor import ProcessState, Supervisor
+
+
+@pytest.fixture
+def logs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(supervisor_module, "LOGS_DIR", tmp_path / "logs")
+    monkeypatch.setattr(supervisor_module, "MAX_RESTARTS", 0)
+    return tmp_path / "logs"
+
+
+def service(tmp_path, script: str) -> ServiceConfig:
+    path = tmp_path / "svc"
+    path.mkdir(exist_ok=True)
+    start = path / "start.sh"
+    start.write_text(f"#!/bin/sh\n{script}\n")
+    start.chmod(0o755)
+    return ServiceConfig(name="svc", path=str(path))
+
+
+async def wait_for(condition, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+def test_output_without_newlines_is_drained(tmp_path, logs_dir):
+    # 1 MiB of \r progress updates with no \n, then a crash: the pipe must keep
+    # draining so the exit is seen
+    config = service(tmp_path, "i=0; while [ $i -lt 16384 ]; do printf '%063d\\r' $i; i=$((i+1)); done; echo done; exit 3")
+
+    async def run():
+        supervisor = Supervisor()
+        assert (await supervisor.start(config))[0]
+        proc = supervisor.get("svc")
+        await wait_for(lambda: proc.state == ProcessState.FAILED)
+        await asyncio.gather(*proc.tasks, return_exceptions=True)
+        await supervisor.shutdown()
+        return proc
+
+    proc = asyncio.run(run())
+    assert proc.last_exit_code == 3
+    log = (logs_dir / "svc.log").read_bytes()
+    assert log.count(b"\r") >= 16000
+    assert log.rstrip().endswith(b"done")
+
+
+def test_lines_are_logged(tmp_path, logs_dir):
+    config = service(tmp_path, "echo one; echo two >&2; printf three")
+
+    async def run():
+        supervisor = Supervisor()
+        await supervisor.start(config)
+        proc = supervisor.get("svc")
+        await wait_for(lambda: not proc.alive)
+        await asyncio.gather(*proc.tasks, return_exceptions=True)
+        await supervisor.shutdown()
+
+    asyncio.run(run())
+    assert (logs_dir / "svc.log").read_text().splitlines() == ["one", "two", "three"]
+
+
+def test_shutdown_leaves_services_running(tmp_path, logs_dir):
+    config = service(tmp_path, "echo before; sleep 1; echo after; exec sleep 30")
+
+    async def run():
+        supervisor = Supervisor()
+        await supervisor.start(config)
+        proc = supervisor.get("svc")
+        await wait_for(lambda: (logs_dir / "svc.log").exists() and b"before" in (logs_dir / "svc.log").read_bytes())
+        await supervisor.shutdown()
+        return proc.pid
+
+    pid = asyncio.run(run())
+    try:
+        # Output written after the backend let go still reaches the log
+        deadline = time.monotonic() + 10
+        while b"after" not in (logs_dir / "svc.log").read_bytes():
+            assert time.monotonic() < deadline, "relayed output never arrived"
+            time.sleep(0.05)
+        os.killpg(pid, 0)
+    finally:
+        os.killpg(pid, signal.SIGKILL)
+
+
+def test_relayed_output_keeps_the_size_cap(tmp_path, logs_dir, monkeypatch):
+    monkeypatch.setattr(supervisor_module, "LOG_MAX_BYTES", 1000)
+    monkeypatch.setattr(supervisor_module, "LOG_BACKUP_COUNT", 2)
+    config = service(tmp_path, "echo before; sleep 1; "
+                     "i=0; while [ $i -lt 500 ]; do echo line $i; i=$((i+1)); done; "
+                     "echo after; exec sleep 30")
+
+    async def run():
+        supervisor = Supervisor()
+        await supervisor.start(config)
+        proc = supervisor.get("svc")
+        await wait_for(lambda: (logs_dir / "svc.log").exists() and b"before" in (logs_dir / "svc.log").read_bytes())
+        await supervisor.shutdown()
+        return proc.pid
+
+    pid = asyncio.run(run())
+    try:
+        deadline = time.monotonic() + 10
+        while b"after" not in (logs_dir / "svc.log").read_bytes():
+            assert time.monotonic() < deadline, "relayed output never arrived"
+            time.sleep(0.05)
+        logs = sorted(logs_dir.iterdir())
+        assert [log.name for log in logs] == ["svc.log", "svc.log.1", "svc.log.2"]
+        assert all(log.stat().st_size <= 1000 for log in logs)
+    finally:
+        os.killpg(pid, signal.SIGKILL)
+
+
+def test_shutdown_stops_services_when_configured(tmp_path, logs_dir, monkeypatch):
+    monkeypatch.setattr(supervisor_module, "STOP_ON_EXIT", True)
+    config = service(tmp_path, "exec sleep 30")
+
+    async def run():
+        supervisor = Supervisor()
+        await supervisor.start(config)
+        proc = supervisor.get("svc")
+        await supervisor.shutdown()
+        return proc
+
+    proc = asyncio.run(run())
+    assert proc.state == ProcessState.STOPPED
+    with pytest.raises(ProcessLookupError):
+        os.killpg(proc.pid, 0)
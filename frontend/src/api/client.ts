@@ -1,5 +1,66 @@
 const BASE_URL = '/api'
 
+export interface GpuProcess {
+  pid: number
+  gpu_index: number
+  used_memory?: number
+}
+
+export interface MigInstance {
+  index: number
+  uuid?: string
+  name?: string
+  memory_total?: number
+  memory_used?: number
+}
+
+export interface GpuMetrics {
+  index: number
+  name: string
+  uuid?: string
+  memory_total?: number
+  memory_used?: number
+  memory_percent?: number
+  utilization?: number
+  temperature?: number
+  power_draw?: number
+  power_limit?: number
+  clock_graphics?: number
+  clock_memory?: number
+  encoder_utilization?: number
+  decoder_utilization?: number
+  mig_instances: MigInstance[]
+  processes: GpuProcess[]
+}
+
+export interface TemperatureReading {
+  chip: string
+  label: string
+  kind: 'package' | 'core' | 'cpu' | 'nvme' | 'gpu' | 'other'
+  current: number
+}
+
+export interface DiskUsage {
+  mountpoint: string
+  device: string
+  fstype: string
+  total: number
+  used: number
+  free: number
+  percent: number
+  responsive: boolean
+}
+
+export interface DiskIO {
+  device: string
+  read_bytes_per_sec: number
+  write_bytes_per_sec: number
+  read_iops: number
+  write_iops: number
+  await_ms: number
+  utilization?: number
+}
+
 export interface SystemMetrics {
   cpu_percent: number
   cpu_per_core: number[]
@@ -17,10 +78,25 @@ export interface SystemMetrics {
   gpu_utilization?: number
   gpu_temperature?: number
   cpu_temperature?: number
+  gpus: GpuMetrics[]
+  temperatures: TemperatureReading[]
+  disks: DiskUsage[]
+  disk_io: DiskIO[]
 }
 
 export type ServiceStatus = 'running' | 'stopped' | 'error' | 'unknown'
 
+export interface ServiceResources {
+  pids: number[]
+  cpu_percent: number
+  memory_rss: number
+  memory_pss?: number
+  threads: number
+  open_fds: number
+  gpu_memory: number
+  timestamp: number
+}
+
 export interface ServiceInfo {
   name: string
   description: string
@@ -32,6 +108,87 @@ export interface ServiceInfo {
   status: ServiceStatus
   frontend_running: boolean
   backend_running: boolean
+  supervised: boolean
+  pid?: number
+  restarts: number
+  sleeping: boolean
+}
+
+export interface LatencyBucket {
+  le: number | null
+  count: number
+}
+
+export interface ProxyLatency {
+  service: string
+  requests: number
+  errors: number
+  websockets: number
+  mean_ms?: number
+  p50_ms?: number
+  p90_ms?: number
+  p99_ms?: number
+  buckets: LatencyBucket[]
+}
+
+export interface PeerStatus {
+  name: string
+  url: string
+  online: boolean
+  last_seen?: number
+  latency_ms?: number
+  error?: string
+}
+
+export interface HostSystemMetrics {
+  host: string
+  online: boolean
+  metrics?: SystemMetrics
+}
+
+export interface HostServiceInfo extends ServiceInfo {
+  host: string
+}
+
+export interface HostContainerInfo extends ContainerInfo {
+  host: string
+}
+
+export type AlertState = 'pending' | 'firing' | 'resolved'
+
+export interface Alert {
+  rule: string
+  metric: string
+  severity: string
+  state: AlertState
+  value: number
+  since: number
+  description: string
+}
+
+export interface AlertEvent {
+  rule: string
+  metric: string
+  severity: string
+  state: AlertState
+  value?: number
+  timestamp: number
+  description: string
+}
+
+export type SubsystemState = 'pending' | 'initializing' | 'ready' | 'unavailable' | 'failed'
+
+export interface SubsystemStatus {
+  name: string
+  state: SubsystemState
+  seconds?: number
+  message?: string
+}
+
+export interface StartupInfo {
+  import_seconds?: number
+  first_response_seconds?: number
+  subsystems: SubsystemStatus[]
 }
 
 export interface ServiceActionResponse {
@@ -78,6 +235,136 @@ export interface DockerInfo {
   cpus: number
 }
 
+export interface ContainerStatsSample {
+  timestamp: number
+  cpu_percent: number
+  memory_bytes: number
+  memory_percent: number
+  net_bytes_per_sec: number
+  io_bytes_per_sec: number
+}
+
+export interface ContainerTop {
+  id: string
+  name: string
+  cpu_percent: number
+  memory_bytes: number
+  memory_percent: number
+  memory_growth_bytes: number
+  net_bytes_per_sec: number
+  io_bytes_per_sec: number
+  samples: number
+}
+
+export type ContainerTopKey = 'cpu' | 'mem' | 'net' | 'io'
+
+export type ContainerAction = 'start' | 'stop' | 'restart'
+
+export interface ContainerActionResult {
+  id: string
+  action: ContainerAction
+  success: boolean
+  message: string
+  seconds: number
+}
+
+export interface ImageUsage {
+  id: string
+  repository: string
+  tag: string
+  created: string
+  containers: number
+  size: number
+  shared_size: number
+  unique_size: number
+  dangling: boolean
+  reclaimable: number
+}
+
+export interface ContainerUsage {
+  id: string
+  name: string
+  image: string
+  state: string
+  size: number
+  reclaimable: number
+}
+
+export interface VolumeUsage {
+  name: string
+  driver: string
+  links: number
+  size?: number
+  reclaimable: number
+}
+
+export interface BuildCacheUsage {
+  id: string
+  type: string
+  description: string
+  size: number
+  in_use: boolean
+  shared: boolean
+  last_used: string
+  reclaimable: number
+}
+
+export interface UsageSummary {
+  type: 'images' | 'containers' | 'volumes' | 'build_cache'
+  count: number
+  active: number
+  size: number
+  reclaimable: number
+}
+
+export interface DockerDiskUsage {
+  summary: UsageSummary[]
+  images: ImageUsage[]
+  containers: ContainerUsage[]
+  volumes: VolumeUsage[]
+  build_cache: BuildCacheUsage[]
+}
+
+export type PruneTarget = 'containers' | 'images' | 'volumes' | 'build_cache'
+
+export type JobState = 'pending' | 'running' | 'succeeded' | 'failed'
+
+export interface Job {
+  id: string
+  kind: string
+  params?: Record<string, unknown>
+  state: JobState
+  created: number
+  started?: number
+  finished?: number
+  result?: Record<string, unknown>
+  error?: string
+}
+
+export type JournalKind = 'service' | 'stack' | 'container' | 'docker' | 'system'
+
+export interface JournalEvent {
+  id: number
+  timestamp: number
+  kind: JournalKind
+  target: string
+  action: string
+  source: 'api' | 'supervisor' | 'idle'
+  success: boolean
+  duration_ms?: number
+  message?: string
+}
+
+export interface JournalQuery {
+  start?: number
+  end?: number
+  kind?: JournalKind
+  target?: string
+  action?: string
+  success?: boolean
+  limit?: number
+}
+
 // Network types
 export interface NetworkInterface {
   name: string
@@ -177,6 +464,9 @@ export const api = {
 
   getServices: () => fetchJson<ServiceInfo[]>(`${BASE_URL}/services`),
 
+  getServiceResources: () =>
+    fetchJson<Record<string, ServiceResources>>(`${BASE_URL}/services/resources`),
+
   startService: (name: string) =>
     fetchJson<ServiceActionResponse>(`${BASE_URL}/services/${name}/start`, {
       method: 'POST',
@@ -195,6 +485,9 @@ export const api = {
   getServiceLogs: (name: string, lines = 100) =>
     fetchJson<LogsResponse>(`${BASE_URL}/services/${name}/logs?lines=${lines}`),
 
+  getServiceLatency: (name: string) =>
+    fetchJson<ProxyLatency>(`${BASE_URL}/services/${name}/latency`),
+
   // Docker endpoints
   getDockerInfo: () => fetchJson<DockerInfo>(`${BASE_URL}/docker/info`),
 
@@ -219,11 +512,67 @@ export const api = {
       method: 'POST',
     }),
 
+  getContainerHistory: (id: string, seconds = 600) =>
+    fetchJson<ContainerStatsSample[]>(`${BASE_URL}/docker/containers/${id}/history?seconds=${seconds}`),
+
+  getTopContainers: (by: ContainerTopKey = 'cpu', window = 300, limit = 10) =>
+    fetchJson<ContainerTop[]>(`${BASE_URL}/docker/top?by=${by}&window=${window}&limit=${limit}`),
+
+  // Calls onResult for each container as its action completes
+  batchContainerAction: async (
+    action: ContainerAction,
+    target: { ids?: string[]; project?: string; concurrency?: number },
+    onResult: (result: ContainerActionResult) => void
+  ) => {
+    const response = await fetch(`${BASE_URL}/docker/containers/batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ action, ...target }),
+    })
+    if (!response.ok || !response.body) {
+      await handleResponse(response, 'Batch action failed')
+    }
+    const reader = response.body!.pipeThrough(new TextDecoderStream()).getReader()
+    let buffer = ''
+    for (;;) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += value
+      const lines = buffer.split('\n')
+      buffer = lines.pop() ?? ''
+      lines.filter(Boolean).forEach((line) => onResult(JSON.parse(line)))
+    }
+  },
+
   getContainerLogs: (id: string, lines = 100) =>
     fetchJson<{ logs: string[]; container: string }>(
       `${BASE_URL}/docker/containers/${id}/logs?lines=${lines}`
     ),
 
+  getDockerDiskUsage: (refresh = false) =>
+    fetchJson<DockerDiskUsage>(`${BASE_URL}/docker/disk-usage?refresh=${refresh}`),
+
+  pruneDocker: (targets: PruneTarget[], allImages = false) =>
+    fetchJson<Job>(`${BASE_URL}/docker/prune`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ targets, all_images: allImages }),
+    }),
+
+  // Background jobs
+  getJobs: () => fetchJson<Job[]>(`${BASE_URL}/jobs`),
+
+  getJob: (id: string) => fetchJson<Job>(`${BASE_URL}/jobs/${id}`),
+
+  // Action journal
+  getJournal: (query: JournalQuery = {}) => {
+    const params = new URLSearchParams()
+    for (const [key, value] of Object.entries(query)) {
+      if (value !== undefined) params.set(key, String(value))
+    }
+    return fetchJson<JournalEvent[]>(`${BASE_URL}/journal?${params}`)
+  },
+
   // Network endpoints
   getNetworkStatus: () => fetchJson<NetworkStatus>(`${BASE_URL}/network/status`),
 
@@ -259,6 +608,24 @@ export const api = {
   // Device info endpoint
   getDeviceInfo: () => fetchJson<DeviceInfo>(`${BASE_URL}/system/info`),
 
+  // Federation endpoints (merged views across hosts)
+  getFederationPeers: () => fetchJson<PeerStatus[]>(`${BASE_URL}/federation/peers`),
+
+  getFederatedSystem: () => fetchJson<HostSystemMetrics[]>(`${BASE_URL}/federation/system`),
+
+  getFederatedServices: () => fetchJson<HostServiceInfo[]>(`${BASE_URL}/federation/services`),
+
+  getFederatedContainers: () =>
+    fetchJson<HostContainerInfo[]>(`${BASE_URL}/federation/docker/containers`),
+
+  // Alerts (live transitions: WebSocket at /api/alerts/ws)
+  getAlerts: () => fetchJson<Alert[]>(`${BASE_URL}/alerts`),
+
+  getAlertEvents: (limit = 50) => fetchJson<AlertEvent[]>(`${BASE_URL}/alerts/events?limit=${limit}`),
+
+  // Backend startup timings and subsystem readiness
+  getStartupInfo: () => fetchJson<StartupInfo>(`${BASE_URL}/health/startup`),
+
   // System actions (UI-only for now)
   restartSystem: () =>
     fetchJson<ActionResponse>(`${BASE_URL}/actions/restart`, { method: 'POST' }),